@@ -0,0 +1,262 @@
+import os
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+from sklearn.feature_selection import f_classif
+from sklearn.tree import DecisionTreeClassifier
+from utils.DecisionBoundaryUtil import DecisionBoundaryUtil
+from WorkerPool import WorkerPool
+
+
+'''
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Retrains a model on one feature pair and predicts its heatmap in a worker
+process for the boundary matrix, this must be a module level function so
+that it can be pickled and sent to the pool.
+
+INPUTS
+dict cellInfo : The model record returned by 'BoundaryCache.getCellInfo'
+list[str] features : The two features of the cell
+int divisions : The number of grid points along each axis
+'''
+def computeBoundaryCell(cellInfo, features, divisions):
+    boundaryUtil = DecisionBoundaryUtil(divisions)
+    boundaryInfo = boundaryUtil.projectModel(cellInfo, features)
+    heatmapValues = boundaryUtil.getHeatmapValues(boundaryInfo["trainingData"], boundaryInfo["testingData"])
+    heatmap = boundaryUtil.getHeatmapArrays(boundaryInfo["modelData"], heatmapValues, boundaryInfo["colourKey"])
+    return {"boundaryInfo" : boundaryInfo, "heatmap" : heatmap}
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+A singleton class that caches the pairwise decision boundaries of each
+model, so plotting a feature pair that has already been plotted does not
+retrain the model on that pair or predict its heatmap again.
+
+Entries are indexed by the model id, the sorted feature pair and the
+resolution of the heatmap (None for the pairwise plot) and hold the
+projected model record (see 'DecisionBoundaryUtil.projectModel') and the
+heatmap arrays drawn from it (None for decision trees, which are drawn
+from their exact regions at any resolution). The number of entries is limited by
+'maxEntries', which can be set with the BOUNDARY_CACHE_SIZE environment
+variable, the least recently used entry is evicted first.
+
+After a model is trained 'prewarm' computes the boundaries of its most
+informative pairs on a background thread. The number of pairs is set
+with the BOUNDARY_PREWARM_PAIRS environment variable, 0 turns it off.
+
+The cells of the boundary matrix are read from the same cache, the cells
+that are missing are computed in the shared 'WorkerPool'.
+"""
+class BoundaryCache(object):
+
+    def __new__(self):
+        if not hasattr(self, 'instance'):
+            self.instance = super(BoundaryCache, self).__new__(self)
+        return self.instance
+
+    maxEntries = int(os.environ.get("BOUNDARY_CACHE_SIZE", 32))
+    prewarmPairs = int(os.environ.get("BOUNDARY_PREWARM_PAIRS", 3))
+    executor = None
+
+    # Indexed by (model id, sorted features, divisions) : {"boundaryInfo", "heatmap"}
+    entries = OrderedDict()
+    # Indexed by (model id, sorted features, divisions) : Future of a boundary being computed
+    pending = {}
+    lock = threading.Lock()
+    boundaryUtil = DecisionBoundaryUtil()
+
+    '''
+    Returns the background thread pool, creating it the first time it is needed.
+    '''
+    def getExecutor(self):
+        with self.lock:
+            if self.executor is None:
+                BoundaryCache.executor = ThreadPoolExecutor(max_workers = 1)
+            return self.executor
+
+    '''
+    Returns the cache key of a feature pair, the order the features were
+    selected in does not matter. 'divisions' is the resolution of the
+    heatmap, None for the resolution of the pairwise plot.
+    '''
+    def getKey(self, modelID, features, divisions = None):
+        return (modelID, tuple(sorted(str(feature) for feature in features)), divisions)
+
+    '''
+    Returns the cached entry of a feature pair or None.
+    '''
+    def get(self, modelID, features, divisions = None):
+        key = self.getKey(modelID, features, divisions)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    '''
+    Stores an entry, evicting the least recently used entries once there
+    are more than 'maxEntries'.
+    '''
+    def put(self, modelID, features, entry, divisions = None):
+        key = self.getKey(modelID, features, divisions)
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxEntries:
+                self.entries.popitem(last = False)
+
+    '''
+    Returns the boundary of a feature pair, computing and caching it if it
+    is not cached. If the pair is already being computed in the background
+    the result of that computation is waited for instead. Models without
+    an id are never cached.
+
+    INPUTS
+    dict modelInfo : The stored information of the trained model
+    list[str] features : The one or two features to plot
+    '''
+    def getBoundary(self, modelInfo, features):
+        modelID = modelInfo.get("modelID")
+        if modelID is None:
+            return self.computeBoundary(modelInfo, features)
+
+        entry = self.get(modelID, features)
+        if entry is not None:
+            return entry
+
+        key = self.getKey(modelID, features)
+        with self.lock:
+            future = self.pending.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.pending[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            entry = self.computeBoundary(modelInfo, features)
+            self.put(modelID, features, entry)
+            future.set_result(entry)
+            return entry
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.pending.pop(key, None)
+
+    '''
+    Retrains the model on a feature pair and predicts its heatmap. Decision
+    trees are drawn from their exact regions, so no heatmap is stored for them.
+    '''
+    def computeBoundary(self, modelInfo, features):
+        boundaryInfo = self.boundaryUtil.projectModel(modelInfo, features)
+        if isinstance(boundaryInfo["modelData"], DecisionTreeClassifier):
+            return {"boundaryInfo" : boundaryInfo, "heatmap" : None}
+        heatmapValues = self.boundaryUtil.getHeatmapValues(boundaryInfo["trainingData"], boundaryInfo["testingData"])
+        heatmap = self.boundaryUtil.getHeatmapArrays(boundaryInfo["modelData"], heatmapValues, boundaryInfo["colourKey"])
+        return {"boundaryInfo" : boundaryInfo, "heatmap" : heatmap}
+
+    '''
+    Returns the boundaries of the cells of the boundary matrix, in the order
+    of the given pairs. Cached cells are reused, the heatmaps of the missing
+    cells are computed in parallel in the shared 'WorkerPool' and cached at
+    the matrix resolution. Decision trees need no heatmap, so their cells
+    share the entries of the pairwise plot and are computed in this process.
+
+    INPUTS
+    dict modelInfo : The stored information of the trained model
+    list[list[str]] pairs : The feature pairs of the cells
+    int divisions : The number of grid points along each axis of every cell
+    '''
+    def getBoundaries(self, modelInfo, pairs, divisions):
+        if isinstance(modelInfo["modelData"], DecisionTreeClassifier):
+            return [self.getBoundary(modelInfo, features) for features in pairs]
+
+        modelID = modelInfo.get("modelID")
+        boundaries = [None if modelID is None else self.get(modelID, features, divisions) for features in pairs]
+
+        #Submits one task per missing cell, only the two columns of each pair are sent to the workers
+        futures = {}
+        for i, features in enumerate(pairs):
+            if boundaries[i] is None:
+                futures[i] = WorkerPool().instance.submit(computeBoundaryCell, self.getCellInfo(modelInfo, features), features, divisions)
+
+        for i, future in futures.items():
+            boundaries[i] = future.result()
+            if modelID is not None:
+                self.put(modelID, pairs[i], boundaries[i], divisions)
+        return boundaries
+
+    '''
+    Returns the part of a model record a worker needs to compute one cell of
+    the boundary matrix: the two feature columns of the data and an unfitted
+    estimator of the same type, rather than the whole fitted model.
+    '''
+    def getCellInfo(self, modelInfo, features):
+        return {
+            "modelData" : type(modelInfo["modelData"])(**modelInfo["modelArguments"]),
+            "modelArguments" : modelInfo["modelArguments"],
+            "trainingData" : [modelInfo["trainingData"][0][list(features)], modelInfo["trainingData"][1]],
+            "testingData" : [modelInfo["testingData"][0][list(features)], modelInfo["testingData"][1]],
+            "colourKey" : modelInfo["colourKey"],
+            "shapeKey" : modelInfo["shapeKey"],
+            "classifierType" : modelInfo.get("classifierType"),
+            "modelID" : modelInfo.get("modelID")
+        }
+
+    '''
+    Returns the most informative feature pairs of a model, best first.
+
+    Features are scored by the model's feature importances where it has
+    them, and by their ANOVA F-value against the classes otherwise. A pair
+    is scored by the sum of its features' scores.
+
+    INPUTS
+    dict modelInfo : The stored information of the trained model
+    int count : The number of pairs to return
+    '''
+    def getInformativePairs(self, modelInfo, count):
+        model = modelInfo["modelData"]
+        features = list(model.feature_names_in_)
+
+        scores = getattr(model, "feature_importances_", None)
+        if scores is None:
+            scores, _ = f_classif(modelInfo["trainingData"][0][features], modelInfo["trainingData"][1])
+        scores = np.nan_to_num(np.asarray(scores, dtype = np.float64))
+
+        pairs = list(itertools.combinations(range(0, len(features)), 2))
+        pairs.sort(key = lambda pair: scores[pair[0]] + scores[pair[1]], reverse = True)
+        return [[features[i], features[j]] for i, j in pairs[:count]]
+
+    '''
+    Computes the boundaries of a newly trained model's most informative
+    feature pairs in the background. Does nothing for models with two or
+    fewer features, which are drawn with the standard boundary.
+
+    INPUTS
+    dict modelInfo : The stored information of the trained model
+    int count : The number of pairs, defaults to 'prewarmPairs'
+    '''
+    def prewarm(self, modelInfo, count = None):
+        count = self.prewarmPairs if count is None else count
+        if count <= 0 or modelInfo.get("modelID") is None or len(modelInfo["modelData"].feature_names_in_) <= 2:
+            return None
+
+        def warm():
+            for features in self.getInformativePairs(modelInfo, count):
+                self.getBoundary(modelInfo, features)
+
+        return self.getExecutor().submit(warm)
@@ -0,0 +1,225 @@
+import hashlib
+import threading
+from UserSession import UserSession
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+A singleton class that holds the uploaded datasets, replacing the
+module level list that every user of a worker shared.
+
+Datasets are indexed by the sha256 hash of their file contents, so
+uploading an identical file (from any session) reuses the dataframe
+that is already held instead of parsing and storing it again. Each
+session has one current dataset, and each dataset counts the sessions
+using it. When a session moves on to another dataset the count drops,
+and a dataset no session is using is released.
+
+Selecting a held dataset is a single step ('useDataset' returns None if
+the dataset is not held), so a dataset cannot be released between
+checking for it and using it.
+
+If the 'UserSession' store is shared between worker processes (see
+'SessionStore') each dataset and each session's current dataset are
+also written to it. A worker that does not hold a session's dataset
+loads it from the store the first time it is needed, so a dataset
+uploaded to one worker can be trained on by another.
+
+'getDataset' hands out shallow copies of the dataframe: they share its
+data, so no copy is made. Dropping or adding columns on a copy does not
+change the stored dataset, but changing values in place (assigning to
+cells or using inplace operations) would change it for every session,
+callers must not do so.
+"""
+class DatasetRegistry(object):
+
+    def __new__(self):
+        if not hasattr(self, 'instance'):
+            self.instance = super(DatasetRegistry, self).__new__(self)
+        return self.instance
+
+    # Indexed by content hash : {"dataFrame", "filename", "report", "references"}
+    datasets = {}
+    # Indexed by session id : content hash of the session's current dataset
+    sessions = {}
+    lock = threading.Lock()
+    # The session store used to share datasets, the 'UserSession' store if None
+    store = None
+
+    '''
+    Returns the session store if it is shared between worker processes, or None.
+    '''
+    def getSharedStore(self):
+        store = self.store if self.store is not None else UserSession().instance.store
+        return store if store.shared else None
+
+    '''
+    Writes a dataset and the session's use of it to the shared store, if
+    there is one. Must be called without holding the lock.
+    '''
+    def share(self, sessionID, contentHash, entry):
+        store = self.getSharedStore()
+        if store is None:
+            return
+        if not store.hasDataset(contentHash):
+            store.setDataset(contentHash, {"dataFrame" : entry["dataFrame"], "filename" : entry["filename"], "report" : entry["report"]})
+        if store.getSessionDataset(sessionID) != contentHash:
+            store.setSessionDataset(sessionID, contentHash)
+
+    '''
+    Returns the hash used to identify a dataset from its contents.
+
+    INPUTS
+    (bytes or file) content : The file contents, or a binary stream / path
+    to read them from in chunks
+    '''
+    def hashContent(self, content, chunkSize = 1024 * 1024):
+        digest = hashlib.sha256()
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            digest.update(content)
+            return digest.hexdigest()
+
+        file = open(content, "rb") if isinstance(content, str) else content
+        try:
+            while True:
+                chunk = file.read(chunkSize)
+                if not chunk:
+                    break
+                digest.update(chunk)
+        finally:
+            if isinstance(content, str):
+                file.close()
+            else:
+                file.seek(0)
+        return digest.hexdigest()
+
+    '''
+    Returns True if a dataset with this hash is currently held. The dataset
+    may be released straight after, use the result of 'useDataset' rather
+    than checking first.
+    '''
+    def hasDataset(self, contentHash):
+        with self.lock:
+            return contentHash in self.datasets
+
+    '''
+    Stores a parsed dataset and makes it the session's current dataset. If the
+    hash is already held (another upload of the same file finished first)
+    the existing dataframe is kept.
+
+    INPUTS
+    str sessionID : The session that uploaded the dataset
+    str contentHash : The value returned by 'hashContent'
+    DataFrame dataFrame : The parsed dataset
+    str filename : The name of the uploaded file
+    dict report : The report returned by 'ImportUtil.ingestCsv'
+    '''
+    def register(self, sessionID, contentHash, dataFrame, filename, report):
+        with self.lock:
+            if contentHash not in self.datasets:
+                self.datasets[contentHash] = {
+                    "dataFrame" : dataFrame,
+                    "filename" : filename,
+                    "report" : report,
+                    "references" : 0
+                }
+            entry = self.selectHash(sessionID, contentHash)
+        self.share(sessionID, contentHash, entry)
+        return entry
+
+    '''
+    Makes an already registered dataset the session's current dataset,
+    releasing the session's previous dataset.
+
+    A dataset this worker does not hold is loaded from the shared store if
+    another worker has stored it.
+
+    RETURNS
+    dict : The registry entry of the dataset, or None if no dataset with
+    this hash is held, in which case the file must be parsed and registered
+    '''
+    def useDataset(self, sessionID, contentHash):
+        with self.lock:
+            entry = self.selectHash(sessionID, contentHash) if contentHash in self.datasets else None
+
+        if entry is not None:
+            self.share(sessionID, contentHash, entry)
+            return entry
+
+        store = self.getSharedStore()
+        dataset = None if store is None else store.getDataset(contentHash)
+        if dataset is None:
+            return None
+        return self.register(sessionID, contentHash, dataset["dataFrame"], dataset["filename"], dataset["report"])
+
+    # Must be called while holding the lock
+    def selectHash(self, sessionID, contentHash):
+        entry = self.datasets[contentHash]
+        previous = self.sessions.get(sessionID)
+        if previous != contentHash:
+            entry["references"] += 1
+            self.sessions[sessionID] = contentHash
+            if previous is not None:
+                self.releaseHash(previous)
+        return entry
+
+    '''
+    Stops the session using its current dataset.
+    '''
+    def release(self, sessionID):
+        with self.lock:
+            contentHash = self.sessions.pop(sessionID, None)
+            if contentHash is not None:
+                self.releaseHash(contentHash)
+
+    # Must be called while holding the lock
+    def releaseHash(self, contentHash):
+        entry = self.datasets[contentHash]
+        entry["references"] -= 1
+        if entry["references"] <= 0:
+            del self.datasets[contentHash]
+
+    '''
+    Returns a shallow copy of the session's current dataset, or None if the
+    session has not uploaded one. The copy shares the stored data, its values
+    must not be changed in place.
+    '''
+    def getDataset(self, sessionID):
+        entry = self.getEntry(sessionID)
+        if entry is None:
+            return None
+        return entry["dataFrame"].copy(deep = False)
+
+    '''
+    Returns the content hash of the session's current dataset, or None.
+    With a shared store the session may have uploaded it to another worker.
+    '''
+    def getHash(self, sessionID):
+        store = self.getSharedStore()
+        if store is not None:
+            return store.getSessionDataset(sessionID)
+        with self.lock:
+            return self.sessions.get(sessionID)
+
+    '''
+    Returns the registry entry of the session's current dataset, or None.
+    '''
+    def getEntry(self, sessionID):
+        store = self.getSharedStore()
+        if store is not None:
+            contentHash = store.getSessionDataset(sessionID)
+            if contentHash is None:
+                return None
+            with self.lock:
+                if self.sessions.get(sessionID) == contentHash:
+                    return self.datasets[contentHash]
+            return self.useDataset(sessionID, contentHash)
+
+        with self.lock:
+            contentHash = self.sessions.get(sessionID)
+            if contentHash is None:
+                return None
+            return self.datasets[contentHash]
@@ -0,0 +1,118 @@
+import os
+import json
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+A singleton class that caches trained models by the contents of the
+request that trained them, so pressing Train again with the same 
+settings returns the already fitted model instead of refitting it.
+
+The key is a hash of the dataset's content hash, the features, the 
+target, the test/train split and its seed, the classifier class and its
+arguments. Only the fitted model is cached, the split is repeated on a
+hit (it is seeded, so it gives the same data) and a new modelInfo record
+with its own modelID is built around the cached model. Cached models are
+shared between sessions and are only used to predict, they must not be
+refitted.
+
+Only requests with a seed (the classifier's random_state, which is also
+used for the train/test split) are cached, without one the split and fit
+are random and a refit would not give the same model.
+
+The cache is limited to 'maxEntries' models (MODEL_CACHE_SIZE) and to
+'maxBytes' bytes (MODEL_CACHE_BYTES), the size of a model is its pickled
+size. The least recently used model is evicted first, a model larger
+than the whole budget is not cached.
+"""
+class ModelCache(object):
+
+    def __new__(self):
+        if not hasattr(self, 'instance'):
+            self.instance = super(ModelCache, self).__new__(self)
+        return self.instance
+
+    maxEntries = int(os.environ.get("MODEL_CACHE_SIZE", 32))
+    maxBytes = int(os.environ.get("MODEL_CACHE_BYTES", 256 * 1024 ** 2))
+    # Indexed by key : (fitted model, size in bytes)
+    entries = OrderedDict()
+    totalBytes = 0
+    hits = 0
+    misses = 0
+    lock = threading.Lock()
+
+    '''
+    Returns the cache key for a training request, or None if the request
+    cannot be cached.
+
+    INPUTS
+    str datasetHash : The content hash of the dataset from the 'DatasetRegistry'
+    list[str] features : The features used to train the model
+    str target : The column used as the classifier
+    float split : The test/train split
+    int seed : The random state used for the split and the classifier
+    class classifier : A class reference to the classifier type
+    dict arguments : The arguments used to construct the classifier
+    '''
+    def getKey(self, datasetHash, features, target, split, seed, classifier, arguments):
+        if datasetHash is None or seed is None:
+            return None
+        request = {
+            "dataset" : datasetHash,
+            "features" : sorted(str(feature) for feature in features),
+            "target" : str(target),
+            "split" : split,
+            "seed" : seed,
+            "classifier" : classifier.__module__ + "." + classifier.__name__,
+            "arguments" : arguments
+        }
+        return hashlib.sha256(json.dumps(request, sort_keys = True, default = str).encode("utf-8")).hexdigest()
+
+    '''
+    Returns the cached fitted model for a key, or None, and counts the hit or miss.
+    '''
+    def get(self, key):
+        if key is None:
+            return None
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                ModelCache.misses += 1
+                return None
+            ModelCache.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    '''
+    Stores a fitted model, evicting the least recently used models until
+    both the entry and byte limits are met.
+    '''
+    def put(self, key, model):
+        if key is None:
+            return
+        size = len(pickle.dumps(model, protocol = pickle.HIGHEST_PROTOCOL))
+        if size > self.maxBytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                ModelCache.totalBytes -= self.entries[key][1]
+            self.entries[key] = (model, size)
+            self.entries.move_to_end(key)
+            ModelCache.totalBytes += size
+            while len(self.entries) > self.maxEntries or self.totalBytes > self.maxBytes:
+                ModelCache.totalBytes -= self.entries.popitem(last = False)[1][1]
+
+    '''
+    Returns the hit and miss counters, the number of cached models and their
+    total size in bytes.
+    '''
+    def getStats(self):
+        with self.lock:
+            return {"hits" : self.hits, "misses" : self.misses, "entries" : len(self.entries), "bytes" : self.totalBytes}
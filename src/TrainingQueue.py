@@ -0,0 +1,270 @@
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from WorkerPool import WorkerPool
+from UserSession import UserSession
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+A singleton class that runs model training in the shared 'WorkerPool' so
+that fitting a model never blocks the dash request that asked for it.
+
+Jobs are submitted with 'submit', which returns a job id straight away.
+When the fit finishes the 'onComplete' function given to 'submit' is
+called with the fitted model (in this process), this is where the
+model is stored in the 'UserSession'. 'onComplete' runs on a separate
+background thread, the thread of the process pool that reports the
+result only hands it over, so storing a model never holds up the
+results of other work in the 'WorkerPool'.
+
+The number of models trained at once is limited by the size of the
+'WorkerPool', which is shared with the other background work.
+
+If the 'UserSession' store is shared between worker processes (see
+'SessionStore') a record of every job is kept in it as well. The fit runs
+in the worker that submitted it, which updates the record as the job
+progresses, and any other worker reports the job from its record, so
+the status of a job can be polled from any worker. A cancel made on
+another worker is flagged on the record and carried out by the worker
+running the job the next time it polls the job or once its fit returns.
+
+Note : a job that is still queued is cancelled outright, a job that has
+already started cannot be stopped by the process pool, so it is marked
+as cancelled and its model is discarded once the fit returns. Until then
+its status is "Cancelling" and it still takes up a worker process.
+"""
+
+
+'''
+Fits a classifier in a worker process, this must be a module level
+function so that it can be pickled and sent to the pool.
+
+INPUTS
+class classifier : A class reference to the classifier type
+dict arguments : The arguments used to construct the classifier
+DataFrame xTrain : The training features
+Series yTrain : The training classifications
+'''
+def fitModel(classifier, arguments, xTrain, yTrain):
+    return classifier(**arguments).fit(xTrain, yTrain)
+
+
+class TrainingQueue(object):
+
+    def __new__(self):
+        if not hasattr(self, 'instance'):
+            self.instance = super(TrainingQueue, self).__new__(self)
+        return self.instance
+
+    # Indexed by job id
+    jobs = {}
+    lock = threading.Lock()
+    executor = None
+    # The session store used to share job records, the 'UserSession' store if None
+    store = None
+
+    '''
+    Returns the session store if it is shared between worker processes, or None.
+    '''
+    def getSharedStore(self):
+        store = self.store if self.store is not None else UserSession().instance.store
+        return store if store.shared else None
+
+    '''
+    Writes the current state of a job started by this worker to the shared
+    store, if there is one.
+    '''
+    def share(self, job):
+        store = self.getSharedStore()
+        if store is None:
+            return
+        state = self.getStatus(job)
+        store.setJob(job["sessionID"], job["jobID"], {
+            "jobID" : job["jobID"],
+            "sessionID" : job["sessionID"],
+            "name" : job["name"],
+            "submitted" : job["submitted"],
+            "state" : state,
+            "error" : self.getError(job) if state == "Failed" else None
+        })
+
+    '''
+    Returns True if a job started by this worker has been cancelled, here
+    or on another worker.
+    '''
+    def isCancelled(self, job):
+        if not job["cancelled"]:
+            store = self.getSharedStore()
+            record = None if store is None else store.getJob(job["jobID"])
+            if record is not None and record["cancelled"]:
+                job["cancelled"] = True
+        return job["cancelled"]
+
+    '''
+    Returns the thread that stores fitted models, creating it the first
+    time it is needed.
+    '''
+    def getExecutor(self):
+        with self.lock:
+            if self.executor is None:
+                TrainingQueue.executor = ThreadPoolExecutor(max_workers = 1)
+            return self.executor
+
+    '''
+    Submits a model to be trained and returns its job id.
+
+    INPUTS
+    str sessionID : The session the model belongs to
+    str name : The filename the model will be stored under
+    class classifier : A class reference to the classifier type
+    dict arguments : The arguments used to construct the classifier
+    DataFrame xTrain : The training features
+    Series yTrain : The training classifications
+    function onComplete : Called with the fitted model once training succeeds
+    '''
+    def submit(self, sessionID, name, classifier, arguments, xTrain, yTrain, onComplete):
+        jobID = uuid.uuid4().hex
+        job = {
+            "jobID" : jobID,
+            "sessionID" : sessionID,
+            "name" : name,
+            "submitted" : time.time(),
+            "cancelled" : False,
+            "complete" : False,
+            "error" : None,
+            "future" : None
+        }
+
+        future = WorkerPool().instance.submit(fitModel, classifier, arguments, xTrain, yTrain)
+        job["future"] = future
+        self.share(job)
+
+        with self.lock:
+            self.jobs[jobID] = job
+
+        def complete(future):
+            if not future.cancelled() and future.exception() is None and not self.isCancelled(job):
+                try:
+                    onComplete(future.result())
+                    job["complete"] = True
+                except Exception as e:
+                    job["error"] = str(e)
+            self.share(job)
+
+        # Runs on the process pool's thread, the finished fit is only handed over
+        def finished(future):
+            self.getExecutor().submit(complete, future)
+
+        future.add_done_callback(finished)
+        return jobID
+
+    '''
+    Cancels a job, returns False if the job does not exist or has
+    already finished. A job started by another worker is flagged as
+    cancelled in the shared store.
+
+    INPUTS
+    str jobID : The id returned by 'submit'
+    '''
+    def cancel(self, jobID):
+        job = self.jobs.get(jobID)
+        if job is None:
+            store = self.getSharedStore()
+            record = None if store is None else store.getJob(jobID)
+            if record is None or record["state"] not in ("Queued", "Training"):
+                return False
+            store.cancelJob(jobID)
+            return True
+
+        if job["future"].done():
+            return False
+        job["cancelled"] = True
+        job["future"].cancel()
+        self.share(job)
+        return True
+
+    '''
+    Returns the status of a job as one of "Queued", "Training", "Cancelling"
+    (cancelled while its fit is still running), "Cancelled", "Failed" or
+    "Complete".
+
+    INPUTS
+    dict job : A job record from 'getSessionJobs'
+    '''
+    def getStatus(self, job):
+        future = job["future"]
+        # A job running on another worker is reported from its shared record
+        if future is None:
+            if job["cancelled"] and job["state"] in ("Queued", "Training"):
+                return "Cancelling"
+            return job["state"]
+        if job["cancelled"]:
+            return "Cancelled" if future.done() else "Cancelling"
+        if job["complete"]:
+            return "Complete"
+        if job["error"] is not None or (future.done() and future.exception() is not None):
+            return "Failed"
+        # A finished fit is still reported as training until 'onComplete' has stored it
+        if future.running() or future.done():
+            return "Training"
+        return "Queued"
+
+    '''
+    Returns the error message of a failed job.
+
+    INPUTS
+    dict job : A job record from 'getSessionJobs'
+    '''
+    def getError(self, job):
+        if job["error"] is not None:
+            return job["error"]
+        return str(job["future"].exception())
+
+    '''
+    Returns every job belonging to a session, oldest first.
+
+    INPUTS
+    str sessionID : The session the jobs were submitted for
+    '''
+    def getSessionJobs(self, sessionID):
+        with self.lock:
+            jobs = [job for job in self.jobs.values() if job["sessionID"] == sessionID]
+
+        store = self.getSharedStore()
+        if store is not None:
+            records = {record["jobID"] : record for record in store.getJobs(sessionID)}
+            for job in list(jobs):
+                record = records.pop(job["jobID"], None)
+                if record is None:
+                    # Already reported and removed by another worker
+                    if job["future"].done():
+                        jobs.remove(job)
+                        with self.lock:
+                            self.jobs.pop(job["jobID"], None)
+                    continue
+                if record["cancelled"] and not job["cancelled"]:
+                    job["cancelled"] = True
+                    job["future"].cancel()
+                if record["state"] != self.getStatus(job):
+                    self.share(job)
+            jobs += [dict(record, future = None) for record in records.values()]
+
+        return sorted(jobs, key = lambda job: job["submitted"])
+
+    '''
+    Removes a finished job from the queue once its result has been reported.
+
+    INPUTS
+    str jobID : The id returned by 'submit'
+    '''
+    def remove(self, jobID):
+        with self.lock:
+            self.jobs.pop(jobID, None)
+        store = self.getSharedStore()
+        if store is not None:
+            store.removeJob(jobID)
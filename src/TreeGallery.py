@@ -0,0 +1,125 @@
+import os
+import math
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from utils.TreeUtil import layoutEstimators
+from WorkerPool import WorkerPool
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+A singleton class that lays out every tree of an ensemble model in the
+shared 'WorkerPool' as soon as the model has been trained, so paging
+through the trees in 'ClassifierEnsembleModelsComponent' only has to
+look the layout up.
+
+The layouts are stored compactly (the parsed tree and the node
+coordinates as small numpy arrays, without a figure) indexed by model
+id and estimator index. The figure is drawn from the stored layout
+when the tree is first shown.
+
+The trees are split into batches, one task per batch, and the progress
+of each model is the number of trees laid out so far.
+
+The number of models kept is limited by 'maxGalleries' (GALLERY_SIZE), the least 
+recently used model is dropped first.
+"""
+class TreeGallery(object):
+
+    def __new__(self):
+        if not hasattr(self, 'instance'):
+            self.instance = super(TreeGallery, self).__new__(self)
+        return self.instance
+
+    maxGalleries = int(os.environ.get("GALLERY_SIZE", 8))
+
+    # Indexed by model id : {"total", "layouts" : {estimator index : layout}, "failed", "futures"}
+    galleries = OrderedDict()
+    lock = threading.Lock()
+
+    '''
+    Returns the individual trees of an ensemble model in the order they are
+    paged through, or None if the model is not an ensemble of trees.
+    '''
+    def getEstimators(self, classifier):
+        if isinstance(classifier, RandomForestClassifier):
+            return list(classifier.estimators_)
+        if isinstance(classifier, GradientBoostingClassifier):
+            return [stage[0] for stage in classifier.estimators_]
+        return None
+
+    '''
+    Starts laying out every tree of a trained ensemble model, does nothing
+    if the model is not an ensemble or is already being laid out.
+
+    INPUTS
+    str modelID : The id of the trained model
+    classifier : The trained ensemble model
+    '''
+    def submit(self, modelID, classifier):
+        estimators = self.getEstimators(classifier)
+        if modelID is None or estimators is None:
+            return
+
+        with self.lock:
+            if modelID in self.galleries:
+                self.galleries.move_to_end(modelID)
+                return
+            gallery = {"total" : len(estimators), "layouts" : {}, "failed" : 0, "futures" : []}
+            self.galleries[modelID] = gallery
+            while len(self.galleries) > self.maxGalleries:
+                for future in self.galleries.popitem(last = False)[1]["futures"]:
+                    future.cancel()
+
+        # Only the names and classes are needed to label the trees,
+        # the ensemble itself is not sent to the workers
+        names = SimpleNamespace(feature_names_in_ = classifier.feature_names_in_, classes_ = classifier.classes_)
+        batchSize = max(1, math.ceil(len(estimators) / (WorkerPool().instance.maxWorkers * 4)))
+
+        for start in range(0, len(estimators), batchSize):
+            future = WorkerPool().instance.submit(layoutEstimators, names, estimators[start:start + batchSize])
+            gallery["futures"].append(future)
+
+            def finished(future, start = start, count = len(estimators[start:start + batchSize])):
+                if future.cancelled() or future.exception() is not None:
+                    # Trees that could not be laid out are drawn when they are shown
+                    with self.lock:
+                        gallery["failed"] += count
+                    return
+                with self.lock:
+                    for offset, layout in enumerate(future.result()):
+                        gallery["layouts"][start + offset] = layout
+
+            future.add_done_callback(finished)
+
+    '''
+    Returns the stored layout of one tree, or None if it has not been
+    laid out yet.
+
+    INPUTS
+    str modelID : The id of the trained model
+    int index : The index of the tree in the ensemble
+    '''
+    def getLayout(self, modelID, index):
+        with self.lock:
+            gallery = self.galleries.get(modelID)
+            if gallery is None:
+                return None
+            self.galleries.move_to_end(modelID)
+            return gallery["layouts"].get(index)
+
+    '''
+    Returns (trees finished, total trees) for a model, or None if the model
+    is not in the gallery.
+    '''
+    def getProgress(self, modelID):
+        with self.lock:
+            gallery = self.galleries.get(modelID)
+            if gallery is None:
+                return None
+            return len(gallery["layouts"]) + gallery["failed"], gallery["total"]
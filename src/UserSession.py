@@ -1,14 +1,21 @@
+import os
+from session_store.SessionStoreFactory import SessionStoreFactory
+
 """
 AUTHOR: Dominic Cripps
 DATE CREATED: 19/02/2023
 PREVIOUS MAINTAINER: Dominic Cripps
-DATE LAST MODIFIED: 07/05/2023
+DATE LAST MODIFIED: 18/10/2026
 
 A singleton class that will hold settings set throughout the users session,
 it will allow the user to store multiple models and keep all relevant information
 in one class, avoiding circular dependencies.
 
-The following dictionaries are indexed by user ip.
+The session data is held by 'store', a 'SessionStore' indexed by session id.
+The backend is chosen with the SESSION_STORE environment variable ("memory"
+or "disk"), "disk" keeps the sessions in a file so they survive a restart
+and are shared by every worker process, so the app can be run with several
+gunicorn workers. "memory" requires a single worker (see 'SessionStore').
 """
 class UserSession(object):
 
@@ -17,8 +24,4 @@ class UserSession(object):
             self.instance = super(UserSession, self).__new__(self)
         return self.instance
 
-    modelInformation = {}
-    selectedModel = {}
-    
-    selectedTree = {}
-    selectedBoundary = {}
+    store = SessionStoreFactory.Factory(os.environ.get("SESSION_STORE"))
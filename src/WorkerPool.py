@@ -0,0 +1,83 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+A singleton class that holds the one local process pool shared by
+everything that runs work in other processes: model training
+('TrainingQueue'), laying out ensemble trees ('TreeGallery') and the
+boundary matrix ('DecisionBoundaryUtil').
+
+The workers are started with the "spawn" method, rather than forked
+from the server process, as the server runs callbacks on several
+threads and a forked child can inherit locks held by other threads.
+
+If a worker process dies the pool is broken and every task submitted
+to it fails with 'BrokenProcessPool'. The broken pool is then replaced,
+so the next task is run by a new pool instead of failing for the life
+of the server.
+
+The number of worker processes is limited by 'maxWorkers', which can be
+set with the WORKER_PROCESSES environment variable.
+"""
+class WorkerPool(object):
+
+    def __new__(self):
+        if not hasattr(self, 'instance'):
+            self.instance = super(WorkerPool, self).__new__(self)
+        return self.instance
+
+    maxWorkers = int(os.environ.get("WORKER_PROCESSES", max(1, (os.cpu_count() or 2) // 2)))
+    executor = None
+    lock = threading.Lock()
+
+    '''
+    Returns the process pool, creating it the first time it is needed
+    so that importing this file does not start any processes.
+    '''
+    def getExecutor(self):
+        with self.lock:
+            if self.executor is None:
+                WorkerPool.executor = ProcessPoolExecutor(max_workers = self.maxWorkers, mp_context = multiprocessing.get_context("spawn"))
+            return self.executor
+
+    '''
+    Replaces a broken pool, does nothing if the pool has already been replaced.
+
+    INPUTS
+    ProcessPoolExecutor executor : The pool that was found to be broken
+    '''
+    def reset(self, executor):
+        with self.lock:
+            if self.executor is not executor:
+                return
+            WorkerPool.executor = None
+        executor.shutdown(wait = False, cancel_futures = True)
+
+    '''
+    Runs a function in a worker process and returns its future. The
+    function must be defined at module level so that it can be pickled.
+    If the pool is broken it is replaced and the task is submitted again.
+    '''
+    def submit(self, function, *args):
+        executor = self.getExecutor()
+        try:
+            future = executor.submit(function, *args)
+        except BrokenProcessPool:
+            self.reset(executor)
+            executor = self.getExecutor()
+            future = executor.submit(function, *args)
+
+        def finished(future):
+            if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                self.reset(executor)
+
+        future.add_done_callback(finished)
+        return future
@@ -26,6 +26,8 @@ import callbacks.callbacks.ParallelCoordinatesCallbacks
 import callbacks.callbacks.TreeLoopCallbacks
 import callbacks.callbacks.BoundaryCallbacks
 import callbacks.callbacks.FeatureSpaceCallbacks
+import routes.UploadRoutes
+import routes.PredictRoutes
 
 
 pageLayout = PageLayout("Results visualisation", dash_app)
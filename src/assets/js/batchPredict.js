@@ -0,0 +1,64 @@
+/*
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Opens a file picker when 'batch-predict-button' is pressed and sends the
+chosen file to the '/predict-dataset' route to be scored by the model named
+in the button's 'data-model' attribute. The browser streams the file from
+disk as the request body, and the predictions returned by the server are
+downloaded as a csv file.
+
+The file input is created here rather than in the dash layout, as dash's
+html components do not include an input element.
+*/
+function scoreDataset(file, modelName) {
+    var sessionID = document.getElementById("user-session-name").value;
+    var message = document.getElementById("batch-predict-message");
+
+    if (!sessionID) {
+        message.textContent = "Error : Please Enter A Session ID";
+        return;
+    }
+
+    message.textContent = "Scoring " + file.name + "...";
+    fetch("/predict-dataset/" + encodeURIComponent(sessionID) + "/" + encodeURIComponent(modelName) + "?filename=" + encodeURIComponent(file.name), {
+        method: "POST",
+        body: file
+    })
+        .then(function (response) {
+            if (!response.ok) {
+                return response.json().then(function (result) { throw result.error; });
+            }
+            return response.blob();
+        })
+        .then(function (predictions) {
+            var link = document.createElement("a");
+            link.href = URL.createObjectURL(predictions);
+            link.download = "predictions_" + file.name;
+            link.click();
+            URL.revokeObjectURL(link.href);
+            message.textContent = "Predictions Downloaded";
+        })
+        .catch(function (error) {
+            message.textContent = "Error : " + error;
+        });
+}
+
+document.addEventListener("click", function (event) {
+    if (event.target.id !== "batch-predict-button") {
+        return;
+    }
+
+    var modelName = event.target.getAttribute("data-model");
+    var input = document.createElement("input");
+    input.type = "file";
+    input.accept = ".csv";
+    input.addEventListener("change", function () {
+        if (input.files.length > 0) {
+            scoreDataset(input.files[0], modelName);
+        }
+    });
+    input.click();
+});
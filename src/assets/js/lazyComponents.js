@@ -0,0 +1,28 @@
+/*
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Clicks each 'lazy-component-load' button once its placeholder row scrolls
+into view, so 'DisplayCallbacks.loadComponentRow' builds the row's components
+only when they are about to be seen. The rows are added by dash after the page
+has loaded, so new buttons are found by watching the page for changes.
+*/
+(function () {
+    var observer = new IntersectionObserver(function (entries) {
+        entries.forEach(function (entry) {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                entry.target.click();
+            }
+        });
+    }, { rootMargin: "200px" });
+
+    new MutationObserver(function () {
+        document.querySelectorAll(".lazyComponentLoad:not([data-observed])").forEach(function (button) {
+            button.setAttribute("data-observed", "true");
+            observer.observe(button);
+        });
+    }).observe(document.body, { childList: true, subtree: true });
+})();
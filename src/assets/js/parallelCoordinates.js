@@ -0,0 +1,27 @@
+/*
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Applies the change returned by 'ParallelCoordinatesCallbacks.changeDim' to the
+parallel coordinates figure in the browser. Only the changed dimension is copied,
+the rest of the figure (and every dimension's values) is shared with the old one.
+*/
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    parallelCoordinates: {
+        applyVisibility: function (change, figure) {
+            if (!change || !figure) {
+                return window.dash_clientside.no_update;
+            }
+
+            var trace = Object.assign({}, figure.data[0]);
+            trace.dimensions = trace.dimensions.slice();
+            trace.dimensions[change.index] = Object.assign({}, trace.dimensions[change.index], { visible: change.visible });
+
+            var data = figure.data.slice();
+            data[0] = trace;
+            return Object.assign({}, figure, { data: data });
+        }
+    }
+});
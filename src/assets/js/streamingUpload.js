@@ -0,0 +1,58 @@
+/*
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Opens a file picker when 'stream-upload-button' is pressed and sends the
+chosen file to the '/upload-dataset' route. The browser streams the file
+from disk as the request body, once the server has parsed it the
+'load-streamed-dataset' button is clicked so that dash loads the dataset
+into the training settings.
+
+The file input is created here rather than in the dash layout, as dash's
+html components do not include an input element.
+*/
+function streamDataset(file) {
+    var sessionID = document.getElementById("user-session-name").value;
+    var message = document.getElementById("stream-upload-message");
+
+    if (!sessionID) {
+        message.textContent = "Error : Please Enter A Session ID";
+        return;
+    }
+
+    message.textContent = "Uploading " + file.name + "...";
+    fetch("/upload-dataset/" + encodeURIComponent(sessionID) + "?filename=" + encodeURIComponent(file.name), {
+        method: "POST",
+        body: file
+    })
+        .then(function (response) { return response.json(); })
+        .then(function (result) {
+            if (result.error) {
+                message.textContent = "Error : " + result.error;
+            } else {
+                message.textContent = "";
+                document.getElementById("load-streamed-dataset").click();
+            }
+        })
+        .catch(function (error) {
+            message.textContent = "Error : " + error;
+        });
+}
+
+document.addEventListener("click", function (event) {
+    if (event.target.id !== "stream-upload-button") {
+        return;
+    }
+
+    var input = document.createElement("input");
+    input.type = "file";
+    input.accept = ".csv";
+    input.addEventListener("change", function () {
+        if (input.files.length > 0) {
+            streamDataset(input.files[0]);
+        }
+    });
+    input.click();
+});
@@ -2,28 +2,43 @@ from dash.dependencies import Input, Output, State, ALL
 from dash import ctx
 from UserSession import UserSession
 from utils.DecisionBoundaryUtil import DecisionBoundaryUtil
+from BoundaryCache import BoundaryCache
 import dash
-import copy
 from AppInstance import AppInstance
 from flask import request
+import os
 app = AppInstance().instance.app
 
 
 BoundaryUtil = DecisionBoundaryUtil()
 
+#The largest number of features the boundary matrix will pair, set with the
+#BOUNDARY_MATRIX_FEATURES environment variable
+maxMatrixFeatures = int(os.environ.get("BOUNDARY_MATRIX_FEATURES", 8))
+
 """
 AUTHOR: Daniel Ferring
 DATE CREATED: 22/03/2023
 PREVIOUS MAINTAINER: Daniel Ferring
-DATE LAST MODIFIED: 23/03/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Callback is triggered when the user presses the "pairwise-button"
 
 If the number of features selected is vald, the callback trains a new model and
-plots a decision boundary, returning the boundary object.
+plots a decision boundary, returning the boundary object. The model and heatmap
+of each feature pair are cached by 'BoundaryCache', so a pair that has been
+plotted before is not retrained.
 
 If the number of seleced features is invalid (>2 || <1), an error message is
 displayed, informing the user why their input is invalid 
+
+If the user presses the "pairwise-matrix-button" a matrix of boundaries is
+plotted instead, one for every pair of the selected features, or every pair
+of the model's features if none are selected. The cells are read from
+'BoundaryCache' too, the missing cells are computed in the shared worker pool.
+
+If the boundary cannot be computed (for example a worker process fails) the
+error is shown in the "feature-error" dialog instead of failing the callback.
 """
 
 @app.callback(
@@ -31,14 +46,37 @@ displayed, informing the user why their input is invalid
         Output(component_id = "feature-error", component_property = "displayed"),
         Output(component_id = "feature-error", component_property = "message")],
     [Input("pairwise-button", "n_clicks"),
+        Input("pairwise-matrix-button", "n_clicks"),
         State("trained-models", "value"),
         State("pairwise-features", "value"),
         State("user-session-name", component_property="value")]
 )
-def pairwisePlot(clicks, modelName, features, sessionID):
+def pairwisePlot(clicks, matrixClicks, modelName, features, sessionID):
     error = False
     errorMessage = ""
 
+    if "pairwise-matrix-button" == ctx.triggered_id:
+        modelInfo = UserSession().instance.store.getModelInfo(sessionID, modelName)
+        if len(features) == 0:
+            features = list(modelInfo["modelData"].feature_names_in_)
+
+        #Checks if selected features are invalid, displays errror message if they are
+        if len(features) < 2:
+            error = True
+            errorMessage = "Error: Please select at least two features for the boundary matrix"
+            return dash.no_update, error, errorMessage
+        if len(features) > maxMatrixFeatures:
+            error = True
+            errorMessage = "Error: Please select at most " + str(maxMatrixFeatures) + " features for the boundary matrix"
+            return dash.no_update, error, errorMessage
+
+        try:
+            pairs = BoundaryUtil.getMatrixPairs(modelInfo, features)
+            boundaries = BoundaryCache().instance.getBoundaries(modelInfo, pairs, BoundaryUtil.matrixDivisions)
+            return BoundaryUtil.generateBoundaryMatrix(modelInfo, features, boundaries), error, errorMessage
+        except Exception as e:
+            return dash.no_update, True, "Error: The boundary matrix could not be computed (" + str(e) + ")"
+
     if "pairwise-button" == ctx.triggered_id:
 
         #Checks if selected features are invalid, displays errror message if they are
@@ -51,29 +89,15 @@ def pairwisePlot(clicks, modelName, features, sessionID):
             errorMessage = "Error: You cannot select more than two features"
             return dash.no_update, error, errorMessage
 
-        #Creates a copy of modelInfo so that it can be modified without impacting the orginal
-        modelInfo = copy.deepcopy(UserSession().instance.modelInformation[sessionID][modelName])
-        trainingData = modelInfo['trainingData'][0]
-        testingData = modelInfo['testingData'][0]
-        
-        #Removes unused features from training and testing data
-        for x in trainingData.columns:
-            if x not in features:
-                trainingData = trainingData.drop(x, axis = 1)
-        for x in testingData.columns:
-            if x not in features:
-                testingData = testingData.drop(x, axis = 1)
-
-        #Trains model usin the selected features
-        model = modelInfo['selectedSettings'].classifier(**modelInfo['modelArguments']).fit(trainingData, modelInfo['trainingData'][1])
-
-        #Updates the copy of modelInfo to reflect changes
-        modelInfo['trainingData'][0] = trainingData
-        modelInfo['testingData'][0] = testingData
-        modelInfo['modelData'] = model
-
-        #Plots a decision boundary using the modified modelInfo object
-        return BoundaryUtil.generateDecisionBoundary(modelInfo, sessionID), error, errorMessage
+        #Retrains the model on the selected features only, the stored modelInfo is left untouched
+        modelInfo = UserSession().instance.store.getModelInfo(sessionID, modelName)
+        try:
+            boundary = BoundaryCache().instance.getBoundary(modelInfo, features)
+        except Exception as e:
+            return dash.no_update, True, "Error: The decision boundary could not be computed (" + str(e) + ")"
+
+        #Plots a decision boundary using the projected model
+        return BoundaryUtil.generateDecisionBoundary(boundary["boundaryInfo"], sessionID, boundary["heatmap"]), error, errorMessage
 
     return dash.no_update, error, errorMessage
 
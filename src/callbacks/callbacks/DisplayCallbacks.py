@@ -1,4 +1,5 @@
-from dash.dependencies import Input, Output, State
+from dash.dependencies import Input, Output, State, MATCH
+import dash
 from classifier_components.ClassifierComponentFactory import ClassifierComponentFactory
 from UserSession import UserSession
 from AppInstance import AppInstance
@@ -8,7 +9,7 @@ from flask import request
 AUTHOR: Dominic Cripps
 DATE CREATED: 17/02/2023
 PREVIOUS MAINTAINER: Dominic Cripps
-DATE LAST MODIFIED: 18/02/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Callback is triggered when the value of the 'trained-models'
 dropdown is changed, this indicates the user has selected a new
@@ -22,6 +23,9 @@ of classifier used to train the model.
 
 It will pass the classifier type into the class 'ClassifierComponentFactory' to 
 generate the necessary model components. e.g. info, tree, boundary etc.
+Only the first row is built here, the rest are placeholders loaded by
+'loadComponentRow'. The previous model's tree and boundary figures are
+cleared, as the new model's are only drawn once their rows load.
 
 """
 app = AppInstance().instance.app
@@ -38,8 +42,40 @@ def modelSelected(modelFilename, sessionID):
 
     classifierComponents = [()]
     if(modelFilename):
-        modelInfo = UserSession().instance.modelInformation[sessionID][modelFilename]
+        modelInfo = UserSession().instance.store.getModelInfo(sessionID, modelFilename)
+        UserSession().instance.store.setSelectedTree(sessionID, None)
+        UserSession().instance.store.setSelectedBoundary(sessionID, None)
         classifierComponents = ClassifierComponentFactory.Factory(modelInfo, sessionID)
-        UserSession().instance.selectedModel[sessionID] = modelInfo["modelData"]
+        UserSession().instance.store.setSelectedModel(sessionID, modelFilename)
         
-    return classifierComponents
\ No newline at end of file
+    return classifierComponents
+
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Callback is triggered when a 'lazy-component-load' button is clicked, this
+is done by assets/js/lazyComponents.js when the row's placeholder scrolls
+into view, or by the user.
+
+Callback output is the children of the placeholder row, the components of
+that row are built by 'ClassifierComponentFactory.buildRow', so each row's
+figures are only computed when the row is shown.
+"""
+@app.callback(
+    [Output({"type" : "lazy-component-row", "index" : MATCH}, component_property="children"),
+        Output({"type" : "lazy-component-row", "index" : MATCH}, component_property="style")],
+    [Input({"type" : "lazy-component-load", "index" : MATCH}, component_property="n_clicks"),
+    State({"type" : "lazy-component-load", "index" : MATCH}, component_property="id"),
+    State("trained-models", component_property="value"),
+    State("user-session-name", component_property="value")]
+)
+def loadComponentRow(clicks, rowID, modelFilename, sessionID):
+    if not clicks or sessionID == None or sessionID == "" or modelFilename == None or modelFilename == "":
+        return dash.no_update, dash.no_update
+
+    modelInfo = UserSession().instance.store.getModelInfo(sessionID, modelFilename)
+    return ClassifierComponentFactory.buildRow(modelInfo, sessionID, rowID["index"]), {}
\ No newline at end of file
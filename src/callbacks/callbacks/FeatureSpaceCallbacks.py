@@ -7,6 +7,8 @@ from AppInstance import AppInstance
 import pandas as pd
 import numpy as np
 from flask import request
+import plotly.graph_objects as go
+from utils.Util import ModelUtil
 
 app = AppInstance().instance.app
 
@@ -15,7 +17,7 @@ app = AppInstance().instance.app
 AUTHOR: Ethan Temple-Betts
 DATE CREATED: 20/03/2023
 PREVIOUS MAINTAINER: Ethan Temple-Betts
-DATE LAST MODIFIED: 20/03/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Callback is triggered when the new features are selected
 
@@ -24,18 +26,26 @@ Callback output is the feature space figure.
 The function 'updateFeatureSpace' will alter the axis of the
 graph depending on the provided features
 
+Datasets larger than 'ModelUtil.plotSampleRows' are drawn from a
+stratified sample (the fraction is shown in the title) unless
+'Show All Rows' is ticked. With 'Density' ticked the points are
+counted on the server in a grid of bins, and only the bins are drawn.
+
 """
 @app.callback(
-    [Output(component_id="fs_plot", component_property="figure")],
+    [Output(component_id="fs_plot", component_property="figure"),
+        Output(component_id="fs_sample_fraction", component_property="children")],
     [Input("fs_xfeature_select", component_property="value"),
         Input("fs_yfeature_select", component_property = "value"),
         Input("fs_zfeature_select", component_property = "value"),
         Input("trained-models", component_property="value"),
+        Input("fs_options", component_property="value"),
         State("user-session-name", component_property="value")]
 )
-def updateFeatureSpace(xFeature, yFeature, zFeature, modelKey, userSession):
+def updateFeatureSpace(xFeature, yFeature, zFeature, modelKey, options, userSession):
+    options = options or []
     # if no model is selected selct the first model trained
-    modelInfo = (UserSession.instance.modelInformation[userSession])[modelKey]
+    modelInfo = UserSession().instance.store.getModelInfo(userSession, modelKey)
 
     xTest = modelInfo["testingData"][0]
     yTest = (modelInfo["testingData"][1]).to_frame()
@@ -54,9 +64,18 @@ def updateFeatureSpace(xFeature, yFeature, zFeature, modelKey, userSession):
     else:
         color = data.columns[0]
 
+    # The density is counted from every row, the points are sampled
+    sampleText = ""
+    if "density" not in options and "all" not in options:
+        sample = ModelUtil.stratifiedSample(data[color])
+        sampleText = ModelUtil.describeSample(len(sample), len(data))
+        data = data.iloc[sample]
+
     # Create 3d or 2d plot depending on provided features
     try:
-        if xFeature and yFeature and zFeature:
+        if "density" in options and xFeature and yFeature:
+            fig = createDensityPlot(data, [feature for feature in [xFeature, yFeature, zFeature] if feature])
+        elif xFeature and yFeature and zFeature:
             fig = px.scatter_3d(data_frame=data,
                                 x=xFeature, y=yFeature, z=zFeature,
                                 color=color)
@@ -64,9 +83,9 @@ def updateFeatureSpace(xFeature, yFeature, zFeature, modelKey, userSession):
             fig = px.scatter(data_frame=data, x=xFeature, y=yFeature, color=color)
         else:
             fig = px.scatter()
-    # Except ValueError's caused by feture names not making columns in the data frame
+    # Except ValueError's and KeyError's caused by feture names not making columns in the data frame
     # caused when a user changes model and return an empty graph
-    except ValueError:
+    except (ValueError, KeyError):
             fig = px.scatter()
 
     fig.update_layout(
@@ -74,4 +93,40 @@ def updateFeatureSpace(xFeature, yFeature, zFeature, modelKey, userSession):
         font_color = "#f5f5f5",
         plot_bgcolor="#232323")
 
-    return [fig]
+    return fig, sampleText
+
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Returns a figure of the number of points in each bin of a regular grid
+over 2 or 3 features. In 2D the counts are drawn as a heatmap, in 3D
+each non empty bin is drawn as a point sized and coloured by its count.
+The figure's size depends on the number of bins, not the number of rows.
+"""
+def createDensityPlot(data, features, bins = 50):
+    values = data[features].to_numpy(dtype = np.float64)
+    values = values[~np.isnan(values).any(axis = 1)]
+    bins = bins if len(features) == 2 else bins // 2
+    counts, edges = np.histogramdd(values, bins = bins)
+    centres = [(edge[:-1] + edge[1:]) / 2 for edge in edges]
+
+    if len(features) == 2:
+        fig = go.Figure(go.Heatmap(x = centres[0], y = centres[1], z = counts.T, colorscale = "sunset", colorbar = dict(title = "Count")))
+        fig.update_layout(xaxis_title = features[0], yaxis_title = features[1])
+        return fig
+
+    filled = np.nonzero(counts)
+    count = counts[filled]
+    if len(count) == 0:
+        return px.scatter()
+    fig = go.Figure(go.Scatter3d(
+        x = centres[0][filled[0]], y = centres[1][filled[1]], z = centres[2][filled[2]],
+        mode = "markers",
+        marker = dict(size = 3 + 12 * np.sqrt(count / count.max()), color = count, colorscale = "sunset", colorbar = dict(title = "Count")),
+        text = count.astype(np.int64), hoverinfo = "text"))
+    fig.update_layout(scene = dict(xaxis_title = features[0], yaxis_title = features[1], zaxis_title = features[2]))
+    return fig
@@ -1,4 +1,4 @@
-from dash.dependencies import Input, Output, State, ALL
+from dash.dependencies import Input, Output, State, ALL, ClientsideFunction
 from dash import ctx
 import dash
 from dash import Dash, dcc, html
@@ -6,6 +6,7 @@ from UserSession import UserSession
 import pandas as pd
 import numpy as np
 from AppInstance import AppInstance
+from classifier_components.components.ClassifierParallelCoordinatesComponent import ClassifierParallelCoordinatesComponent
 
 
 
@@ -13,11 +14,13 @@ from AppInstance import AppInstance
 AUTHOR: Ethan Temple-Betts
 DATE CREATED: 04/03/2023
 PREVIOUS MAINTAINER: Ethan Temple-Betts
-DATE LAST MODIFIED: 04/03/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Callback is triggered when the '+' or '-' buttons are pressed
 
-Callback output is the parallel coordinates figure.
+Callback output is the dimension of the parallel coordinates
+figure that has changed, {"index", "visible"}, and the visibility
+of every feature.
 
 The function 'changeDim' will attempt to add or remove
 the feature curently selected in the dimension dropdown box
@@ -25,30 +28,76 @@ based on wether the '-' or '+' button was pressed.
 It does this by changing the dimensions visibility property
 to True or False, whichever is appropriate.
 
+The dimensions of the figure are in the same order as the options of
+the dropdown, so the index of the dimension is the index of the selected
+feature, and the figure is not needed to find it. Only the visibility
+of each feature is kept, in 'pc_visible_dims' in the browser, for
+'showAllRows' to redraw the figure with.
+'assets/js/parallelCoordinates.js' then applies the change to the figure
+already in the browser, so a click sends neither the figure to the server
+nor the figure back.
+
 """
 app = AppInstance().instance.app
 @app.callback(
-    [Output(component_id="pc_plot", component_property="figure")],
-    [Input("pc_dim_select", component_property="value"),
-        Input("pc_add_dim", component_property = "n_clicks"),
+    [Output(component_id="pc_visibility", component_property="data"),
+        Output(component_id="pc_visible_dims", component_property="data")],
+    [Input("pc_add_dim", component_property = "n_clicks"),
         Input("pc_del_dim", component_property = "n_clicks"),
-        Input("pc_plot", component_property = "figure")]
+        State("pc_dim_select", component_property="value"),
+        State("pc_dim_select", component_property="options"),
+        State("pc_visible_dims", component_property="data")]
+)
+def changeDim(addClicks, delClicks, value, options, mask):
+    if ctx.triggered_id not in ("pc_add_dim", "pc_del_dim") or options is None or value not in options:
+        return dash.no_update, dash.no_update
+
+    # Adding makes the dimension visible and removing hides it
+    visible = "pc_add_dim" == ctx.triggered_id
+    index = options.index(value)
+    mask = list(mask) if mask is not None and len(mask) == len(options) else [False] * len(options)
+    if mask[index] == visible:
+        return dash.no_update, dash.no_update
+
+    mask[index] = visible
+    return {"index" : index, "visible" : visible}, mask
+
+
+app.clientside_callback(
+    ClientsideFunction(namespace = "parallelCoordinates", function_name = "applyVisibility"),
+    Output("pc_plot", "figure"),
+    Input("pc_visibility", "data"),
+    State("pc_plot", "figure")
 )
-def changeDim(value, addClicks, delClicks, fig):
-    
-    if "pc_add_dim" == ctx.triggered_id:
-        for i in fig['data'][0]['dimensions']:
-            # If the specified dimension is not visible
-            # then make it visible
-            if (value == i['label']) and (i['visible'] == False):
-                i['visible'] = True
-
-    elif "pc_del_dim" == ctx.triggered_id:
-        for i in fig['data'][0]['dimensions']:
-            # If the specified dimension is visible
-            # then make it  not visible
-            if (value == i['label']) and (i['visible'] == True):
-                i['visible'] = False
-
-
-    return [fig]
+
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Callback is triggered when 'Show All Rows' is ticked or unticked.
+
+Callback output is a new parallel coordinates graph drawn from every row
+of the testing data, or from a stratified sample when unticked, and the
+sample fraction shown in the component title. The features the user has
+added with '+' stay visible in the new graph.
+"""
+@app.callback(
+    [Output(component_id="pc_plot_container", component_property="children"),
+        Output(component_id="pc_sample_fraction", component_property="children")],
+    [Input("pc_show_all", component_property="value"),
+        State("pc_dim_select", component_property="options"),
+        State("pc_visible_dims", component_property="data"),
+        State("trained-models", component_property="value"),
+        State("user-session-name", component_property="value")]
+)
+def showAllRows(value, options, mask, modelKey, sessionID):
+    if "pc_show_all" != ctx.triggered_id:
+        return dash.no_update, dash.no_update
+
+    visibleFeatures = [feature for feature, visible in zip(options or [], mask or []) if visible]
+    modelInfo = UserSession().instance.store.getModelInfo(sessionID, modelKey)
+    component = ClassifierParallelCoordinatesComponent(modelInfo, "all" in (value or []), visibleFeatures)
+    return component.graph, component.sampleText
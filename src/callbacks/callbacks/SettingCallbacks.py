@@ -2,6 +2,7 @@ from dash import ctx
 import dash
 from dash.dependencies import Input, Output, State, ALL
 from utils.Util import ImportUtil as ImportUtil
+from utils.Util import ModelUtil
 from model_settings.ModelSettingsFactory import ClassifierSettingsFactory
 from sklearn.model_selection import train_test_split
 from UserSession import UserSession
@@ -9,9 +10,15 @@ import pandas as pd
 import numpy as np
 from AppInstance import AppInstance
 from flask import request
+import uuid
+import time
+from dash import html
+from TrainingQueue import TrainingQueue
+from DatasetRegistry import DatasetRegistry
+from ModelCache import ModelCache
+from TreeGallery import TreeGallery
+from BoundaryCache import BoundaryCache
 
-df = []
-selectedSettings = ClassifierSettingsFactory.Factory(None)
 trainingData = []
 
 app = AppInstance().instance.app
@@ -19,16 +26,19 @@ app = AppInstance().instance.app
 AUTHOR: Dominic Cripps
 DATE CREATED: 17/02/2023
 PREVIOUS MAINTAINER: Dominic Cripps
-DATE LAST MODIFIED: 18/02/2023
+DATE LAST MODIFIED: 18/10/2026
 
-Callback is triggered when the user has uploaded a file into 'upload-dataset'.
+Callback is triggered when the user has uploaded a file into 'upload-dataset',
+or when a dataset streamed to the '/upload-dataset' route has finished uploading
+(the upload script clicks 'load-streamed-dataset').
 
 Callback output will show appropriate error messages and update the 
 'classifer' and 'training-feature' checklists to contain the column titles 
 from the dataset.
 
 It will check for a correct file extension, and that the contents has been
-read properly.
+read properly. The dataset becomes the session's current dataset in the
+'DatasetRegistry', a file that has already been uploaded is not parsed again.
 
 """
 @app.callback(
@@ -39,16 +49,40 @@ read properly.
     Output(component_id = "classifier", component_property = "options"),
     Output(component_id = "training-features", component_property = "value"),
     Output(component_id = "classifier", component_property = "value")],
-    [Input("upload-dataset", "filename"), Input("upload-dataset", "contents")]
+    [Input("upload-dataset", "filename"), Input("upload-dataset", "contents"),
+    Input("load-streamed-dataset", "n_clicks"),
+    State("user-session-name", component_property="value")]
 )
-def readDataframe(filename, contents):
+def readDataframe(filename, contents, streamClicks = None, sessionID = None):
     defaultUploadMessage = "Drag and drop or click to upload a dataset (.csv) "
+    registry = DatasetRegistry().instance
+
+    if streamClicks and "load-streamed-dataset" == ctx.triggered_id:
+        # The '/upload-dataset' route has already registered the dataset
+        entry = registry.getEntry(sessionID)
+        if entry is None:
+            return True, "No Streamed Dataset Found For This Session!", defaultUploadMessage, [], [], [], []
+        columns = entry["dataFrame"].columns
+        return False, "", ImportUtil.describeIngest(entry["filename"], entry["report"]), columns, columns, [], []
 
     if(contents):
         if(str(filename[0]).endswith(".csv")):
-            df.insert(0, ImportUtil.csvToDataFrame(ImportUtil.readContent(filename, contents[0])))
-            ImportUtil.sanitiseData(df[0])
-            return False, "", str(filename[0]), df[0].columns, df[0].columns, [], []
+            if (sessionID == None or sessionID == ""):
+                return True, "Error : Please Enter A Session ID", defaultUploadMessage, [], [], [], []
+
+            # The upload is decoded to bytes and parsed directly, it is never
+            # converted to a python string
+            content = ImportUtil.readContentBytes(filename, contents[0])
+            contentHash = registry.hashContent(content.getbuffer())
+            # Selects the dataset if it is already held, otherwise it is parsed
+            entry = registry.useDataset(sessionID, contentHash)
+            if entry is None:
+                dataFrame, report = ImportUtil.ingestCsv(content)
+                ImportUtil.sanitiseData(dataFrame)
+                entry = registry.register(sessionID, contentHash, dataFrame, str(filename[0]), report)
+
+            columns = entry["dataFrame"].columns
+            return False, "", ImportUtil.describeIngest(filename[0], entry["report"]), columns, columns, [], []
         else:
             return True, "Wrong File Type!", defaultUploadMessage, [], [], [], []
     else:
@@ -60,7 +94,7 @@ def readDataframe(filename, contents):
 AUTHOR: Dominic Cripps
 DATE CREATED: 17/02/2023
 PREVIOUS MAINTAINER: Dominic Cripps
-DATE LAST MODIFIED: 18/02/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Callback is triggered when the user selected a training classifer.
 
@@ -77,7 +111,6 @@ appropriate settings.
         [Input("training-class", "value")]
 )
 def updateClassifierSettings(classifier):
-    global selectedSettings
     selectedSettings = ClassifierSettingsFactory.Factory(classifier)
     settings = selectedSettings.classifierLayout
 
@@ -85,11 +118,134 @@ def updateClassifierSettings(classifier):
 
 
 
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Creates the record stored in the 'UserSession' singleton for a newly fitted
+model. This is called by the 'TrainingQueue' once a model has finished
+training in the background.
+
+Inputs : The fitted model, the data it was trained and tested with, the
+settings that were used to train it and the encoding of its raw feature
+columns (see 'ModelUtil.getFeatureEncoding').
+"""
+def createModelInfo(model, xTrain, yTrain, xTest, yTest, arguments, split, filename, settings, encoding = None):
+    classType = str(type(model)).replace('>', '').replace("'", '').split('.')
+    classType = classType[len(classType) - 1]
+
+    # Identifies this trained model, used to tag anything cached for it
+    modelID = uuid.uuid4().hex
+
+    #Dictionaries used to map class names to colours and shapes
+    colourKey = {}
+    shapeKey = {}
+
+    #determines the colour of the class
+    id = 0
+
+    #used to select shapes from the plotly library
+    symbolIndex = 0
+    symbols = [0, 1, 2, 3, 4, 5, 13, 15, 17, 18, 19, 22]
+
+    #Creates an entry in both dictionaries for each class, assigning a unique value for both
+    for i in model.classes_:
+        colourKey[str(i)] = id
+        shapeKey[str(i)] = symbols[symbolIndex]
+        id += 1
+        symbolIndex += 1
+        if symbolIndex > 11:
+            symbolIndex = 0
+
+    # The information that will be stored in the 'UserSession' singleton
+    # this will be accessed when a model is selected, any information
+    # needed for a classifier component should be stored here upon training.
+    modelInfo = {
+        "modelData" : model, 
+        "trainingData" : [xTrain, yTrain],
+        "testingData" : [xTest, yTest],
+        "modelArguments" : arguments, 
+        "testTrainSplit" : split, 
+        "classifierType" : classType,
+        "modelName" : str(filename),
+        "selectedSettings" : settings,
+        "colourKey" : colourKey,
+        "shapeKey" : shapeKey,
+        "modelID" : modelID,
+        "featureEncoding" : encoding
+        }
+
+    # Test set predictions are made once here and shared by every component,
+    # a retrained model gets a new modelID so a stale cache is never used
+    modelInfo["testPredictions"] = ModelUtil.predictTestData(model, xTest, modelID)
+
+    return modelInfo
+
+
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Builds the text shown under the train button describing the state of
+every training job in the session. Jobs that have finished are removed 
+from the queue once they have been reported. A job cancelled while its
+fit is running is reported as "Cancelled (finishing)" until the fit
+returns, as it keeps its worker process until then.
+
+Returns the status text, the name of the most recently completed model 
+(or None) and whether any job is still queued or training.
+"""
+def getTrainingStatus(sessionID):
+    queue = TrainingQueue().instance
+    status = []
+    completed = None
+    active = False
+
+    for job in queue.getSessionJobs(sessionID):
+        state = queue.getStatus(job)
+        if state == "Queued" or state == "Training" or state == "Cancelling":
+            active = True
+            elapsed = int(time.time() - job["submitted"])
+            label = "Cancelled (finishing)" if state == "Cancelling" else state
+            status.append(html.Div(label + " : " + job["name"] + " (" + str(elapsed) + "s)"))
+        else:
+            if state == "Complete":
+                completed = job["name"]
+                status.append(html.Div("Trained : " + job["name"]))
+            elif state == "Failed":
+                status.append(html.Div("Failed : " + job["name"] + " - " + queue.getError(job)))
+            else:
+                status.append(html.Div("Cancelled : " + job["name"]))
+            queue.remove(job["jobID"])
+
+    return status, completed, active
+
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Returns a line for the training status showing how often a trained
+model has been reused from the 'ModelCache'.
+"""
+def getCacheStatus():
+    stats = ModelCache().instance.getStats()
+    return html.Div("Model Cache : " + str(stats["hits"]) + " Hits, " + str(stats["misses"]) + " Misses, " + str(stats["entries"]) + " Stored")
+
+
+
 """
 AUTHOR: Dominic Cripps
 DATE CREATED: 17/02/2023
 PREVIOUS MAINTAINER: Daniel Ferring
-DATE LAST MODIFIED: 16/03/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Callback is triggered when the user presses the train button.
 
@@ -102,15 +258,25 @@ to display the model)
 Inputs : The value of all setting components
 
 It performs sanity checks using the selected settings, if it passes them
-all it will create the appropriate dataframes, train the data and fit 
-a model with all classifier specific settings as arguments.
+all it will create the appropriate dataframes and submit the model, with all 
+classifier specific settings as arguments, to the 'TrainingQueue'. 
+
+The fit happens in a background process so the callback returns immediately 
+with the job id and enables 'training-interval'. Each tick of the interval 
+triggers this callback again to report progress, when a job completes its 
+model is added to 'trained-models' and the interval is disabled once no jobs 
+are left. The 'cancel-training-button' cancels the most recent job, a job
+that has already started is shown as finishing until its fit returns.
 """
 @app.callback(
     [Output(component_id="training-alert", component_property="displayed"), 
     Output(component_id = "training-alert", component_property = "message"),
     Output(component_id = "trained-models", component_property="options"),
     Output(component_id = "trained-models", component_property="value"),
-    Output(component_id = "session-id-display", component_property="children")],
+    Output(component_id = "session-id-display", component_property="children"),
+    Output(component_id = "training-interval", component_property="disabled"),
+    Output(component_id = "training-status", component_property="children"),
+    Output(component_id = "training-job", component_property="data")],
     [
     Input("train-button", "n_clicks"), 
     State(dict(name="classifier-settings", idx=ALL), "value"),
@@ -121,43 +287,60 @@ a model with all classifier specific settings as arguments.
     State("training-filename", "value"),
     State("training-class", "value"),
     State("user-session-name", component_property="value"),
-    Input("user-session-button", "n_clicks")
+    Input("user-session-button", "n_clicks"),
+    Input("training-interval", "n_intervals"),
+    Input("cancel-training-button", "n_clicks"),
+    State("training-job", "data")
     ] 
 )
-def train(clicks, classifierSettings, customParameters, features, classifier, split, filename, modelClass, sessionID, sessionClicks):
+def train(clicks, classifierSettings, customParameters, features, classifier, split, filename, modelClass, sessionID, sessionClicks, intervals = None, cancelClicks = None, jobID = None):
     errorMessage = ""
     error = False
     modelFilenames = []
+    noUpdate = (dash.no_update, dash.no_update, dash.no_update)
 
-    if(sessionID in UserSession().instance.modelInformation):
-            modelFilenames = [modelName for modelName in UserSession().instance.modelInformation[sessionID]] 
+    store = UserSession().instance.store
+    modelFilenames = store.getModelNames(sessionID)
 
 
     if "user-session-button" == ctx.triggered_id:
         if (sessionID == None or sessionID == ""):
             errorMessage += " \n Error : Please Enter A Session ID"
             error = True 
-            return error, errorMessage, dash.no_update, dash.no_update, dash.no_update
-        
-        
-        if(sessionID in UserSession().instance.modelInformation):
-            modelFilenames = [modelName for modelName in UserSession().instance.modelInformation[sessionID]] 
+            return (error, errorMessage, dash.no_update, dash.no_update, dash.no_update) + noUpdate
+
+        # Resume reporting on any models this session is still training
+        status, completed, active = getTrainingStatus(sessionID)
+        return False, "", modelFilenames, dash.no_update, "Current Session : " + sessionID, not active, status, dash.no_update
+
+    if "training-interval" == ctx.triggered_id:
+        if (sessionID == None or sessionID == ""):
+            return (False, "", dash.no_update, dash.no_update, dash.no_update, True) + noUpdate[:2]
+
+        status, completed, active = getTrainingStatus(sessionID)
+        if completed == None:
+            return False, "", dash.no_update, dash.no_update, dash.no_update, not active, status, dash.no_update
+
+        return False, "", store.getModelNames(sessionID), completed, dash.no_update, not active, status, dash.no_update
 
-        return False, "", modelFilenames, dash.no_update, "Current Session : " + sessionID
+    if "cancel-training-button" == ctx.triggered_id:
+        if jobID == None or not TrainingQueue().instance.cancel(jobID):
+            return (False, "", dash.no_update, dash.no_update, dash.no_update) + noUpdate
+        status, completed, active = getTrainingStatus(sessionID)
+        return False, "", dash.no_update, dash.no_update, dash.no_update, not active, status, None
 
     if "train-button" == ctx.triggered_id:
         if (sessionID == None or sessionID == ""):
             errorMessage += " \n Error : Please Enter A Session ID"
             error = True 
-            return error, errorMessage, dash.no_update, dash.no_update, dash.no_update
+            return (error, errorMessage, dash.no_update, dash.no_update, dash.no_update) + noUpdate
 
-        if(sessionID in UserSession().instance.modelInformation):
-            modelFilenames = [modelName for modelName in UserSession().instance.modelInformation[sessionID]] 
-        else:
-            UserSession().instance.modelInformation[sessionID] = {}
+        store.createSession(sessionID)
 
-        if(len(df) == 0):
-            return False, "", modelFilenames, dash.no_update, "Current Session : " + sessionID
+        # A view of the session's dataset, it shares the registry's data
+        dataset = DatasetRegistry().instance.getDataset(sessionID)
+        if(dataset is None):
+            return (False, "", modelFilenames, dash.no_update, "Current Session : " + sessionID) + noUpdate
 
         if(modelClass == None):
             errorMessage += " \n Error : You Must Select A Model Class"
@@ -166,7 +349,7 @@ def train(clicks, classifierSettings, customParameters, features, classifier, sp
         if(len(classifier) == 0 or len(features) == 0):
             errorMessage += " \n Error : You Must Select At Least One Classifier And Feature"
             error = True 
-            return error, errorMessage, modelFilenames, dash.no_update, "Current Session : " + sessionID
+            return (error, errorMessage, modelFilenames, dash.no_update, "Current Session : " + sessionID) + noUpdate
 
         if(len(classifier) > 1):
             errorMessage += " \n Error : You Cannot Select More Than One Classifier"
@@ -180,82 +363,80 @@ def train(clicks, classifierSettings, customParameters, features, classifier, sp
         if(filename == None):
             errorMessage += " \n Error : You Need To Provide A Filename"
             error = True
-            return error, errorMessage, modelFilenames, dash.no_update, "Current Session : " + sessionID
+            return (error, errorMessage, modelFilenames, dash.no_update, "Current Session : " + sessionID) + noUpdate
         
 
 
         '''
-        if(isinstance(df[0][classifier[0]][0], float)):
+        if(isinstance(dataset[classifier[0]][0], float)):
             errorMessage += " \n We Do Not Currently Support Regression Problems, Use A Categorical or Integer Feature As The Classifier To Create A Classification Problem "
             error = True
 
-        if(len(np.unique(df[0][classifier[0]])) > 50):
+        if(len(np.unique(dataset[classifier[0]])) > 50):
             errorMessage += " \n We Do Not Support The Training Of A Model With More Than 50 Classes"
             error = True
         '''
 
         if error == False:
-            dfIn = pd.get_dummies(df[0].drop(df[0].columns.difference(features), axis = 1))
-            dfOut = df[0][str(classifier[0])]
-            xTrain, xTest, yTrain, yTest = train_test_split(dfIn, dfOut, test_size = split)
-            
             arguments = {}
+
+            # The settings are created from the request rather than kept between
+            # callbacks, the request may be served by a different worker process.
+            # They are captured now, the user may select a different classifier
+            # before the model has finished training
+            settings = ClassifierSettingsFactory.Factory(modelClass)
             
             for i in range (0, len(classifierSettings)):
-                print("running\n")
                 if customParameters[i] == True:
                     if classifierSettings[i] != None:
-                        arguments[selectedSettings.parameters[i]] = classifierSettings[i] 
+                        arguments[settings.parameters[i]] = classifierSettings[i] 
                     else:
                         errorMessage += " \n Error : A Selected Parameter Has No Value"
                         error = True
-                        return error, errorMessage, modelFilenames, dash.no_update, "Current Session : " + sessionID
-
-            model = selectedSettings.classifier(**arguments).fit(xTrain, yTrain)
-
-            classType = str(type(model)).replace('>', '').replace("'", '').split('.')
-            classType = classType[len(classType) - 1]
-
-            #Dictionaries used to map class names to colours and shapes
-            colourKey = {}
-            shapeKey = {}
-
-            #determines the colour of the class
-            id = 0
-
-            #used to select shapes from the plotly library
-            symbolIndex = 0
-            symbols = [0, 1, 2, 3, 4, 5, 13, 15, 17, 18, 19, 22]
-
-            #Creates an entry in both dictionaries for each class, assigning a unique value for both
-            for i in model.classes_:
-                colourKey[str(i)] = id
-                shapeKey[str(i)] = symbols[symbolIndex]
-                id += 1
-                symbolIndex += 1
-                if symbolIndex > 11:
-                    symbolIndex = 0
-
-                # The information that will be stored in the 'UserSession' singleton
-                # this will be accessed when a model is selected, any information
-                # needed for a classifier component should be stored here upon training.
-                modelInfo = {
-                    "modelData" : model, 
-                    "trainingData" : [xTrain, yTrain],
-                    "testingData" : [xTest, yTest],
-                    "modelArguments" : arguments, 
-                    "testTrainSplit" : split, 
-                    "classifierType" : classType,
-                    "modelName" : str(filename),
-                    "selectedSettings" : selectedSettings,
-                    "colourKey" : colourKey,
-                    "shapeKey" : shapeKey
-                    }
-
-            UserSession().instance.modelInformation[sessionID][str(filename)] = modelInfo
-
-            modelFilenames = [modelName for modelName in UserSession().instance.modelInformation[sessionID]]
-
-            return error, errorMessage, modelFilenames, filename, "Current Session : " + sessionID
+                        return (error, errorMessage, modelFilenames, dash.no_update, "Current Session : " + sessionID) + noUpdate
+
+            rawFeatures = dataset.drop(dataset.columns.difference(features), axis = 1)
+            # Recorded so that files scored by the model are encoded in the same way
+            encoding = ModelUtil.getFeatureEncoding(rawFeatures)
+            dfIn = pd.get_dummies(rawFeatures)
+            dfOut = dataset[str(classifier[0])]
+            # Class columns may be stored as categoricals, the models and
+            # components expect the class labels themselves
+            if isinstance(dfOut.dtype, pd.CategoricalDtype):
+                dfOut = dfOut.astype(object)
+
+            # The classifier's random state also seeds the split, so a seeded request
+            # always produces the same data and model and can be served from the cache
+            seed = arguments.get("random_state")
+            xTrain, xTest, yTrain, yTest = train_test_split(dfIn, dfOut, test_size = split, random_state = seed)
+
+            cache = ModelCache().instance
+            cacheKey = cache.getKey(DatasetRegistry().instance.getHash(sessionID), features, classifier[0], split, seed, settings.classifier, arguments)
+            cached = cache.get(cacheKey)
+            if cached is not None:
+                # Only the fitted model is shared, the record around it (and its modelID) is new
+                modelInfo = createModelInfo(cached, xTrain, yTrain, xTest, yTest, arguments, split, filename, settings, encoding)
+                store.setModelInfo(sessionID, str(filename), modelInfo)
+                TreeGallery().instance.submit(modelInfo["modelID"], modelInfo["modelData"])
+                BoundaryCache().instance.prewarm(modelInfo)
+                status, completed, active = getTrainingStatus(sessionID)
+                status.append(html.Div("Loaded From Cache : " + str(filename)))
+                status.append(getCacheStatus())
+                return error, errorMessage, store.getModelNames(sessionID), str(filename), "Current Session : " + sessionID, not active, status, dash.no_update
+
+            def storeModel(model):
+                modelInfo = createModelInfo(model, xTrain, yTrain, xTest, yTest, arguments, split, filename, settings, encoding)
+                UserSession().instance.store.setModelInfo(sessionID, str(filename), modelInfo)
+                ModelCache().instance.put(cacheKey, model)
+                # Ensemble models have their trees laid out in the background
+                TreeGallery().instance.submit(modelInfo["modelID"], model)
+                # The most informative pairwise boundaries are computed in the background
+                BoundaryCache().instance.prewarm(modelInfo)
+
+            jobID = TrainingQueue().instance.submit(sessionID, str(filename), settings.classifier, arguments, xTrain, yTrain, storeModel)
+            status, completed, active = getTrainingStatus(sessionID)
+            status.append(getCacheStatus())
+
+            return error, errorMessage, modelFilenames, dash.no_update, "Current Session : " + sessionID, False, status, jobID
         
-    return error, errorMessage, modelFilenames, dash.no_update, dash.no_update
+    return (error, errorMessage, modelFilenames, dash.no_update, dash.no_update) + noUpdate
@@ -6,11 +6,12 @@ from utils.TreeUtil import TreeUtil
 from AppInstance import AppInstance
 from UserSession import UserSession
 from flask import request
+from TreeGallery import TreeGallery
 """
 AUTHOR: Dominic Cripps
 DATE CREATED: 23/02/2023
 PREVIOUS MAINTAINER: Kieran Patel
-DATE LAST MODIFIED: 16/05/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Callback is triggered when the buttons 'back-button-tree' or 'forward-button-tree' are clicked.
 
@@ -21,20 +22,48 @@ The function 'circularTree' checks the type of ensemble model being used and gen
 Addition: the circular tree now allows checks which type of ensemble model is
 being used and outputs the correct tree visualisation.
 
+Each estimator's layout is cached by (model id, estimator index), so paging
+back to a tree that has already been drawn does not lay it out again. Trees
+laid out in the background by the 'TreeGallery' are drawn from its layout,
+and 'gallery-interval' updates the label with its progress until it is done.
+Each tick only reads the model id and number of trees from 'gallery-model',
+the model is not loaded from the session store until a tree is drawn.
+
 """
 app = AppInstance().instance.app
 @app.callback(
     [Output(component_id="subtree-label", component_property="children"),
-        Output(component_id="subtree-graph", component_property="children")],
+        Output(component_id="subtree-graph", component_property="children"),
+        Output(component_id="gallery-interval", component_property="disabled")],
     [Input("back-button-tree", component_property="n_clicks"),
         Input("forward-button-tree", component_property="n_clicks"),
-        State("user-session-name", component_property="value")
+        Input("gallery-interval", component_property="n_intervals"),
+        State("gallery-model", component_property="data"),
+        State("user-session-name", component_property="value"),
+        State("trained-models", component_property="value")
         ]
 )
-def circularTree(backClick, forwardClick, sessionID):
-    classifier = UserSession().instance.selectedModel[sessionID]
+def circularTree(backClick, forwardClick, intervals, gallery, sessionID, modelName = None):
+    if "gallery-interval" == ctx.triggered_id:
+        if gallery is None:
+            return dash.no_update, dash.no_update, True
+        label, rendering = getLabel((forwardClick - backClick) % gallery["total"], gallery["total"], gallery["modelID"])
+        return label, dash.no_update, not rendering
+
+    store = UserSession().instance.store
+    if modelName != None:
+        modelInfo = store.getModelInfo(sessionID, modelName)
+        classifier = modelInfo["modelData"]
+        modelID = modelInfo.get("modelID")
+    else:
+        classifier = store.getSelectedModel(sessionID)
+        modelID = None
+        # No model has been selected yet, so there are no trees to page through
+        if classifier is None:
+            return dash.no_update, dash.no_update, True
     length = len(classifier.estimators_)
     index = (forwardClick - backClick) % length
+    label, rendering = getLabel(index, length, modelID)
     
     if isinstance(classifier, RandomForestClassifier):
         model = classifier.estimators_[index]
@@ -47,8 +76,30 @@ def circularTree(backClick, forwardClick, sessionID):
         return None
 
     treeUtil = TreeUtil()
-    tree = treeUtil.generateDecisionTree(classifier, model, tree, sessionID)
+    tree = treeUtil.generateDecisionTree(classifier, model, tree, sessionID, (modelID, index), TreeGallery().instance.getLayout(modelID, index))
     
-    return "Subtree: " + str(index + 1) + "/" + str(length), tree
+    return label, tree, not rendering
+
+
+
+'''
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
 
+Returns the label of the shown tree, with the progress of the 'TreeGallery'
+while it is laying the trees out, and whether it is still laying them out.
 
+INPUTS
+int index : The index of the shown tree
+int length : The number of trees in the model
+str modelID : The id of the model
+'''
+def getLabel(index, length, modelID):
+    label = "Subtree: " + str(index + 1) + "/" + str(length)
+    progress = TreeGallery().instance.getProgress(modelID)
+    rendering = progress != None and progress[0] < progress[1]
+    if rendering:
+        label += " (Pre-rendered " + str(progress[0]) + "/" + str(progress[1]) + ")"
+    return label, rendering
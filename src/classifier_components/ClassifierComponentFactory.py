@@ -9,23 +9,71 @@ from classifier_components.components.ClassifierParallelCoordinatesComponent imp
 from classifier_components.components.ClassifierUserInputComponent import ClassifierUserInputComponent
 from classifier_components.components.ClassifierSVMDecisionBoundaryComponent import ClassifierSVMDecisionBoundaryComponent
 from classifier_components.components.ClassifierFeatureSpaceComponent import ClassifierFeatureSpaceComponent
+from utils.TreeUtil import TreeUtil, layoutEstimators
+from WorkerPool import WorkerPool
 from dash import html
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from types import SimpleNamespace
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 
 """
 AUTHOR: Dominic Cripps
 DATE CREATED: 17/02/2023
 PREVIOUS MAINTAINER: Dominic Cripps
-DATE LAST MODIFIED: 19/02/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Using the factory method, this class will return the
 correct child components determined by the classifier type.
 
+Only the first row (the model information and user input) is built
+when a model is selected. Every other row is returned as a placeholder
+holding a 'lazy-component-load' button, the row is built by
+'DisplayCallbacks.loadComponentRow' when the button is clicked, either
+by the user or by assets/js/lazyComponents.js once the placeholder
+scrolls into view.
+
+The components are built concurrently on a shared thread pool (the
+components update the session's figures and return dash objects, so
+they cannot be built in another process). When a model is selected the
+components of every other row are submitted to the pool straight away
+and kept in 'prefetched', so a row's futures are usually finished by
+the time its placeholder is loaded. Setting PREFETCH_COMPONENTS=0 only
+builds a row when it is loaded. Setting LAZY_COMPONENTS=0 builds every
+row when the model is selected, all on the pool at once.
+
+The threads share the GIL, so pure Python work does not run in parallel
+on the thread pool. Parsing and laying out the decision tree, the
+slowest part of building the components, is sent to the shared
+'WorkerPool' and the thread only waits for it. The time taken to build
+each component is logged and kept in 'timings'. The pool size can be
+set with the COMPONENT_WORKERS environment variable.
+
 """
 class ClassifierComponentFactory():
 
-    def Factory(modelInfo, sessionID):
+    lazyRows = os.environ.get("LAZY_COMPONENTS", "1") != "0"
+    maxWorkers = int(os.environ.get("COMPONENT_WORKERS", os.cpu_count() or 4))
+    prefetchRows = os.environ.get("PREFETCH_COMPONENTS", "1") != "0"
+    executor = None
+    lock = threading.Lock()
+    # Indexed by component class name : seconds taken to build it the last time
+    timings = {}
+    # Indexed by session : (model name, {(row index, component index) : future}),
+    # only the selected model of each session is kept
+    prefetched = OrderedDict()
+    maxPrefetched = int(os.environ.get("PREFETCH_SESSIONS", 32))
 
+    '''
+    Returns the rows of component classes used for a classifier type.
+    '''
+    def getRows(classifierType):
         # The value of each dictionary entry represents all rows containing components,
         # if you want multiple components on a row, place them within the same array as
         # shown below.
@@ -73,24 +121,176 @@ class ClassifierComponentFactory():
                                                            
             None : [ClassifierComponent()]
         }
+        return components[classifierType]
+
+    def Factory(modelInfo, sessionID):
+        rowCount = len(ClassifierComponentFactory.getRows(modelInfo["classifierType"]))
+        if not ClassifierComponentFactory.lazyRows:
+            built = ClassifierComponentFactory.buildRows(modelInfo, sessionID, range(0, rowCount))
+            return [[html.Div(children = built[index], className="classifierComponentRow") for index in range(0, rowCount)]]
+
+        rows = []
+        for index in range(0, rowCount):
+            if index == 0:
+                row = html.Div(children = ClassifierComponentFactory.buildRow(modelInfo, sessionID, index), className="classifierComponentRow")
+            else:
+                # The placeholder keeps the space of a row so that only
+                # the rows in view are loaded
+                row = html.Div(
+                    id = {"type" : "lazy-component-row", "index" : index},
+                    children = [
+                        html.Button("Load Components", id = {"type" : "lazy-component-load", "index" : index}, n_clicks = 0, className = "trainButton lazyComponentLoad")
+                    ],
+                    className="classifierComponentRow",
+                    style = {"min-height" : "30rem"}
+                )
+            rows.append(row)
+
+        if ClassifierComponentFactory.prefetchRows:
+            ClassifierComponentFactory.prefetch(modelInfo, sessionID, range(1, rowCount))
+        return [rows]
+
+    '''
+    Starts building the components of rows that have not been loaded yet,
+    replacing the rows prefetched for the session's previous model.
+
+    INPUTS
+    dict modelInfo : The selected model
+    str sessionID : The user's session
+    list[int] indices : The indices of the rows in 'getRows'
+    '''
+    def prefetch(modelInfo, sessionID, indices):
+        futures = ClassifierComponentFactory.submitRows(modelInfo, sessionID, indices)
+        with ClassifierComponentFactory.lock:
+            previous = ClassifierComponentFactory.prefetched.pop(sessionID, None)
+            ClassifierComponentFactory.prefetched[sessionID] = (modelInfo.get("modelName"), futures)
+            dropped = [previous] if previous is not None else []
+            while len(ClassifierComponentFactory.prefetched) > ClassifierComponentFactory.maxPrefetched:
+                dropped.append(ClassifierComponentFactory.prefetched.popitem(last = False)[1])
+
+        for _, droppedFutures in dropped:
+            for future in droppedFutures.values():
+                future.cancel()
+
+    '''
+    Returns the prefetched futures of a row's components and forgets them,
+    or None if the row was not prefetched for this model.
+    '''
+    def takePrefetched(modelInfo, sessionID, index):
+        with ClassifierComponentFactory.lock:
+            entry = ClassifierComponentFactory.prefetched.get(sessionID)
+            if entry is None or entry[0] != modelInfo.get("modelName"):
+                return None
+            futures = {key : entry[1].pop(key) for key in list(entry[1]) if key[0] == index}
+            if len(entry[1]) == 0:
+                del ClassifierComponentFactory.prefetched[sessionID]
+        return futures if len(futures) > 0 else None
+
+    '''
+    Builds the components of one row and returns the children of the row.
+
+    INPUTS
+    dict modelInfo : The selected model
+    str sessionID : The user's session
+    int index : The index of the row in 'getRows'
+    '''
+    def buildRow(modelInfo, sessionID, index):
+        return ClassifierComponentFactory.buildRows(modelInfo, sessionID, [index])[index]
+
+    '''
+    Builds the components of several rows concurrently and returns the
+    children of each row, indexed by row.
+
+    INPUTS
+    dict modelInfo : The selected model
+    str sessionID : The user's session
+    list[int] indices : The indices of the rows in 'getRows'
+    '''
+    def buildRows(modelInfo, sessionID, indices):
+        rows = ClassifierComponentFactory.getRows(modelInfo["classifierType"])
+
+        # Every component is submitted before waiting on any of them
+        futures = {}
+        missing = []
+        for index in indices:
+            prefetched = ClassifierComponentFactory.takePrefetched(modelInfo, sessionID, index)
+            # A cancelled future was dropped before it started, the row is built again
+            if prefetched is None or any(future.cancelled() for future in prefetched.values()):
+                missing.append(index)
+            else:
+                futures.update(prefetched)
+        futures.update(ClassifierComponentFactory.submitRows(modelInfo, sessionID, missing))
+
         # It will iterate through each row one component at a time, work out the correct 
         # margins in order to space the components correctly and will assign both the 
         # correct title and component layout to a 'ClasifierComponent' div.
-        # Rows are then added to an array which is returned to be the child of
-        # 'model-components' div.
-        rows = []
-        for x in components[modelInfo["classifierType"]]:
+        built = {}
+        for index in indices:
+            x = rows[index]
             split = str(100 / len(x)) + "%"
 
             children = []
             for i in range (0, len(x)):
-                if x[i] == ClassifierTreeComponent or x[i] == ClassifierDecisionBoundaryComponent:
-                    modelComponent = x[i](modelInfo, sessionID)
-                else:
-                    modelComponent = x[i](modelInfo)
+                modelComponent = futures[(index, i)].result()
                 titleDiv = html.Div(children = modelComponent.componentTitle, className = "componentTitle")
                 layout = html.Div(children = [titleDiv, modelComponent.componentChildren], className="classifierComponent")
                 children.append(html.Div(children = layout, style = {"width" : split, "margin-right" : "25px", "overflow": "hidden", "position": "relative"}))
-            row = html.Div(children = children, className="classifierComponentRow")
-            rows.append(row)
-        return [rows]
\ No newline at end of file
+            built[index] = children
+        return built
+
+    '''
+    Submits every component of several rows to the thread pool and returns
+    their futures indexed by (row index, component index).
+    '''
+    def submitRows(modelInfo, sessionID, indices):
+        rows = ClassifierComponentFactory.getRows(modelInfo["classifierType"])
+        executor = ClassifierComponentFactory.getExecutor()
+
+        futures = {}
+        for index in indices:
+            for i in range (0, len(rows[index])):
+                futures[(index, i)] = executor.submit(ClassifierComponentFactory.buildComponent, rows[index][i], modelInfo, sessionID)
+        return futures
+
+    '''
+    Constructs a single component, recording how long it took.
+    '''
+    def buildComponent(component, modelInfo, sessionID):
+        start = time.perf_counter()
+        if component is ClassifierTreeComponent:
+            modelComponent = component(modelInfo, sessionID, ClassifierComponentFactory.layoutTree(modelInfo))
+        elif component is ClassifierDecisionBoundaryComponent:
+            modelComponent = component(modelInfo, sessionID)
+        else:
+            modelComponent = component(modelInfo)
+        elapsed = time.perf_counter() - start
+
+        ClassifierComponentFactory.timings[component.__name__] = elapsed
+        logger.info("Built %s for %s in %.3fs", component.__name__, modelInfo.get("modelName"), elapsed)
+        return modelComponent
+
+    '''
+    Lays out a decision tree in the 'WorkerPool' and returns the compact
+    layout, or None if the layout is already cached or could not be made
+    in another process, in which case the tree is laid out on the thread.
+    '''
+    def layoutTree(modelInfo):
+        classifier = modelInfo["modelData"]
+        if TreeUtil().getCachedLayout((modelInfo.get("modelID"), None)) is not None:
+            return None
+
+        names = SimpleNamespace(feature_names_in_ = classifier.feature_names_in_, classes_ = classifier.classes_)
+        try:
+            return WorkerPool().instance.submit(layoutEstimators, names, [classifier]).result()[0]
+        except Exception:
+            logger.exception("Could not lay out the tree of %s in a worker process", modelInfo.get("modelName"))
+            return None
+
+    '''
+    Returns the thread pool, creating it the first time it is needed.
+    '''
+    def getExecutor():
+        with ClassifierComponentFactory.lock:
+            if ClassifierComponentFactory.executor is None:
+                ClassifierComponentFactory.executor = ThreadPoolExecutor(max_workers = ClassifierComponentFactory.maxWorkers)
+            return ClassifierComponentFactory.executor
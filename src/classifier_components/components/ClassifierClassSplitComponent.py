@@ -4,12 +4,14 @@ import plotly.express as px
 from dash import dcc
 from dash import html
 from utils.ToolTipUtil import ToolTip
+from utils.Util import ModelUtil
+import numpy as np
 
 """
 AUTHOR: Dominic Cripps
 DATE CREATED: 17/02/2023
 PREVIOUS MAINTAINER: Daniel Ferring
-DATE LAST MODIFIED: 17/03/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Child of 'ClassifierComponent' this class defines 
 an appropriate 'componentLayout' to represent the 
@@ -29,6 +31,12 @@ class ClassifierClassSplitComponent(ClassifierComponent):
 
         colourKey = modelInfo["colourKey"]
 
+        # Encodes every training instance against the colour key in one pass
+        # and counts the instances of each class
+        classCodes, _ = ModelUtil.encodeClasses(classInstances, colourKey)
+        classCodes = classCodes[~np.isnan(classCodes)].astype(np.int64)
+        counts = np.bincount(classCodes, minlength = len(colourKey))
+
         numInstances = []
         classNames = []
         classColours = []
@@ -36,12 +44,7 @@ class ClassifierClassSplitComponent(ClassifierComponent):
         for key, value in colourKey.items():
             classNames.append(key)
             classColours.append(value)
-
-            count = 0
-            for instance in classInstances:
-                if key == instance:
-                    count += 1
-            numInstances.append(count)
+            numInstances.append(int(counts[value]))
 
         fig = go.Bar(
             y = numInstances, 
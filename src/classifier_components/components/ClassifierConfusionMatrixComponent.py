@@ -5,6 +5,7 @@ import sklearn.metrics as metrics
 import numpy as np
 from dash import html
 from utils.ToolTipUtil import ToolTip
+from utils.Util import ModelUtil
 
 """
 AUTHOR: Dominic Cripps
@@ -23,7 +24,7 @@ class ClassifierConfusionMatrixComponent(ClassifierComponent):
     def __init__(self, modelInfo):
         
         testingData = modelInfo["testingData"]
-        predY = modelInfo["modelData"].predict(testingData[0])
+        predY = ModelUtil.getTestPredictions(modelInfo)["predictions"]
         trueY = testingData[1]
         dataLabels = modelInfo["modelData"].classes_
         confusion_matrix = metrics.confusion_matrix(predY, trueY, labels=np.flip(dataLabels, 0))
@@ -10,12 +10,13 @@ from dash import dcc
 AUTHOR: Daniel Ferring
 DATE CREATED: 19/02/2023
 PREVIOUS MAINTAINER: Daniel Ferring
-DATE LAST MODIFIED: 23/03/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Child of 'ClassifierComponent', this class defines an
 appropriate 'componentLayout' to represent decision boundaries
 in 1D or 2D depending on the number of features used to train the
-model.
+model. Models with more than two features can also be shown as a
+matrix of boundaries for every pair of the selected features.
 
 Inputs:
 modelInfo : contains all the information relating to the model 
@@ -48,7 +49,9 @@ class ClassifierDecisionBoundaryComponent(ClassifierComponent):
                                         value = [],
                                         style = {"text-align":"left", "margin-left":"20%", "padding-bottom":"5%"}
                                     ),
-                                    html.Button("Plot", id = "pairwise-button", n_clicks=0, className = "trainButton")],
+                                    html.Button("Plot", id = "pairwise-button", n_clicks=0, className = "trainButton"),
+                                    html.Button("Plot Matrix", id = "pairwise-matrix-button", n_clicks=0, className = "trainButton",
+                                                style = {"margin-top":"5%"})],
                                     style = {"width":"20%", "padding-top":"2%"}),
                                 html.Div(id = "pairwise-boundary", style = {'width':'75%'},),
                                 dcc.ConfirmDialog(id = "feature-error", message = "")],
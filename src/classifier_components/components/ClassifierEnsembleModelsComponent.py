@@ -1,5 +1,5 @@
 from classifier_components.ClassifierComponent import ClassifierComponent
-from dash import html
+from dash import html, dcc
 from utils.TreeUtil import TreeUtil
 import dash_mantine_components as dmc
 
@@ -7,7 +7,7 @@ import dash_mantine_components as dmc
 AUTHOR: Dominic Cripps
 DATE CREATED: 17/02/2023
 PREVIOUS MAINTAINER: Kieran Patel
-DATE LAST MODIFIED: 16/05/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Child of 'ClassifierComponent' this class defines will
 define an appropriate 'componentLayout' based on random forest decision tree
@@ -15,6 +15,11 @@ visualisations.
 
 Addiiton: The component now allows for other ensemble models to be visualised
 
+Addition: The trees are laid out in the background by the 'TreeGallery' after
+training, 'gallery-interval' shows the progress until every tree is ready.
+'gallery-model' holds the model id and number of trees, so the progress
+can be shown without loading the model.
+
 """
 class ClassifierEnsembleModelsComponent(ClassifierComponent):
 
@@ -39,7 +44,10 @@ class ClassifierEnsembleModelsComponent(ClassifierComponent):
 
             html.Div(children = [
                 html.H4(id = "subtree-label"),
-                html.Div(id = "subtree-graph")
+                html.Div(id = "subtree-graph"),
+                # Updates the progress of laying out the trees in the background
+                dcc.Interval(id = "gallery-interval", interval = 1000, disabled = False),
+                dcc.Store(id = "gallery-model", data = {"modelID" : modelInfo.get("modelID"), "total" : len(modelInfo["modelData"].estimators_)})
             ],
             id = "subtree-container", style = {"width" : "100%", "min-height" : "50rem"}),
 
@@ -10,7 +10,7 @@ import plotly.graph_objects as go
 AUTHOR: Ethan Temple-Betts
 DATE CREATED: 20/03/2023
 PREVIOUS MAINTAINER: Ethan Temple-Betts
-DATE LAST MODIFIED: 20/03/2023
+DATE LAST MODIFIED: 18/10/2026
 
 This class will create the feature space plot and provide
 drobdown boxes for the user to select upto 3 features to display
@@ -32,7 +32,8 @@ class ClassifierFeatureSpaceComponent(ClassifierComponent):
         # features can be selected
         xTest = modelInfo["testingData"][0]
 
-        self.componentTitle = "Feature Space"
+        # The sample fraction is filled in by 'FeatureSpaceCallbacks.updateFeatureSpace'
+        self.componentTitle = html.Span(["Feature Space", html.Span(id = "fs_sample_fraction")])
 
         fig = px.scatter()
 
@@ -59,6 +60,14 @@ class ClassifierFeatureSpaceComponent(ClassifierComponent):
                         className = "fsFeatDropdown")],
                     className = "fsControlContainer"),
 
+            # Large datasets are drawn from a sample unless 'Show All Rows' is ticked,
+            # 'Density' draws the number of points in each region instead of the points
+            dcc.Checklist(
+                options = [{"label" : " Show All Rows", "value" : "all"}, {"label" : " Density", "value" : "density"}],
+                value = [],
+                id = "fs_options",
+                inline = True),
+
             dcc.Graph(figure = fig, id = "fs_plot")])
 
 
@@ -7,17 +7,29 @@ import dash_mantine_components as dmc
 from dash import dcc
 import numpy as np
 import plotly.graph_objects as go
+from utils.Util import ModelUtil
+from utils.CorrelationUtil import CorrelationUtil
 
 """
 AUTHOR: Ethan Temple-Betts
 DATE CREATED: 22/02/2023
 PREVIOUS MAINTAINER: Ethan Temple-Betts
-DATE LAST MODIFIED: 04/03/2023
+DATE LAST MODIFIED: 18/10/2026
 
 This class will create a parallel coordinates plot
 using the testing data for the model. The colour of the lines
 represents the predeicted classification.
 
+The visibility of each feature, in the order of the dropdown, is kept
+in 'pc_visible_dims', so 'ParallelCoordinatesCallbacks.changeDim' only
+has to send the browser the dimension that changed and 'Show All Rows'
+can redraw the plot with the same features shown. 'visibleFeatures'
+lists the features to show when the plot is redrawn.
+
+Test sets larger than 'ModelUtil.plotSampleRows' are drawn from a
+stratified sample, the title shows the fraction of rows drawn and
+'Show All Rows' redraws the plot with every row.
+
 Inputs
 dict modelInfo :    {"modelData" : model, 
                     "trainingData" : [xTrain, yTrain],
@@ -30,16 +42,26 @@ dict modelInfo :    {"modelData" : model,
 """
 class ClassifierParallelCoordinatesComponent(ClassifierComponent):
 
-    def __init__(self, modelInfo):
+    def __init__(self, modelInfo, showAll = False, visibleFeatures = None):
 
         # Extract xTest data, yTest data and the model
-        xTest = (modelInfo["testingData"][0]).copy()
+        xTest = modelInfo["testingData"][0]
         yTest = modelInfo["testingData"][1]
         model = modelInfo['modelData']
 
-        # Predict the classes of xTest data and store result in
-        # pred dataframe
-        predictions = model.predict(xTest)
+        # Get the cached predictions of the xTest data
+        predictions = ModelUtil.getTestPredictions(modelInfo)["predictions"]
+
+        # Large test sets are drawn from a sample that keeps the class balance,
+        # unless the user has asked to see every row
+        total = len(xTest)
+        sample = np.arange(total) if showAll else ModelUtil.stratifiedSample(yTest)
+        xTest = xTest.iloc[sample].copy()
+        yTest = yTest.iloc[sample]
+        predictions = np.asarray(predictions)[sample]
+        self.sampleText = ModelUtil.describeSample(len(sample), total)
+
+        # Store the predictions in the pred dataframe
         yTestDF = yTest.to_frame()
         classifier = yTestDF.columns[0]
         pred = pd.DataFrame() 
@@ -68,10 +90,13 @@ class ClassifierParallelCoordinatesComponent(ClassifierComponent):
 
         # Create dimensions for the remaining features
         dimensions = self.createPlotDimensions(features, xTest)
-        dropDownOrder = self.orderByCorrelation(features, xTest)
+        dropDownOrder = self.orderByCorrelation(features, xTest, modelInfo.get("modelID"))
 
         # Order the dimensions based on correlation
         dimensions = self.orderDimensions(dimensions, dropDownOrder)
+        visibleFeatures = set(visibleFeatures or [])
+        for dimension in dimensions:
+            dimension["visible"] = dimension["label"] in visibleFeatures
 
         # Create the 'True Class' dimension and plot data using
         # dummy values and label the axis with the true class
@@ -92,6 +117,8 @@ class ClassifierParallelCoordinatesComponent(ClassifierComponent):
             font_color = "#f5f5f5",
             plot_bgcolor="#232323")
 
+        self.graph = dcc.Graph(figure = fig, id = "pc_plot")
+
         self.componentTitle = html.Span(
             dmc.Tooltip(
                 label = html.Div(children = [
@@ -105,7 +132,7 @@ class ClassifierParallelCoordinatesComponent(ClassifierComponent):
                     html.P("and the 'true class' represents the true value of that data instance."),
                     html.P("This visualisation uses the models testing data.")
                     ]),
-                children=[html.P("Parallel Coordinates")],
+                children=[html.P(["Parallel Coordinates", html.Span(id = "pc_sample_fraction", children = self.sampleText)])],
                 id="pc-tooltip",
                 className ="plotToolTip",
                 withArrow = True,
@@ -135,9 +162,17 @@ class ClassifierParallelCoordinatesComponent(ClassifierComponent):
 
             className = "pcControlContainer"),
                 
-            dcc.Graph(
-            figure = fig,
-            id="pc_plot")])
+            dcc.Checklist(
+            options = [{"label" : " Show All Rows", "value" : "all"}],
+            value = ["all"] if showAll else [],
+            id = "pc_show_all"),
+
+            html.Div(children = self.graph, id = "pc_plot_container"),
+
+            # The dimension changed by the last '+' or '-' click
+            dcc.Store(id="pc_visibility"),
+            # The visibility of each feature, in the order of the dropdown
+            dcc.Store(id="pc_visible_dims", data = [dimension["visible"] for dimension in dimensions[:len(dropDownOrder)]])])
     
     ''' 
     AUTHOR: Ethan Temple-Betts
@@ -195,11 +230,14 @@ class ClassifierParallelCoordinatesComponent(ClassifierComponent):
     ''' 
     AUTHOR: Ethan Temple-Betts
     PREVIOUS MAINTAINER: Ethan Temple-Betts
+    DATE LAST MODIFIED: 18/10/2026
 
     Orders the features based on the next most correlated feature
     starting from features[0]. It doesn't calculate the optimal
     order but instead calculates the feature most correlated to
     its predecessor that has not already been placed in the list.
+    The ordering is done by 'CorrelationUtil' from a single
+    correlation matrix and is cached for the model.
 
     Inputs:
     list[str] features : a list of feature names in data to be
@@ -208,31 +246,13 @@ class ClassifierParallelCoordinatesComponent(ClassifierComponent):
     dataframe data : A dataframe containing the data to be
     checked for correlation
 
+    str modelID : The id of the model the data belongs to
+
     Returns:
     list[str] ordered : the features input in order of correlation
     '''
-    def orderByCorrelation(self, features, data):
-        ordered = [features[0]]
-
-        for i in features:
-            index = -1
-            # Corelation is measured between -1..1
-            # so a value of -2 ensures a feature is always chossen
-            correlation = -2 
-
-            for j in features:
-                c = -2
-
-                if(j not in ordered):
-                    c = data[i].corr(data[j])
-
-                if(c > correlation):
-                    index = features.index(j)
-
-            if(index != -1):
-             ordered.append(features[index])
-
-        return ordered
+    def orderByCorrelation(self, features, data, modelID = None):
+        return CorrelationUtil.orderByCorrelation(features, data, modelID)
     
 
     ''' 
@@ -253,21 +273,5 @@ class ClassifierParallelCoordinatesComponent(ClassifierComponent):
     specified
     '''    
     def orderDimensions(self, dimensions, order):
-        dims = []
-        c = 0
-
-        for c in range(len(dimensions)):
-            for i in dimensions:
-                if i['label'] == order[c]:
-                    dims.append(i)
-        
-        return dims
-
-
-            
-                
-
-
-
-
-    
\ No newline at end of file
+        byLabel = {i['label'] : i for i in dimensions}
+        return [byLabel[label] for label in order]
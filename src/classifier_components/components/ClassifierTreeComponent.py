@@ -6,21 +6,25 @@ from utils.TreeUtil import TreeUtil
 AUTHOR: Dominic Cripps
 DATE CREATED: 17/02/2023
 PREVIOUS MAINTAINER: Dominic Cripps
-DATE LAST MODIFIED: 18/02/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Child of 'ClassifierComponent' this class defines will
 define an appropriate 'componentLayout' based on a decision tree
 visualisation.
+
+A compact layout made by 'layoutEstimators' can be given so the
+tree is not laid out again.
 """
 class ClassifierTreeComponent(ClassifierComponent):
 
-    def __init__(self, modelInfo, sessionID):
+    def __init__(self, modelInfo, sessionID, compactLayout = None):
         # An instance of 'TreeUtil is created'
         treeUtil = TreeUtil()
 
         # The model is parsed to 'TreeUtil.generateDecisionTree', this will 
-        # return a 'dcc.Graph' object containing the tree
-        self.tree = treeUtil.generateDecisionTree(modelInfo["modelData"], modelInfo["modelData"], modelInfo["modelData"].tree_, sessionID)
+        # return a 'dcc.Graph' object containing the tree, the layout is cached
+        # so selecting the model again does not lay the tree out again
+        self.tree = treeUtil.generateDecisionTree(modelInfo["modelData"], modelInfo["modelData"], modelInfo["modelData"].tree_, sessionID, (modelInfo.get("modelID"), None), compactLayout)
         self.componentTitle = "Model Decision Tree"
         # Set component layout property to be a div containing the tree graph
         # Important : className of this div must be "classifierComponent" to format correctly
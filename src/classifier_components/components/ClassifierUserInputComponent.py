@@ -3,17 +3,20 @@ from dash import html
 import dash_bootstrap_components as dbc
 from sklearn.metrics import accuracy_score
 from utils.ToolTipUtil import ToolTip
+from utils.Util import ModelUtil
 
 """
 AUTHOR: Dominic Cripps
 DATE CREATED: 22/02/2023
 PREVIOUS MAINTAINER: Dominic Cripps
-DATE LAST MODIFIED: 23/02/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Child of 'ClassifierComponent', this class defines an
 appropriate 'componentLayout' to represent user input.
 The user will be able to input feature values and a
 classification will be returned, alongside the models accuracy.
+A csv file of feature values can also be uploaded to download a
+prediction for every row.
 
 Inputs:
 modelInfo : contains all the information relating to the model 
@@ -25,7 +28,7 @@ class ClassifierUserInputComponent(ClassifierComponent):
 
         testingData = modelInfo["testingData"]
         
-        predY = modelInfo["modelData"].predict(testingData[0])
+        predY = ModelUtil.getTestPredictions(modelInfo)["predictions"]
         trueY = testingData[1]
         accuracy = str(round(accuracy_score(trueY, predY) * 100, 3)) + "%"
 
@@ -62,6 +65,13 @@ class ClassifierUserInputComponent(ClassifierComponent):
             html.Br(),
             html.Button("Predict", id="predict-button", n_clicks = 0, className = "trainButton"),
             html.Br(),
+
+            # Pressing the button opens a file picker (assets/js/batchPredict.js), the chosen
+            # csv file is scored by the '/predict-dataset' route and its predictions are downloaded
+            html.Div(children = "Batch Prediction", className="textSubTitleCenter"),
+            html.Button("Score A Dataset (.csv)", id = "batch-predict-button", n_clicks = 0, className = "trainButton", **{"data-model" : modelInfo["modelName"]}),
+            html.Div(id = "batch-predict-message", children = []),
+            html.Br(),
             ToolTip().generateToolTip("user-input-component", "User Input", "The model will classify each sample of the testing data and compare the results to each samples true value, this is displayed under 'Accuracy'. The user can input their own custom data (all training features must have a value) the model then classifies this and the result is shown. The custom point is plotted on the decision boundary and the path taken to that classification is highlighted on the Decision Tree."),
         ]
 
@@ -0,0 +1,54 @@
+import os
+import tempfile
+from flask import request, jsonify, send_file
+from AppInstance import AppInstance
+from UserSession import UserSession
+from utils.Util import ImportUtil
+from utils.Util import ModelUtil
+
+app = AppInstance().instance.app
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Route used to score a whole csv file with one of the session's trained
+models, the response is a csv file of the predictions and class 
+probabilities for every row.
+
+The request body is the raw csv file. It is streamed to a temporary file,
+its columns are checked against the columns the model was trained with, it
+is encoded as the training data was and it is then scored in chunks by 'ModelUtil.scoreCsv', so neither the upload
+nor the predictions are held in memory at once. The predictions are sent 
+back from disk and removed once they have been sent
+(assets/js/batchPredict.js sends the file and downloads the result).
+
+Example : curl -X POST --data-binary @data.csv -o predictions.csv "localhost:8080/predict-dataset/<session id>/<model name>?filename=data.csv"
+"""
+@app.server.route("/predict-dataset/<sessionID>/<modelName>", methods = ["POST"])
+def predictDataset(sessionID, modelName):
+    filename = request.args.get("filename", "upload.csv")
+    if not filename.endswith(".csv"):
+        return jsonify({"error" : "Wrong File Type!"}), 400
+
+    try:
+        modelInfo = UserSession().instance.store.getModelInfo(sessionID, modelName)
+    except KeyError:
+        return jsonify({"error" : "Model Not Found"}), 404
+
+    path = ImportUtil.streamToTempFile(request.stream)
+    handle, output = tempfile.mkstemp(suffix = ".csv")
+    os.close(handle)
+    try:
+        ModelUtil.scoreCsv(modelInfo["modelData"], path, output, encoding = modelInfo.get("featureEncoding"))
+    except Exception as e:
+        os.remove(output)
+        return jsonify({"error" : str(e)}), 400
+    finally:
+        os.remove(path)
+
+    response = send_file(output, mimetype = "text/csv", as_attachment = True, download_name = "predictions_" + filename)
+    response.call_on_close(lambda: os.remove(output))
+    return response
@@ -0,0 +1,48 @@
+import os
+from flask import request, jsonify
+from AppInstance import AppInstance
+from utils.Util import ImportUtil
+from DatasetRegistry import DatasetRegistry
+
+app = AppInstance().instance.app
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Route used to upload large datasets without going through 'dcc.Upload',
+which sends the whole file to the server as a base64 string.
+
+The request body is the raw csv file. It is streamed to a temporary file
+in chunks and parsed straight from disk, so memory use is bounded by the
+size of the resulting dataframe rather than several copies of the file.
+The dataset becomes the session's current dataset in the 'DatasetRegistry',
+'readDataframe' then shows its columns when the 'load-streamed-dataset' button
+is clicked (assets/js/streamingUpload.js clicks it once the upload completes).
+
+Example : curl -X POST --data-binary @data.csv "localhost:8080/upload-dataset/<session id>?filename=data.csv"
+"""
+@app.server.route("/upload-dataset/<sessionID>", methods = ["POST"])
+def uploadDataset(sessionID):
+    filename = request.args.get("filename", "upload.csv")
+    if not filename.endswith(".csv"):
+        return jsonify({"error" : "Wrong File Type!"}), 400
+
+    registry = DatasetRegistry().instance
+    path = ImportUtil.streamToTempFile(request.stream)
+    try:
+        contentHash = registry.hashContent(path)
+        # Selects the dataset if it is already held, otherwise it is parsed
+        entry = registry.useDataset(sessionID, contentHash)
+        if entry is None:
+            dataFrame, report = ImportUtil.ingestCsvFile(path)
+            ImportUtil.sanitiseData(dataFrame)
+            entry = registry.register(sessionID, contentHash, dataFrame, filename, report)
+    except Exception as e:
+        return jsonify({"error" : str(e)}), 400
+    finally:
+        os.remove(path)
+
+    return jsonify({"message" : ImportUtil.describeIngest(filename, entry["report"])})
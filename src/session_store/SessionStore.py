@@ -0,0 +1,139 @@
+from abc import ABC, abstractmethod
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Parent class of all session stores.
+A session store holds everything the 'UserSession' keeps for each session:
+the trained models (indexed by session id and model filename), the name
+of the selected model, the most recently drawn tree and decision
+boundary figures and any other figures a component keeps on the server.
+
+All callbacks access session data through these methods, so the backend
+can be swapped (see 'SessionStoreFactory') without changing them. Every
+store must implement all of them.
+
+A store that every worker process sees ('shared', e.g. 'DiskSessionStore')
+also keeps the state a session needs between requests that is not held
+in the session itself: the uploaded datasets (see 'DatasetRegistry') and
+the training job records (see 'TrainingQueue'). With a shared store the
+app can be run with several gunicorn workers, any worker can serve any
+request. The model, tree layout and boundary caches ('ModelCache',
+'TreeUtil', 'BoundaryCache') and the tree gallery ('TreeGallery') stay in
+each worker's memory, a worker that has not cached a result computes it
+again.
+
+A store that is not shared ('MemorySessionStore') is only visible to the
+worker that created it, so it requires a single gunicorn worker.
+"""
+class SessionStore(ABC):
+
+    # True if every worker process sees the same data, only shared stores
+    # implement the dataset and job methods below
+    shared = False
+
+    # Returns True if the session has been created
+    @abstractmethod
+    def hasSession(self, sessionID):
+        raise NotImplementedError
+
+    # Creates an empty session if it does not already exist
+    @abstractmethod
+    def createSession(self, sessionID):
+        raise NotImplementedError
+
+    # Returns a list of the model filenames stored in the session
+    @abstractmethod
+    def getModelNames(self, sessionID):
+        raise NotImplementedError
+
+    # Returns the modelInfo dictionary stored under the model filename
+    @abstractmethod
+    def getModelInfo(self, sessionID, modelName):
+        raise NotImplementedError
+
+    # Stores a modelInfo dictionary under the model filename
+    @abstractmethod
+    def setModelInfo(self, sessionID, modelName, modelInfo):
+        raise NotImplementedError
+
+    # Returns the fitted model of the session's selected model, or None if no
+    # model has been selected
+    @abstractmethod
+    def getSelectedModel(self, sessionID):
+        raise NotImplementedError
+
+    # Records which of the session's models is selected
+    @abstractmethod
+    def setSelectedModel(self, sessionID, modelName):
+        raise NotImplementedError
+
+    # Returns the most recently drawn decision tree figure
+    @abstractmethod
+    def getSelectedTree(self, sessionID):
+        raise NotImplementedError
+
+    @abstractmethod
+    def setSelectedTree(self, sessionID, figure):
+        raise NotImplementedError
+
+    # Returns the most recently drawn decision boundary figure
+    @abstractmethod
+    def getSelectedBoundary(self, sessionID):
+        raise NotImplementedError
+
+    @abstractmethod
+    def setSelectedBoundary(self, sessionID, figure):
+        raise NotImplementedError
+
+    # Returns a figure kept on the server under a name, or None. Components keep
+    # their figures here so callbacks can update them without the browser sending
+    # the whole figure back
+    @abstractmethod
+    def getFigure(self, sessionID, name):
+        raise NotImplementedError
+
+    @abstractmethod
+    def setFigure(self, sessionID, name, figure):
+        raise NotImplementedError
+
+    # Returns True if a dataset with this content hash is stored
+    def hasDataset(self, contentHash):
+        raise NotImplementedError
+
+    # Returns the dataset stored under a content hash, a dictionary with the
+    # keys "dataFrame", "filename" and "report", or None
+    def getDataset(self, contentHash):
+        raise NotImplementedError
+
+    def setDataset(self, contentHash, dataset):
+        raise NotImplementedError
+
+    # Returns the content hash of the session's current dataset, or None
+    def getSessionDataset(self, sessionID):
+        raise NotImplementedError
+
+    def setSessionDataset(self, sessionID, contentHash):
+        raise NotImplementedError
+
+    # Returns the records of every training job of the session, each record
+    # has a "cancelled" flag set by 'cancelJob'
+    def getJobs(self, sessionID):
+        raise NotImplementedError
+
+    # Returns the record of a training job, or None
+    def getJob(self, jobID):
+        raise NotImplementedError
+
+    def setJob(self, sessionID, jobID, record):
+        raise NotImplementedError
+
+    # Asks the worker running a job to cancel it
+    def cancelJob(self, jobID):
+        raise NotImplementedError
+
+    def removeJob(self, jobID):
+        raise NotImplementedError
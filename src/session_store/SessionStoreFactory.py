@@ -0,0 +1,26 @@
+from session_store.stores.MemorySessionStore import MemorySessionStore
+from session_store.stores.DiskSessionStore import DiskSessionStore
+
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Using the factory method, this class will return the
+correct session store determined by the store type.
+
+"memory" keeps every session in the current process, "disk" keeps them
+in a SQLite file shared by every worker process. Only "disk" supports
+running several worker processes (see 'SessionStore').
+"""
+class SessionStoreFactory():
+
+    def Factory(storeType):
+        stores = {
+            "memory" : MemorySessionStore,
+            "disk" : DiskSessionStore,
+            None : MemorySessionStore
+        }
+        return stores[storeType]()
@@ -0,0 +1,191 @@
+import io
+import os
+import sqlite3
+import tempfile
+import joblib
+from session_store.SessionStore import SessionStore
+
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Child of 'SessionStore' this class keeps every session in a 
+local SQLite file, so the sessions are kept out of memory and survive
+a restart of the server. Model records and figures are serialised
+with joblib.
+
+Every worker process opens the same file, so the store is shared: the
+uploaded datasets and the training job records are kept in it too and
+any worker can serve any request of a session.
+
+The file used can be set with the SESSION_STORE_PATH environment 
+variable.
+
+Note : objects returned by this store are copies, changes made to
+them are not saved unless they are set again.
+
+Inputs:
+str path : The location of the SQLite file
+"""
+class DiskSessionStore(SessionStore):
+
+    defaultPath = os.path.join(tempfile.gettempdir(), "decision-tree-visualiser-sessions.sqlite")
+    shared = True
+
+    def __init__(self, path = None):
+        if path is None:
+            path = os.environ.get("SESSION_STORE_PATH", self.defaultPath)
+        self.path = path
+
+        with self.connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS sessions (session TEXT PRIMARY KEY)")
+            connection.execute("CREATE TABLE IF NOT EXISTS models (session TEXT, name TEXT, data BLOB, PRIMARY KEY (session, name))")
+            connection.execute("CREATE TABLE IF NOT EXISTS selected (session TEXT, kind TEXT, data BLOB, PRIMARY KEY (session, kind))")
+            connection.execute("CREATE TABLE IF NOT EXISTS datasets (hash TEXT PRIMARY KEY, data BLOB)")
+            connection.execute("CREATE TABLE IF NOT EXISTS sessionDatasets (session TEXT PRIMARY KEY, hash TEXT)")
+            connection.execute("CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, session TEXT, data BLOB, cancelled INTEGER DEFAULT 0)")
+
+    '''
+    Opens a new connection for each operation, connections cannot be
+    shared between the threads dash uses to serve requests.
+    '''
+    def connect(self):
+        return sqlite3.connect(self.path, timeout = 30)
+
+    def dumps(self, value):
+        buffer = io.BytesIO()
+        joblib.dump(value, buffer)
+        return buffer.getvalue()
+
+    def loads(self, data):
+        return joblib.load(io.BytesIO(data))
+
+    def hasSession(self, sessionID):
+        with self.connect() as connection:
+            row = connection.execute("SELECT 1 FROM sessions WHERE session = ?", (sessionID,)).fetchone()
+        return row is not None
+
+    def createSession(self, sessionID):
+        with self.connect() as connection:
+            connection.execute("INSERT OR IGNORE INTO sessions VALUES (?)", (sessionID,))
+
+    def getModelNames(self, sessionID):
+        with self.connect() as connection:
+            rows = connection.execute("SELECT name FROM models WHERE session = ? ORDER BY rowid", (sessionID,)).fetchall()
+        return [row[0] for row in rows]
+
+    def getModelInfo(self, sessionID, modelName):
+        with self.connect() as connection:
+            row = connection.execute("SELECT data FROM models WHERE session = ? AND name = ?", (sessionID, modelName)).fetchone()
+        if row is None:
+            raise KeyError(modelName)
+        return self.loads(row[0])
+
+    def setModelInfo(self, sessionID, modelName, modelInfo):
+        data = self.dumps(modelInfo)
+        with self.connect() as connection:
+            connection.execute("INSERT OR IGNORE INTO sessions VALUES (?)", (sessionID,))
+            connection.execute("INSERT OR REPLACE INTO models VALUES (?, ?, ?)", (sessionID, modelName, data))
+
+    def getSelected(self, sessionID, kind):
+        with self.connect() as connection:
+            row = connection.execute("SELECT data FROM selected WHERE session = ? AND kind = ?", (sessionID, kind)).fetchone()
+        if row is None:
+            return None
+        return self.loads(row[0])
+
+    def setSelected(self, sessionID, kind, value):
+        data = self.dumps(value)
+        with self.connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO selected VALUES (?, ?, ?)", (sessionID, kind, data))
+
+    def getSelectedModel(self, sessionID):
+        modelName = self.getSelected(sessionID, "model")
+        if modelName is None:
+            return None
+        return self.getModelInfo(sessionID, modelName)["modelData"]
+
+    def setSelectedModel(self, sessionID, modelName):
+        self.setSelected(sessionID, "model", modelName)
+
+    def getSelectedTree(self, sessionID):
+        return self.getSelected(sessionID, "tree")
+
+    def setSelectedTree(self, sessionID, figure):
+        self.setSelected(sessionID, "tree", figure)
+
+    def getSelectedBoundary(self, sessionID):
+        return self.getSelected(sessionID, "boundary")
+
+    def setSelectedBoundary(self, sessionID, figure):
+        self.setSelected(sessionID, "boundary", figure)
+
+    def getFigure(self, sessionID, name):
+        return self.getSelected(sessionID, "figure:" + name)
+
+    def setFigure(self, sessionID, name, figure):
+        self.setSelected(sessionID, "figure:" + name, figure)
+
+    def hasDataset(self, contentHash):
+        with self.connect() as connection:
+            row = connection.execute("SELECT 1 FROM datasets WHERE hash = ?", (contentHash,)).fetchone()
+        return row is not None
+
+    def getDataset(self, contentHash):
+        with self.connect() as connection:
+            row = connection.execute("SELECT data FROM datasets WHERE hash = ?", (contentHash,)).fetchone()
+        if row is None:
+            return None
+        return self.loads(row[0])
+
+    def setDataset(self, contentHash, dataset):
+        data = self.dumps(dataset)
+        with self.connect() as connection:
+            connection.execute("INSERT OR IGNORE INTO datasets VALUES (?, ?)", (contentHash, data))
+
+    def getSessionDataset(self, sessionID):
+        with self.connect() as connection:
+            row = connection.execute("SELECT hash FROM sessionDatasets WHERE session = ?", (sessionID,)).fetchone()
+        return None if row is None else row[0]
+
+    '''
+    Records the session's current dataset, a dataset no session is using
+    any more is deleted.
+    '''
+    def setSessionDataset(self, sessionID, contentHash):
+        with self.connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO sessionDatasets VALUES (?, ?)", (sessionID, contentHash))
+            connection.execute("DELETE FROM datasets WHERE hash NOT IN (SELECT hash FROM sessionDatasets)")
+
+    '''
+    The job records are stored with a separate cancelled flag, so that a
+    cancel requested by one worker is not overwritten when the worker
+    running the job updates its record.
+    '''
+    def getJobs(self, sessionID):
+        with self.connect() as connection:
+            rows = connection.execute("SELECT data, cancelled FROM jobs WHERE session = ?", (sessionID,)).fetchall()
+        return [dict(self.loads(row[0]), cancelled = bool(row[1])) for row in rows]
+
+    def getJob(self, jobID):
+        with self.connect() as connection:
+            row = connection.execute("SELECT data, cancelled FROM jobs WHERE id = ?", (jobID,)).fetchone()
+        if row is None:
+            return None
+        return dict(self.loads(row[0]), cancelled = bool(row[1]))
+
+    def setJob(self, sessionID, jobID, record):
+        data = self.dumps(record)
+        with self.connect() as connection:
+            connection.execute("INSERT INTO jobs (id, session, data) VALUES (?, ?, ?) ON CONFLICT(id) DO UPDATE SET data = excluded.data", (jobID, sessionID, data))
+
+    def cancelJob(self, jobID):
+        with self.connect() as connection:
+            connection.execute("UPDATE jobs SET cancelled = 1 WHERE id = ?", (jobID,))
+
+    def removeJob(self, jobID):
+        with self.connect() as connection:
+            connection.execute("DELETE FROM jobs WHERE id = ?", (jobID,))
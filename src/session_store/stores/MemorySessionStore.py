@@ -0,0 +1,470 @@
+import os
+import time
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+import pandas as pd
+import numpy as np
+from session_store.SessionStore import SessionStore
+from session_store.stores.DiskSessionStore import DiskSessionStore
+
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Child of 'SessionStore' this class keeps every session in
+dictionaries inside the current process. It is the fastest
+store, but sessions are only visible to the worker that
+created them.
+
+Memory is bounded with a least recently used policy. The size of
+each stored model (its data, fitted model and cached predictions) and
+of each stored figure (the selected tree and boundary and the named
+figures) is estimated once, when it is stored, and entries are evicted
+when
+    - the total size exceeds 'memoryBudget' bytes
+    - a session's size exceeds 'sessionQuota' bytes
+    - a session has not been used for 'sessionTTL' seconds
+Evicted entries are spilled to a 'DiskSessionStore' and are loaded
+back into memory the next time they are used, so nothing is lost.
+The size of a spilled model is kept with it, so loading it back does
+not measure it again. The most recently stored entry is never evicted,
+and a session's quota only evicts that session's own entries.
+
+Idle sessions are looked for every time a session is used (at most
+once every 'sweepInterval' seconds). A session that expires is moved
+to the spill store entirely, its model names and selected model are
+restored when it is next used and its figures are dropped (they are
+redrawn when the session next selects a model).
+
+Reading and writing spilled entries is done without holding the
+store's lock, so loading a large model does not hold up the other
+sessions. An entry that is being written is kept in 'spilling' until
+the write has finished and is taken from there if it is used again.
+
+The limits can be set with the SESSION_MEMORY_BUDGET, SESSION_MEMORY_QUOTA
+and SESSION_TTL environment variables. The spill file can be set with the
+SESSION_SPILL_PATH environment variable, by default each process uses its
+own temporary file, separate from the file used by 'DiskSessionStore'.
+
+The following dictionaries are indexed by session id.
+"""
+class MemorySessionStore(SessionStore):
+
+    def __init__(self, memoryBudget = None, sessionQuota = None, sessionTTL = None, spillPath = None):
+        self.memoryBudget = memoryBudget if memoryBudget is not None else int(os.environ.get("SESSION_MEMORY_BUDGET", 1024 ** 3))
+        self.sessionQuota = sessionQuota if sessionQuota is not None else int(os.environ.get("SESSION_MEMORY_QUOTA", 512 * 1024 ** 2))
+        self.sessionTTL = sessionTTL if sessionTTL is not None else float(os.environ.get("SESSION_TTL", 3600))
+        self.sweepInterval = max(0, min(self.sessionTTL, 60))
+        self.lastSweep = 0
+        if spillPath is None:
+            spillPath = os.environ.get("SESSION_SPILL_PATH", os.path.join(tempfile.gettempdir(), "decision-tree-visualiser-spill-" + str(os.getpid()) + ".sqlite"))
+        self.spillPath = spillPath
+        self.spillStore = None
+
+        self.modelInformation = {}
+        self.selectedModel = {}
+
+        # Indexed by session id : {kind : figure}, the kinds are "tree", "boundary"
+        # and "figure:" followed by the figure's name, as in 'DiskSessionStore'
+        self.figures = {}
+
+        # The names of every model in a session in the order they were added,
+        # including the models that have been spilled to disk
+        self.modelNames = {}
+        self.lastAccess = {}
+
+        # Estimated size of each entry held in memory indexed by (session id, "model" or
+        # "figure", model name or figure kind), ordered from least to most recently used
+        self.usage = OrderedDict()
+        # Entries that have been evicted but not yet written, indexed as 'usage' : (value, size)
+        self.spilling = {}
+        # Incremented every time an entry is stored, so that a spilled entry loaded
+        # while a newer one was stored is not used
+        self.versions = {}
+        self.lock = threading.RLock()
+        # Held while writing to the spill store, so writes of the same entry never overlap
+        self.spillLock = threading.Lock()
+
+    def hasSession(self, sessionID):
+        with self.lock:
+            self.restoreSession(sessionID)
+            return sessionID in self.modelNames
+
+    def createSession(self, sessionID):
+        with self.lock:
+            evicted = self.openSession(sessionID)
+        self.spill(evicted)
+
+    def getModelNames(self, sessionID):
+        with self.lock:
+            self.restoreSession(sessionID)
+            return list(self.modelNames.get(sessionID, []))
+
+    def getModelInfo(self, sessionID, modelName):
+        key = (sessionID, "model", modelName)
+        version = None
+        with self.lock:
+            self.restoreSession(sessionID)
+            evicted = self.touchSession(sessionID)
+            models = self.modelInformation.get(sessionID, {})
+            if modelName in models:
+                self.usage.move_to_end(key)
+                modelInfo = models[modelName]
+            elif modelName not in self.modelNames.get(sessionID, []):
+                modelInfo = None
+            elif key in self.spilling:
+                # Evicted but not written yet, it is taken back
+                modelInfo, size = self.spilling.pop(key)
+                evicted += self.admit(key, modelInfo, size)
+            else:
+                modelInfo = None
+                version = self.versions.get(key)
+        self.spill(evicted)
+
+        if modelInfo is not None:
+            return modelInfo
+        if modelName not in self.getModelNames(sessionID):
+            raise KeyError(modelName)
+
+        # The model was evicted, it is loaded back into memory without holding the lock
+        modelInfo = self.getSpillStore().getModelInfo(sessionID, modelName)
+        size = self.getSpillStore().getSelected(sessionID, "size:" + modelName)
+        if size is None:
+            size = self.estimateSize(modelInfo)
+
+        with self.lock:
+            if self.versions.get(key) != version or modelName in self.modelInformation.get(sessionID, {}) or key in self.spilling:
+                # Stored again while it was being loaded
+                retry = True
+            else:
+                retry = False
+                self.restoreSession(sessionID)
+                evicted = self.admit(key, modelInfo, size)
+        if retry:
+            return self.getModelInfo(sessionID, modelName)
+        self.spill(evicted)
+        return modelInfo
+
+    def setModelInfo(self, sessionID, modelName, modelInfo):
+        # Measured before taking the lock, this pickles the fitted model
+        size = self.estimateSize(modelInfo)
+        with self.lock:
+            evicted = self.openSession(sessionID)
+            if modelName not in self.modelNames[sessionID]:
+                self.modelNames[sessionID].append(modelName)
+            evicted += self.admit((sessionID, "model", modelName), modelInfo, size)
+        self.spill(evicted)
+
+    def getSelectedModel(self, sessionID):
+        with self.lock:
+            self.restoreSession(sessionID)
+            modelName = self.selectedModel.get(sessionID)
+        if modelName is None:
+            return None
+        return self.getModelInfo(sessionID, modelName)["modelData"]
+
+    def setSelectedModel(self, sessionID, modelName):
+        with self.lock:
+            self.selectedModel[sessionID] = modelName
+
+    def getSelectedTree(self, sessionID):
+        return self.getStoredFigure(sessionID, "tree")
+
+    def setSelectedTree(self, sessionID, figure):
+        self.setStoredFigure(sessionID, "tree", figure)
+
+    def getSelectedBoundary(self, sessionID):
+        return self.getStoredFigure(sessionID, "boundary")
+
+    def setSelectedBoundary(self, sessionID, figure):
+        self.setStoredFigure(sessionID, "boundary", figure)
+
+    def getFigure(self, sessionID, name):
+        return self.getStoredFigure(sessionID, "figure:" + name)
+
+    def setFigure(self, sessionID, name, figure):
+        self.setStoredFigure(sessionID, "figure:" + name, figure)
+
+    '''
+    Returns a stored figure, loading it back from the spill store if it
+    was evicted, or None.
+    '''
+    def getStoredFigure(self, sessionID, kind):
+        key = (sessionID, "figure", kind)
+        with self.lock:
+            self.restoreSession(sessionID)
+            evicted = self.touchSession(sessionID)
+            figures = self.figures.get(sessionID, {})
+            figure = None
+            if kind in figures:
+                self.usage.move_to_end(key)
+                figure = figures[kind]
+            elif key in self.spilling:
+                figure, size = self.spilling.pop(key)
+                evicted += self.admit(key, figure, size)
+            # Only figures that were evicted are in the spill store
+            spilled = figure is None and key in self.versions
+            version = self.versions.get(key)
+        self.spill(evicted)
+        if not spilled:
+            return figure
+
+        figure = self.getSpillStore().getSelected(sessionID, kind)
+        if figure is None:
+            return None
+        size = self.estimateFigureSize(figure)
+        with self.lock:
+            if self.versions.get(key) != version or kind in self.figures.get(sessionID, {}) or key in self.spilling:
+                retry = True
+            else:
+                retry = False
+                evicted = self.admit(key, figure, size)
+        if retry:
+            return self.getStoredFigure(sessionID, kind)
+        self.spill(evicted)
+        return figure
+
+    '''
+    Stores a figure, setting None removes it.
+    '''
+    def setStoredFigure(self, sessionID, kind, figure):
+        key = (sessionID, "figure", kind)
+        size = self.estimateFigureSize(figure) if figure is not None else 0
+        with self.lock:
+            self.restoreSession(sessionID)
+            evicted = self.touchSession(sessionID)
+            self.spilling.pop(key, None)
+            if figure is None:
+                self.figures.get(sessionID, {}).pop(kind, None)
+                self.usage.pop(key, None)
+                self.versions.pop(key, None)
+            else:
+                evicted += self.admit(key, figure, size)
+        self.spill(evicted)
+
+    '''
+    Returns the total estimated size in bytes of the entries held in memory,
+    or of a single session's entries if a session id is given.
+    '''
+    def getUsage(self, sessionID = None):
+        with self.lock:
+            return sum(size for key, size in self.usage.items() if sessionID is None or key[0] == sessionID)
+
+    '''
+    Returns the store evicted entries are spilled to, it is only created
+    once the first entry is evicted.
+    '''
+    def getSpillStore(self):
+        with self.lock:
+            if self.spillStore is None:
+                self.spillStore = DiskSessionStore(self.spillPath)
+            return self.spillStore
+
+    '''
+    Creates the session if it does not exist and records that it has been used.
+    Must be called while holding the lock, returns the entries to pass to 'spill'.
+    '''
+    def openSession(self, sessionID):
+        self.restoreSession(sessionID)
+        self.modelNames.setdefault(sessionID, [])
+        self.modelInformation.setdefault(sessionID, {})
+        return self.touchSession(sessionID)
+
+    '''
+    Records that a session has been used and expires the sessions that
+    have been idle for longer than the TTL. Must be called while holding
+    the lock, returns the entries to pass to 'spill'.
+    '''
+    def touchSession(self, sessionID):
+        now = time.time()
+        self.lastAccess[sessionID] = now
+        if now - self.lastSweep < self.sweepInterval:
+            return []
+        self.lastSweep = now
+
+        evicted = []
+        expired = [other for other, accessed in self.lastAccess.items() if now - accessed > self.sessionTTL and other != sessionID]
+        for other in expired:
+            evicted += self.expireSession(other)
+        return evicted
+
+    '''
+    Moves an expired session to the spill store, its models are spilled, its
+    figures are dropped and nothing about it is left in memory. Must be
+    called while holding the lock, returns the entries to pass to 'spill'.
+    '''
+    def expireSession(self, sessionID):
+        evicted = [self.evict(key) for key in [key for key in self.usage if key[0] == sessionID and key[1] == "model"]]
+
+        # Only the session's model names and selected model are small enough to write while holding the lock
+        if sessionID in self.modelNames:
+            spillStore = self.getSpillStore()
+            spillStore.createSession(sessionID)
+            spillStore.setSelected(sessionID, "modelNames", self.modelNames.pop(sessionID))
+            if sessionID in self.selectedModel:
+                spillStore.setSelectedModel(sessionID, self.selectedModel.pop(sessionID))
+
+        for key in [key for key in self.usage if key[0] == sessionID]:
+            del self.usage[key]
+        for key in [key for key in self.spilling if key[0] == sessionID and key[1] == "figure"]:
+            del self.spilling[key]
+        for key in [key for key in self.versions if key[0] == sessionID and key[1] == "figure"]:
+            del self.versions[key]
+        self.modelInformation.pop(sessionID, None)
+        self.lastAccess.pop(sessionID, None)
+        self.figures.pop(sessionID, None)
+        return evicted
+
+    '''
+    Brings an expired session back from the spill store, its models are
+    only loaded when they are used. Must be called while holding the lock.
+    '''
+    def restoreSession(self, sessionID):
+        if sessionID in self.modelNames or self.spillStore is None or not self.spillStore.hasSession(sessionID):
+            return
+        self.modelNames[sessionID] = self.spillStore.getSelected(sessionID, "modelNames") or self.spillStore.getModelNames(sessionID)
+        self.modelInformation[sessionID] = {}
+        selected = self.spillStore.getSelected(sessionID, "model")
+        if selected is not None:
+            self.selectedModel[sessionID] = selected
+        self.lastAccess[sessionID] = time.time()
+
+    '''
+    Places a model or figure in memory as the most recently used entry and
+    then evicts entries until every limit is met again. Must be called while
+    holding the lock, returns the entries to pass to 'spill'.
+    '''
+    def admit(self, key, value, size):
+        sessionID, kind, name = key
+        if kind == "model":
+            self.modelInformation.setdefault(sessionID, {})[name] = value
+        else:
+            self.figures.setdefault(sessionID, {})[name] = value
+        self.versions[key] = self.versions.get(key, 0) + 1
+        self.usage[key] = size
+        self.usage.move_to_end(key)
+        return self.enforceLimits(key)
+
+    '''
+    Removes an entry from memory and marks it as being spilled. Must be
+    called while holding the lock, returns the entry to pass to 'spill'.
+    '''
+    def evict(self, key):
+        sessionID, kind, name = key
+        if kind == "model":
+            value = self.modelInformation[sessionID].pop(name)
+        else:
+            value = self.figures[sessionID].pop(name)
+        size = self.usage.pop(key)
+        self.spilling[key] = (value, size)
+        return key
+
+    '''
+    Writes evicted entries to the spill store, must be called without holding
+    the lock. An entry that was used again before it was written has been
+    taken back into memory and is skipped.
+    '''
+    def spill(self, evicted):
+        if len(evicted) == 0:
+            return None
+        spillStore = self.getSpillStore()
+        with self.spillLock:
+            for key in evicted:
+                with self.lock:
+                    pending = self.spilling.get(key)
+                if pending is None:
+                    continue
+
+                sessionID, kind, name = key
+                value, size = pending
+                if kind == "model":
+                    spillStore.setModelInfo(sessionID, name, value)
+                    spillStore.setSelected(sessionID, "size:" + name, size)
+                else:
+                    spillStore.setSelected(sessionID, name, value)
+
+                with self.lock:
+                    if self.spilling.get(key) is pending:
+                        del self.spilling[key]
+        return None
+
+    '''
+    Evicts entries, other than 'keep', until the limits are met again
+        - the least recently used entries of the session being written are
+          evicted until that session is within its quota
+        - the least recently used entries of any session are evicted until
+          the total is within the budget
+    Must be called while holding the lock, returns the entries to pass to 'spill'.
+    '''
+    def enforceLimits(self, keep):
+        evicted = []
+        sessionUsage = self.getUsage(keep[0])
+        for key in [key for key in self.usage if key[0] == keep[0] and key != keep]:
+            if sessionUsage <= self.sessionQuota:
+                break
+            sessionUsage -= self.usage[key]
+            evicted.append(self.evict(key))
+
+        total = self.getUsage()
+        for key in [key for key in self.usage if key != keep]:
+            if total <= self.memoryBudget:
+                break
+            total -= self.usage[key]
+            evicted.append(self.evict(key))
+        return evicted
+
+    '''
+    Estimates the memory held by a modelInfo record in bytes, counting its
+    data frames, the pickled size of the fitted model and any cached
+    prediction arrays.
+    '''
+    def estimateSize(self, modelInfo):
+        size = 0
+        for data in modelInfo.get("trainingData", []) + modelInfo.get("testingData", []):
+            if isinstance(data, pd.DataFrame):
+                size += int(data.memory_usage(index = True, deep = True).sum())
+            elif isinstance(data, pd.Series):
+                size += int(data.memory_usage(index = True, deep = True))
+
+        if "modelData" in modelInfo:
+            size += len(pickle.dumps(modelInfo["modelData"], protocol = pickle.HIGHEST_PROTOCOL))
+
+        for value in (modelInfo.get("testPredictions") or {}).values():
+            if isinstance(value, np.ndarray):
+                size += value.nbytes
+        return size
+
+    '''
+    Estimates the memory held by a figure in bytes from the arrays, lists
+    and strings it contains, without serialising it.
+    '''
+    def estimateFigureSize(self, figure):
+        if hasattr(figure, "to_plotly_json"):
+            figure = figure.to_plotly_json()
+
+        size = 0
+        stack = [figure]
+        while len(stack) > 0:
+            value = stack.pop()
+            if isinstance(value, np.ndarray):
+                size += value.nbytes
+            elif isinstance(value, (str, bytes)):
+                size += len(value)
+            elif isinstance(value, dict):
+                stack.extend(value.values())
+            elif isinstance(value, (list, tuple)):
+                # Lists of plain values (plotted data) are counted without visiting every element
+                if len(value) > 0 and not isinstance(value[0], (dict, list, tuple, np.ndarray, str, bytes)):
+                    size += 8 * len(value)
+                else:
+                    stack.extend(value)
+            elif hasattr(value, "to_plotly_json"):
+                stack.append(value.to_plotly_json())
+            else:
+                size += 8
+        return size
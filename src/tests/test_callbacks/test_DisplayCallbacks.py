@@ -14,6 +14,10 @@ class test_readDataframe(unittest.TestCase):
     def test_modelSelected_000(self):
         result = DisplayCallbacks.modelSelected(None,0)
         self.assertEqual(result, [()])
+
+    def test_loadComponentRow_000(self):
+        result = DisplayCallbacks.loadComponentRow(0, {"type" : "lazy-component-load", "index" : 1}, None, None)
+        self.assertEqual(result, (DisplayCallbacks.dash.no_update, DisplayCallbacks.dash.no_update))
         
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
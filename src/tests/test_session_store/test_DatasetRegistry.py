@@ -0,0 +1,45 @@
+import os, sys, unittest, tempfile
+import pandas as pd
+fpath = os.path.join(os.path.dirname(__file__), '..\\..')
+sys.path.append(fpath)
+from DatasetRegistry import DatasetRegistry
+from session_store.stores.DiskSessionStore import DiskSessionStore
+
+class test_DatasetRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = DatasetRegistry().instance
+        self.registry.datasets.clear()
+        self.registry.sessions.clear()
+        self.registry.store = None
+
+    # A dataset that is not held cannot be used and must be registered
+    def test_useDataset_0(self):
+        self.assertIsNone(self.registry.useDataset("a", "hash"))
+        self.assertEqual(self.registry.sessions, {})
+
+    # Sessions using the same dataset share one entry, it is released with its last session
+    def test_useDataset_1(self):
+        self.registry.register("a", "hash", pd.DataFrame({"x": [1]}), "data.csv", {})
+        entry = self.registry.useDataset("b", "hash")
+        self.assertEqual(entry["references"], 2)
+        self.registry.release("a")
+        self.registry.release("b")
+        self.assertFalse(self.registry.hasDataset("hash"))
+
+    # With a shared store a dataset uploaded to one worker is loaded by another
+    def test_getEntry_0(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.registry.store = DiskSessionStore(os.path.join(directory, "sessions.sqlite"))
+            self.registry.register("a", "hash", pd.DataFrame({"x": [1]}), "data.csv", {})
+
+            # Another worker holds none of the datasets
+            self.registry.datasets.clear()
+            self.registry.sessions.clear()
+            entry = self.registry.getEntry("a")
+            self.assertEqual(entry["filename"], "data.csv")
+            self.assertEqual(list(entry["dataFrame"]["x"]), [1])
+            self.assertEqual(self.registry.getHash("a"), "hash")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os, sys, unittest, pickle
+fpath = os.path.join(os.path.dirname(__file__), '..\\..')
+sys.path.append(fpath)
+from ModelCache import ModelCache
+from sklearn.tree import DecisionTreeClassifier
+
+class test_ModelCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ModelCache().instance
+        self.cache.entries.clear()
+        ModelCache.totalBytes = 0
+
+    def test_getKey_0(self):
+        key = self.cache.getKey("hash", ["b", "a"], "class", 0.3, 1, DecisionTreeClassifier, {"random_state" : 1})
+        self.assertEqual(key, self.cache.getKey("hash", ["a", "b"], "class", 0.3, 1, DecisionTreeClassifier, {"random_state" : 1}))
+        self.assertNotEqual(key, self.cache.getKey("hash", ["a", "b"], "class", 0.2, 1, DecisionTreeClassifier, {"random_state" : 1}))
+
+    def test_getKey_1(self):
+        self.assertIsNone(self.cache.getKey("hash", ["a"], "class", 0.3, None, DecisionTreeClassifier, {}))
+        self.assertIsNone(self.cache.getKey(None, ["a"], "class", 0.3, 1, DecisionTreeClassifier, {"random_state" : 1}))
+
+    def test_get_0(self):
+        hits, misses = self.cache.hits, self.cache.misses
+        self.assertIsNone(self.cache.get("key"))
+        self.cache.put("key", [1, 2, 3])
+        self.assertEqual(self.cache.get("key"), [1, 2, 3])
+        self.assertEqual(self.cache.getStats()["hits"], hits + 1)
+        self.assertEqual(self.cache.getStats()["misses"], misses + 1)
+
+    def test_put_0(self):
+        for i in range(0, self.cache.maxEntries + 1):
+            self.cache.put(str(i), [i])
+        self.assertIsNone(self.cache.get("0"))
+        self.assertEqual(self.cache.getStats()["entries"], self.cache.maxEntries)
+
+    # Models are evicted once their total pickled size is over the byte budget
+    def test_put_1(self):
+        maxBytes = self.cache.maxBytes
+        try:
+            ModelCache.maxBytes = 2 * len(pickle.dumps(list(range(100)), protocol = pickle.HIGHEST_PROTOCOL))
+            for i in range(0, 3):
+                self.cache.put(str(i), list(range(100)))
+            self.assertIsNone(self.cache.get("0"))
+            self.assertEqual(self.cache.getStats()["entries"], 2)
+            self.assertLessEqual(self.cache.getStats()["bytes"], ModelCache.maxBytes)
+        finally:
+            ModelCache.maxBytes = maxBytes
+
+if __name__ == '__main__':
+    unittest.main()
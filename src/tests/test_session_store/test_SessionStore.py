@@ -0,0 +1,166 @@
+import os, sys, unittest, tempfile
+fpath = os.path.join(os.path.dirname(__file__), '..\\..')
+sys.path.append(fpath)
+from session_store.stores.MemorySessionStore import MemorySessionStore
+from session_store.stores.DiskSessionStore import DiskSessionStore
+from session_store.SessionStore import SessionStore
+
+class test_MemorySessionStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = MemorySessionStore()
+
+    def test_createSession_0(self):
+        self.assertFalse(self.store.hasSession("session"))
+        self.store.createSession("session")
+        self.assertTrue(self.store.hasSession("session"))
+        self.assertEqual(self.store.getModelNames("session"), [])
+
+    def test_setModelInfo_0(self):
+        self.store.setModelInfo("session", "model", {"modelData": [1, 2, 3]})
+        self.store.setSelectedModel("session", "model")
+        self.assertEqual(self.store.getModelNames("session"), ["model"])
+        self.assertEqual(self.store.getSelectedModel("session"), [1, 2, 3])
+
+    def test_getSelectedModel_0(self):
+        self.store.createSession("session")
+        self.assertIsNone(self.store.getSelectedModel("session"))
+
+    def test_getModelInfo_0(self):
+        with self.assertRaises(KeyError):
+            self.store.getModelInfo("session", "model")
+
+    def test_setFigure_0(self):
+        self.assertIsNone(self.store.getFigure("session", "figure"))
+        self.store.setFigure("session", "figure", {"data": [1, 2]})
+        self.assertEqual(self.store.getFigure("session", "figure"), {"data": [1, 2]})
+        self.assertIsNone(self.store.getFigure("other", "figure"))
+
+    # A store must implement every method of 'SessionStore'
+    def test_abstract_0(self):
+        class PartialStore(SessionStore):
+            def hasSession(self, sessionID):
+                return False
+        with self.assertRaises(TypeError):
+            PartialStore()
+
+class test_MemorySessionStoreLimits(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.spillPath = os.path.join(self.directory.name, "spill.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # Only the most recently used model fits in the budget, the other is spilled
+    # to disk and loaded back when it is next used
+    def test_memoryBudget_0(self):
+        store = MemorySessionStore(memoryBudget = 1, spillPath = self.spillPath)
+        store.setModelInfo("session", "first", {"modelData": [1]})
+        store.setModelInfo("session", "second", {"modelData": [2]})
+        self.assertEqual(list(store.modelInformation["session"]), ["second"])
+        self.assertEqual(store.getModelNames("session"), ["first", "second"])
+        self.assertEqual(store.getModelInfo("session", "first"), {"modelData": [1]})
+        self.assertEqual(list(store.modelInformation["session"]), ["first"])
+
+    # Exceeding one session's quota does not evict another session's models
+    def test_sessionQuota_0(self):
+        store = MemorySessionStore(sessionQuota = 1, spillPath = self.spillPath)
+        store.setModelInfo("a", "model", {"modelData": [1]})
+        store.setModelInfo("b", "first", {"modelData": [1]})
+        store.setModelInfo("b", "second", {"modelData": [2]})
+        self.assertEqual(list(store.modelInformation["a"]), ["model"])
+        self.assertEqual(list(store.modelInformation["b"]), ["second"])
+
+    # Idle sessions are spilled and their figures are dropped
+    def test_sessionTTL_0(self):
+        store = MemorySessionStore(sessionTTL = -1, spillPath = self.spillPath)
+        store.setModelInfo("a", "model", {"modelData": [1]})
+        store.setSelectedTree("a", {"figure": 1})
+        store.setModelInfo("b", "model", {"modelData": [2]})
+        self.assertNotIn("a", store.modelInformation)
+        self.assertNotIn("a", store.lastAccess)
+        self.assertIsNone(store.getSelectedTree("a"))
+        self.assertEqual(store.getModelNames("a"), ["model"])
+        self.assertEqual(store.getModelInfo("a", "model"), {"modelData": [1]})
+
+    # Idle sessions expire when any session is used, not only when a model is stored
+    def test_sessionTTL_2(self):
+        store = MemorySessionStore(sessionTTL = -1, spillPath = self.spillPath)
+        store.setModelInfo("a", "model", {"modelData": [1]})
+        store.createSession("b")
+        self.assertNotIn("a", store.modelInformation)
+        self.assertEqual(store.getModelNames("a"), ["model"])
+
+    # Figures count towards the budget and are spilled like models
+    def test_memoryBudget_1(self):
+        store = MemorySessionStore(memoryBudget = 1, spillPath = self.spillPath)
+        store.setFigure("session", "figure", {"data": [{"x": [1.0] * 1000}]})
+        self.assertGreaterEqual(store.getUsage("session"), 8000)
+        store.setModelInfo("session", "model", {"modelData": [1]})
+        self.assertNotIn("figure:figure", store.figures["session"])
+        self.assertEqual(store.getFigure("session", "figure"), {"data": [{"x": [1.0] * 1000}]})
+
+    # The size of a spilled model is kept with it and used when it is loaded back
+    def test_memoryBudget_2(self):
+        store = MemorySessionStore(memoryBudget = 1, spillPath = self.spillPath)
+        store.setModelInfo("session", "first", {"modelData": [1]})
+        size = store.getUsage("session")
+        store.setModelInfo("session", "second", {"modelData": [2]})
+        self.assertEqual(store.getSpillStore().getSelected("session", "size:first"), size)
+        store.estimateSize = None
+        store.getModelInfo("session", "first")
+        self.assertEqual(store.usage[("session", "model", "first")], size)
+
+    # The selected model of an expired session is restored with it
+    def test_sessionTTL_1(self):
+        store = MemorySessionStore(sessionTTL = -1, spillPath = self.spillPath)
+        store.setModelInfo("a", "model", {"modelData": [1]})
+        store.setSelectedModel("a", "model")
+        store.setModelInfo("b", "model", {"modelData": [2]})
+        self.assertNotIn("a", store.selectedModel)
+        self.assertTrue(store.hasSession("a"))
+        self.assertEqual(store.getSelectedModel("a"), [1])
+
+    # Models are spilled to a file of their own, not the disk store's file
+    def test_spillPath_0(self):
+        self.assertNotEqual(MemorySessionStore().spillPath, DiskSessionStore.defaultPath)
+
+class test_DiskSessionStore(test_MemorySessionStore):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = DiskSessionStore(os.path.join(self.directory.name, "sessions.sqlite"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # Sessions written by one store are visible to another using the same file,
+    # as they would be to another worker process
+    def test_sharedFile_0(self):
+        self.store.setModelInfo("session", "model", {"modelData": [1, 2, 3]})
+        self.store.setSelectedTree("session", {"figure": 1})
+        other = DiskSessionStore(self.store.path)
+        self.assertEqual(other.getModelInfo("session", "model"), {"modelData": [1, 2, 3]})
+        self.assertEqual(other.getSelectedTree("session"), {"figure": 1})
+
+    # A dataset is deleted once no session is using it
+    def test_setSessionDataset_0(self):
+        self.store.setDataset("hash", {"filename": "data.csv"})
+        self.store.setSessionDataset("session", "hash")
+        self.assertEqual(self.store.getDataset("hash"), {"filename": "data.csv"})
+        self.store.setSessionDataset("session", "other")
+        self.assertFalse(self.store.hasDataset("hash"))
+
+    # A cancel is kept when the job's record is updated
+    def test_cancelJob_0(self):
+        self.store.setJob("session", "job", {"jobID": "job", "state": "Queued"})
+        self.store.cancelJob("job")
+        self.store.setJob("session", "job", {"jobID": "job", "state": "Training"})
+        self.assertEqual(self.store.getJobs("session"), [{"jobID": "job", "state": "Training", "cancelled": True}])
+        self.store.removeJob("job")
+        self.assertIsNone(self.store.getJob("job"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os, sys, unittest, tempfile
+from concurrent.futures import Future
+fpath = os.path.join(os.path.dirname(__file__), '..\\..')
+sys.path.append(fpath)
+from TrainingQueue import TrainingQueue
+from session_store.stores.DiskSessionStore import DiskSessionStore
+
+class test_TrainingQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = TrainingQueue().instance
+        self.queue.store = None
+        self.job = {"jobID": "job", "sessionID": "a", "name": "model", "submitted": 0,
+                    "cancelled": False, "complete": False, "error": None, "future": Future()}
+
+    def test_getStatus_0(self):
+        self.assertEqual(self.queue.getStatus(self.job), "Queued")
+        self.job["future"].set_running_or_notify_cancel()
+        self.assertEqual(self.queue.getStatus(self.job), "Training")
+
+    # A job cancelled while its fit is running is finishing until the fit returns
+    def test_getStatus_1(self):
+        self.job["future"].set_running_or_notify_cancel()
+        self.job["cancelled"] = True
+        self.assertEqual(self.queue.getStatus(self.job), "Cancelling")
+        self.job["future"].set_result(None)
+        self.assertEqual(self.queue.getStatus(self.job), "Cancelled")
+
+    # A job started by another worker is reported and cancelled through its shared record
+    def test_getSessionJobs_0(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.queue.store = DiskSessionStore(os.path.join(directory, "sessions.sqlite"))
+            self.queue.store.setJob("a", "job", {"jobID": "job", "sessionID": "a", "name": "model", "submitted": 0, "state": "Training", "error": None})
+
+            jobs = self.queue.getSessionJobs("a")
+            self.assertEqual(self.queue.getStatus(jobs[0]), "Training")
+            self.assertTrue(self.queue.cancel("job"))
+            self.assertEqual(self.queue.getStatus(self.queue.getSessionJobs("a")[0]), "Cancelling")
+            self.queue.remove("job")
+            self.assertEqual(self.queue.getSessionJobs("a"), [])
+            self.queue.store = None
+
+if __name__ == '__main__':
+    unittest.main()
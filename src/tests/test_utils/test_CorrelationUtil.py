@@ -0,0 +1,38 @@
+import os, sys, unittest
+import numpy as np
+import pandas as pd
+fpath = os.path.join(os.path.dirname(__file__), '..\\..')
+sys.path.append(fpath)
+from utils.CorrelationUtil import CorrelationUtil
+
+class test_CorrelationUtil(unittest.TestCase):
+
+    def setUp(self):
+        CorrelationUtil.cache.clear()
+        x = np.arange(10, dtype = float)
+        self.data = pd.DataFrame({"a": x, "b": np.sin(x), "c": x * 2 + 1, "d": -x})
+
+    # Each feature is followed by the unplaced feature most correlated with it
+    def test_orderByCorrelation_0(self):
+        result = CorrelationUtil.orderByCorrelation(["a", "b", "c", "d"], self.data)
+        self.assertEqual(result[:2], ["a", "c"])
+        self.assertEqual(sorted(result), ["a", "b", "c", "d"])
+
+    # A constant feature has no correlation and is placed last
+    def test_orderByCorrelation_1(self):
+        self.data["e"] = 1.0
+        result = CorrelationUtil.orderByCorrelation(["a", "e", "d", "c"], self.data)
+        self.assertEqual(result[0], "a")
+        self.assertEqual(result[-1], "e")
+
+    # The order is cached by model id
+    def test_orderByCorrelation_2(self):
+        first = CorrelationUtil.orderByCorrelation(["a", "b", "c"], self.data, "model")
+        self.assertEqual(CorrelationUtil.orderByCorrelation(["a", "b", "c"], None, "model"), first)
+
+    # A single feature is returned as it is
+    def test_orderByCorrelation_3(self):
+        self.assertEqual(CorrelationUtil.orderByCorrelation(["a"], self.data), ["a"])
+
+if __name__ == '__main__':
+    unittest.main()
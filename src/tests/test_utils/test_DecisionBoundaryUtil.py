@@ -0,0 +1,198 @@
+import os, sys, unittest
+import numpy as np
+import pandas as pd
+fpath = os.path.join(os.path.dirname(__file__), '..\\..')
+sys.path.append(fpath)
+from sklearn.tree import DecisionTreeClassifier
+from utils.DecisionBoundaryUtil import DecisionBoundaryUtil
+from BoundaryCache import BoundaryCache, computeBoundaryCell
+from sklearn.ensemble import RandomForestClassifier
+
+class test_DecisionBoundaryUtil(unittest.TestCase):
+
+    def setUp(self):
+        self.trainingData = [pd.DataFrame({"a": [0.0, 10.0], "b": [0.0, 1.0]}), pd.Series(["x", "y"])]
+        self.testingData = [pd.DataFrame({"a": [5.0], "b": [0.5]}), pd.Series(["x"])]
+
+    # Each axis starts at the buffered minimum and steps evenly towards the buffered maximum
+    def test_getHeatmapValues_0(self):
+        heatmapValues = DecisionBoundaryUtil(divisions = 4).getHeatmapValues(self.trainingData, self.testingData)
+        self.assertEqual(len(heatmapValues), 2)
+        np.testing.assert_allclose(heatmapValues[0], [-1.0, 2.0, 5.0, 8.0])
+        np.testing.assert_allclose(heatmapValues[1], [-0.1, 0.2, 0.5, 0.8])
+
+    # The grid has one row per point with the x axis varying fastest
+    def test_getHeatmapGrid_0(self):
+        grid = DecisionBoundaryUtil().getHeatmapGrid([np.array([1.0, 2.0, 3.0]), np.array([10.0, 20.0])])
+        expected_output = np.array([[1.0, 10.0], [2.0, 10.0], [3.0, 10.0],
+                                    [1.0, 20.0], [2.0, 20.0], [3.0, 20.0]])
+        np.testing.assert_array_equal(grid, expected_output)
+        self.assertTrue(grid.flags["C_CONTIGUOUS"])
+
+    # A single feature produces a single column grid
+    def test_getHeatmapGrid_1(self):
+        grid = DecisionBoundaryUtil().getHeatmapGrid([np.array([1.0, 2.0, 3.0])])
+        self.assertEqual(grid.shape, (3, 1))
+
+    # The projected model is trained on the selected features only and the stored record is unchanged
+    def test_projectModel_0(self):
+        trainingData = [pd.DataFrame({"a": [0.0, 1.0, 2.0, 3.0], "b": [1.0, 0.0, 1.0, 0.0], "c": [5.0, 5.0, 6.0, 6.0]}), pd.Series(["x", "x", "y", "y"])]
+        modelInfo = {"modelData": DecisionTreeClassifier(random_state = 0).fit(trainingData[0], trainingData[1]),
+                     "trainingData": trainingData,
+                     "testingData": [trainingData[0].iloc[:2], trainingData[1].iloc[:2]],
+                     "modelArguments": {"random_state": 0},
+                     "colourKey": {"x": 0, "y": 1},
+                     "shapeKey": {"x": 0, "y": 1},
+                     "modelID": "m"}
+
+        boundaryInfo = DecisionBoundaryUtil().projectModel(modelInfo, ["c", "a"])
+        self.assertEqual(list(boundaryInfo["modelData"].feature_names_in_), ["a", "c"])
+        self.assertEqual(list(boundaryInfo["testingData"][0].columns), ["a", "c"])
+        self.assertEqual(list(modelInfo["trainingData"][0].columns), ["a", "b", "c"])
+        self.assertEqual(boundaryInfo["modelID"], "m:a|c")
+
+    # A single split is predicted exactly with far fewer predictions than the full grid
+    def test_getAdaptivePredictions_0(self):
+        xTrain = pd.DataFrame({"a": [0.0, 1.0, 8.0, 9.0], "b": [0.0, 9.0, 0.0, 9.0]})
+        model = DecisionTreeClassifier(random_state = 0).fit(xTrain, ["x", "x", "y", "y"])
+        boundaryUtil = DecisionBoundaryUtil(divisions = 64, adaptive = True)
+        heatmapValues = boundaryUtil.getHeatmapValues([xTrain], [xTrain])
+
+        predictions, count = boundaryUtil.getAdaptivePredictions(model, heatmapValues)
+        expected_output = model.predict(pd.DataFrame(boundaryUtil.getHeatmapGrid(heatmapValues), columns = ["a", "b"]))
+        np.testing.assert_array_equal(predictions, expected_output)
+        self.assertLess(count, len(expected_output) / 2)
+
+    # One feature is refined along the x axis only
+    def test_getAdaptivePredictions_1(self):
+        xTrain = pd.DataFrame({"a": [0.0, 1.0, 8.0, 9.0]})
+        model = DecisionTreeClassifier(random_state = 0).fit(xTrain, ["x", "x", "y", "y"])
+        boundaryUtil = DecisionBoundaryUtil(divisions = 30, adaptive = True)
+        heatmapValues = boundaryUtil.getHeatmapValues([xTrain], [xTrain])
+
+        predictions, _ = boundaryUtil.getAdaptivePredictions(model, heatmapValues)
+        np.testing.assert_array_equal(predictions, model.predict(pd.DataFrame({"a": heatmapValues[0]})))
+
+    # Adaptive mode is off unless asked for
+    def test_init_0(self):
+        self.assertFalse(DecisionBoundaryUtil().adaptive)
+
+    # A region between the coarse corners is not lost, the full grid is predicted instead
+    def test_getHeatmapArrays_0(self):
+        xTrain = pd.DataFrame({"a": [0.0, 1.0, 4.0, 5.0, 8.0, 9.0]})
+        model = DecisionTreeClassifier(random_state = 0).fit(xTrain, ["x", "x", "y", "y", "x", "x"])
+        boundaryUtil = DecisionBoundaryUtil(divisions = 30, adaptive = True, coarseStep = 29)
+        heatmapValues = boundaryUtil.getHeatmapValues([xTrain], [xTrain])
+
+        predictions, _ = boundaryUtil.getAdaptivePredictions(model, heatmapValues)
+        self.assertEqual(set(predictions), {"x"})
+        heatmapArrays = boundaryUtil.getHeatmapArrays(model, heatmapValues, {"x": 0, "y": 1})
+        np.testing.assert_array_equal(heatmapArrays["text"], model.predict(pd.DataFrame({"a": heatmapValues[0]})))
+
+    # A single split gives two boxes that meet at the threshold and are clipped to the range
+    def test_getTreeRegions_0(self):
+        xTrain = pd.DataFrame({"a": [0.0, 1.0, 8.0, 9.0], "b": [0.0, 9.0, 0.0, 9.0]})
+        model = DecisionTreeClassifier(random_state = 0).fit(xTrain, ["x", "x", "y", "y"])
+        lows, highs, classes = DecisionBoundaryUtil().getTreeRegions(model, np.array([-1.0, -1.0]), np.array([10.0, 10.0]))
+
+        order = np.argsort(lows[:, 0])
+        np.testing.assert_allclose(lows[order], [[-1.0, -1.0], [4.5, -1.0]])
+        np.testing.assert_allclose(highs[order], [[4.5, 10.0], [10.0, 10.0]])
+        self.assertEqual(list(classes[order]), ["x", "y"])
+
+    # Leaves outside the plotted range are skipped
+    def test_getTreeRegions_1(self):
+        xTrain = pd.DataFrame({"a": [0.0, 1.0, 8.0, 9.0]})
+        model = DecisionTreeClassifier(random_state = 0).fit(xTrain, ["x", "x", "y", "y"])
+        lows, highs, classes = DecisionBoundaryUtil().getTreeRegions(model, np.array([0.0]), np.array([3.0]))
+        np.testing.assert_allclose(lows, [[0.0]])
+        np.testing.assert_allclose(highs, [[3.0]])
+        self.assertEqual(list(classes), ["x"])
+
+    # A constant feature still gives regions, its range is widened around its value
+    def test_getTreeRegions_2(self):
+        xTrain = pd.DataFrame({"a": [0.0, 1.0, 8.0, 9.0], "b": [5.0, 5.0, 5.0, 5.0]})
+        model = DecisionTreeClassifier(random_state = 0).fit(xTrain, ["x", "x", "y", "y"])
+        mins, maxs = DecisionBoundaryUtil().getDataRange([xTrain], [xTrain])
+        np.testing.assert_allclose(mins, [-0.9, 4.5])
+        np.testing.assert_allclose(maxs, [9.9, 5.5])
+
+        lows, highs, classes = DecisionBoundaryUtil().getTreeRegions(model, np.array([-1.0, 5.0]), np.array([10.0, 5.0]))
+        order = np.argsort(lows[:, 0])
+        np.testing.assert_allclose(lows[order], [[-1.0, 4.5], [4.5, 4.5]])
+        np.testing.assert_allclose(highs[order], [[4.5, 5.5], [10.0, 5.5]])
+        self.assertEqual(list(classes[order]), ["x", "y"])
+
+class test_BoundaryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = BoundaryCache().instance
+        self.cache.entries.clear()
+
+        xTrain = pd.DataFrame({"a": [0.0, 1.0, 2.0, 3.0], "b": [1.0, 0.0, 1.0, 0.0], "c": [5.0, 6.0, 5.0, 6.0]})
+        yTrain = pd.Series(["x", "x", "y", "y"])
+        self.modelInfo = {"modelData": DecisionTreeClassifier(random_state = 0).fit(xTrain, yTrain),
+                          "trainingData": [xTrain, yTrain],
+                          "testingData": [xTrain.iloc[:2], yTrain.iloc[:2]],
+                          "modelArguments": {"random_state": 0},
+                          "colourKey": {"x": 0, "y": 1},
+                          "shapeKey": {"x": 0, "y": 1},
+                          "modelID": "m"}
+
+    # The order the features are selected in does not change the key
+    def test_getKey_0(self):
+        self.assertEqual(self.cache.getKey("m", ["b", "a"]), self.cache.getKey("m", ["a", "b"]))
+
+    # A pair is computed once and then served from the cache
+    def test_getBoundary_0(self):
+        xTrain, yTrain = self.modelInfo["trainingData"]
+        self.modelInfo["modelData"] = RandomForestClassifier(n_estimators = 5, random_state = 0).fit(xTrain, yTrain)
+        boundary = self.cache.getBoundary(self.modelInfo, ["c", "a"])
+        self.assertEqual(boundary["heatmap"]["z"].shape, (self.cache.boundaryUtil.divisions, self.cache.boundaryUtil.divisions))
+        self.assertIs(self.cache.getBoundary(self.modelInfo, ["a", "c"]), boundary)
+
+    # Decision trees are drawn from their exact regions so no heatmap is stored
+    def test_getBoundary_1(self):
+        boundary = self.cache.getBoundary(self.modelInfo, ["a", "c"])
+        self.assertIsNone(boundary["heatmap"])
+        self.assertEqual(list(boundary["boundaryInfo"]["modelData"].feature_names_in_), ["a", "c"])
+
+    # A matrix cell is predicted at the requested resolution from the cell's columns only
+    def test_computeBoundaryCell_0(self):
+        cellInfo = self.cache.getCellInfo(self.modelInfo, ["a", "c"])
+        self.assertEqual(list(cellInfo["trainingData"][0].columns), ["a", "c"])
+        boundary = computeBoundaryCell(cellInfo, ["a", "c"], 10)
+        self.assertEqual(boundary["heatmap"]["z"].shape, (10, 10))
+        self.assertEqual(set(np.unique(boundary["heatmap"]["text"])), {"x", "y"})
+
+    # Decision tree cells share the entries of the pairwise plot
+    def test_getBoundaries_0(self):
+        boundary = self.cache.getBoundary(self.modelInfo, ["a", "c"])
+        boundaries = self.cache.getBoundaries(self.modelInfo, [["a", "b"], ["a", "c"]], 10)
+        self.assertIs(boundaries[1], boundary)
+        self.assertIsNone(boundaries[0]["heatmap"])
+
+    # Cached cells of other models are reused at the matrix resolution
+    def test_getBoundaries_1(self):
+        xTrain, yTrain = self.modelInfo["trainingData"]
+        self.modelInfo["modelData"] = RandomForestClassifier(n_estimators = 5, random_state = 0).fit(xTrain, yTrain)
+        self.cache.put("m", ["a", "c"], {"heatmap": {}}, 10)
+        self.assertEqual(self.cache.getBoundaries(self.modelInfo, [["c", "a"]], 10), [{"heatmap": {}}])
+        self.assertIsNone(self.cache.get("m", ["a", "c"]))
+
+    def test_put_0(self):
+        for i in range(0, self.cache.maxEntries + 1):
+            self.cache.put(str(i), ["a"], {})
+        self.assertIsNone(self.cache.get("0", ["a"]))
+        self.assertEqual(len(self.cache.entries), self.cache.maxEntries)
+
+    # Pairs are ranked by the summed importance of their features, only "a" separates
+    # the classes so both pairs containing it come first
+    def test_getInformativePairs_0(self):
+        np.testing.assert_array_equal(self.modelInfo["modelData"].feature_importances_, [1.0, 0.0, 0.0])
+        pairs = self.cache.getInformativePairs(self.modelInfo, 3)
+        self.assertEqual(pairs, [["a", "b"], ["a", "c"], ["b", "c"]])
+        self.assertEqual(self.cache.getInformativePairs(self.modelInfo, 1), [["a", "b"]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import os, sys, unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+fpath = os.path.join(os.path.dirname(__file__), '..\\..')
+sys.path.append(fpath)
+from utils.TreeUtil import TreeUtil, layoutEstimators
+from sklearn.tree import DecisionTreeClassifier
+
+class test_TreeUtil(unittest.TestCase):
+
+    def setUp(self):
+        x = pd.DataFrame({"a": [0.0, 1.0, 2.0, 3.0, 4.0, 5.0], "b": [1.0, 0.0, 1.0, 0.0, 1.0, 0.0]})
+        y = pd.Series(["x", "x", "y", "y", "z", "z"])
+        self.model = DecisionTreeClassifier(random_state = 0).fit(x, y)
+        self.treeUtil = TreeUtil()
+        self.treeUtil.parseTree(self.model, self.model, self.model.tree_)
+
+    # Every node is a vertex and every decision node has an edge to each child, keeping sklearn's node ids
+    def test_parseTree_0(self):
+        tree = self.model.tree_
+        self.assertEqual(self.treeUtil.getVerticies(), tree.node_count)
+        expected_output = []
+        for node in range(tree.node_count):
+            if tree.children_left[node] != -1:
+                expected_output += [(node, tree.children_left[node]), (node, tree.children_right[node])]
+        self.assertEqual(self.treeUtil.getEdges(), expected_output)
+
+    # Decision nodes show their split and leaves show their class
+    def test_parseTree_1(self):
+        tree = self.model.tree_
+        annotations = self.treeUtil.getAnnotations()
+        self.assertEqual(annotations[0], self.model.feature_names_in_[tree.feature[0]] + "<br> <= " + str(round(tree.threshold[0], 2)))
+        for node in np.flatnonzero(tree.children_left == -1):
+            self.assertEqual(annotations[node], str(self.model.classes_[np.argmax(tree.value[node][0])]))
+
+    # Decision nodes show the weighted impurity of their children, leaves show their own
+    def test_parseTree_2(self):
+        tree = self.model.tree_
+        left, right = tree.children_left[0], tree.children_right[0]
+        samples = tree.n_node_samples
+        expected_output = (samples[left] * tree.impurity[left] + samples[right] * tree.impurity[right]) / (samples[left] + samples[right])
+        self.assertAlmostEqual(self.treeUtil.impurities[0], expected_output)
+        leaves = np.flatnonzero(tree.children_left == -1)
+        np.testing.assert_allclose(self.treeUtil.impurities[leaves], tree.impurity[leaves])
+
+    # A tree drawn a second time with the same key is served from the cache
+    def test_generateDecisionTree_0(self):
+        TreeUtil.layoutCache.clear()
+        TreeUtil().generateDecisionTree(self.model, self.model, self.model.tree_, "session", ("model", None))
+        treeUtil = TreeUtil()
+        with mock.patch.object(TreeUtil, "layoutTree") as layoutTree:
+            tree = treeUtil.generateDecisionTree(self.model, self.model, self.model.tree_, "session", ("model", None))
+        layoutTree.assert_not_called()
+        self.assertEqual(len(tree), 1)
+        self.assertEqual(treeUtil.getEdges(), self.treeUtil.getEdges())
+        self.assertEqual(treeUtil.coordinates.shape, (self.model.tree_.node_count, 2))
+
+    # Trees are not cached without a model id
+    def test_generateDecisionTree_1(self):
+        TreeUtil.layoutCache.clear()
+        TreeUtil().generateDecisionTree(self.model, self.model, self.model.tree_, "session", (None, None))
+        self.assertEqual(len(TreeUtil.layoutCache), 0)
+
+    # A compact layout from a worker draws the same tree as laying it out directly
+    def test_layoutEstimators_0(self):
+        compactLayout = layoutEstimators(self.model, [self.model])[0]
+        self.assertEqual(compactLayout["coordinates"].dtype, np.float32)
+        expected_output = TreeUtil().layoutTree(self.model, self.model, self.model.tree_)
+        layout = TreeUtil().expandLayout(compactLayout)
+        self.assertEqual(layout["edges"], expected_output["edges"])
+        self.assertEqual(layout["annotations"], expected_output["annotations"])
+        np.testing.assert_allclose(layout["coordinates"], expected_output["coordinates"], rtol = 1e-6)
+
+    # Every edge from the root to the input's leaf is traced
+    def test_tracePaths_0(self):
+        tree = self.model.tree_
+        data = pd.DataFrame({"a": [4.5], "b": [1.0]})
+        expected_output = []
+        node = 0
+        while tree.children_left[node] != -1:
+            child = tree.children_left[node] if data.iloc[0, tree.feature[node]] <= tree.threshold[node] else tree.children_right[node]
+            expected_output.append((node, child))
+            node = child
+        edges, counts = self.treeUtil.tracePaths(self.model, data)
+        self.assertEqual(sorted(map(tuple, edges.tolist())), sorted(expected_output))
+        np.testing.assert_array_equal(counts, np.ones(len(expected_output)))
+
+    # A batch traces the union of its paths and counts the inputs on each edge
+    def test_tracePaths_1(self):
+        data = pd.DataFrame({"a": [0.0, 0.5, 5.0], "b": [1.0, 1.0, 0.0]})
+        edges, counts = self.treeUtil.tracePaths(self.model, data)
+        rootEdges = edges[:, 0] == 0
+        self.assertEqual(counts[rootEdges].sum(), 3)
+
+    # Each edge is drawn as two points and a gap
+    def test_getEdgeSegments_0(self):
+        self.treeUtil.coordinates = np.array([[0.0, 0.0], [-1.0, 1.0], [1.0, 1.0]])
+        x, y = self.treeUtil.getEdgeSegments(np.array([[0, 1], [0, 2]]))
+        np.testing.assert_array_equal(x, [0.0, -1.0, np.nan, 0.0, 1.0, np.nan])
+        np.testing.assert_array_equal(y, [2.0, 1.0, np.nan, 2.0, 1.0, np.nan])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,9 @@ from pandas.util.testing import assert_frame_equal
 from io import StringIO
 fpath = os.path.join(os.path.dirname(__file__), '..\\..')
 sys.path.append(fpath)
-from utils.Util import ImportUtil
+from utils.Util import ImportUtil, ModelUtil
+import numpy as np
+from sklearn.tree import DecisionTreeClassifier
 
 class test_ImportUtil(unittest.TestCase):
 
@@ -59,6 +61,39 @@ class test_ImportUtil(unittest.TestCase):
         with self.assertRaises(pd.errors.EmptyDataError):
             ImportUtil.csvToDataFrame(csv)
 
+    # Test case with whitespace either side of the separators
+    def test_csvToDataFrame_3(self):
+        csv = "Name , Age\nAlice ,25\nBob,  30 "
+        expected_output = pd.DataFrame({"Name": ["Alice", "Bob"], "Age": [25, 30]})
+        assert_frame_equal(expected_output,
+                         ImportUtil.csvToDataFrame(csv))
+
+    # Test case where each column is converted to a compact dtype
+    def test_ingestCsv_0(self):
+        csv = "Width, Count, Class\n1.5, 1, a\n2.5, 2, a\n3.5, 3, b\n4.5, 4, a\n5.5, 5, b"
+        df, report = ImportUtil.ingestCsv(csv)
+        self.assertEqual(df["Width"].dtype, np.float32)
+        self.assertEqual(df["Count"].dtype, np.int8)
+        self.assertEqual(df["Class"].dtype.name, "category")
+        self.assertEqual(report["rows"], 5)
+        self.assertEqual(report["columns"], 3)
+
+    # Test case where the upload is decoded and parsed without a string copy
+    def test_readContentBytes_0(self):
+        content = "text/csv;base64," + base64.b64encode(b"Name, Age\nAlice, 25").decode("utf-8")
+        df, report = ImportUtil.ingestCsv(ImportUtil.readContentBytes("test.csv", content))
+        self.assertEqual(list(df.columns), ["Name", "Age"])
+        self.assertEqual(df["Age"][0], 25)
+
+    # Test case where a stream is copied to disk in chunks and parsed from the file
+    def test_streamToTempFile_0(self):
+        path = ImportUtil.streamToTempFile(io.BytesIO(b"Name, Age\nAlice, 25\nBob, 30"), chunkSize = 4)
+        try:
+            expected_output = pd.DataFrame({"Name": ["Alice", "Bob"], "Age": [25, 30]})
+            assert_frame_equal(expected_output, ImportUtil.readCsvFile(path))
+        finally:
+            os.remove(path)
+
     # Test case with a valid pickle
     def test_readPickle_0(self):
         test_object = [1, 2, 3]
@@ -104,5 +139,103 @@ class test_ImportUtil(unittest.TestCase):
         expected_output = None
         self.assertEqual(ImportUtil.unPickle(file), expected_output)
 
+class test_ModelUtil(unittest.TestCase):
+
+    # Test case where every label is in the key
+    def test_encodeClasses_0(self):
+        codes, text = ModelUtil.encodeClasses(np.array(["b", "a", "b", "c"]), {"a": 0, "b": 1, "c": 2})
+        np.testing.assert_array_equal(codes, [1, 0, 1, 2])
+        np.testing.assert_array_equal(text, ["b", "a", "b", "c"])
+        self.assertEqual(codes.dtype, np.int64)
+
+    # Test case with non string labels and a label missing from the key
+    def test_encodeClasses_1(self):
+        codes, text = ModelUtil.encodeClasses(pd.Series([1, 2, 3]), {"1": 0, "2": 1})
+        np.testing.assert_array_equal(codes, [0, 1, np.nan])
+        np.testing.assert_array_equal(text, ["1", "2", ""])
+
+    # Test case where the cached predictions belong to a different model
+    def test_getTestPredictions_0(self):
+        xTest = pd.DataFrame({"a": [0.0, 1.0, 2.0, 3.0]})
+        yTest = pd.Series(["x", "x", "y", "y"])
+        model = DecisionTreeClassifier().fit(xTest, yTest)
+        modelInfo = {"modelData": model, "testingData": [xTest, yTest], "modelID": "new",
+                     "testPredictions": {"modelID": "old", "predictions": None, "probabilities": None}}
+        cache = ModelUtil.getTestPredictions(modelInfo)
+        self.assertEqual(cache["modelID"], "new")
+        np.testing.assert_array_equal(cache["predictions"], model.predict(xTest))
+        self.assertIs(modelInfo["testPredictions"], cache)
+
+    # Test case where a one hot encoded feature is built from its original column
+    def test_getMissingFeatures_0(self):
+        encoding = ModelUtil.getFeatureEncoding(pd.DataFrame({"a": [1.0], "colour": ["red"], "b": [2.0]}))
+        missing = ModelUtil.getMissingFeatures(["a", "colour_red", "b"], ["a", "colour"], encoding)
+        self.assertEqual(missing, ["b"])
+
+    # Test case where a column sharing the prefix of a one hot feature does not stand in for it
+    def test_getMissingFeatures_1(self):
+        encoding = ModelUtil.getFeatureEncoding(pd.DataFrame({"colour_shade": ["dark"], "colour": ["red"]}))
+        self.assertEqual(ModelUtil.getMissingFeatures(["colour_shade_dark", "colour_red"], ["colour_shade"], encoding), ["colour"])
+        self.assertEqual(ModelUtil.getMissingFeatures(["colour_red"], ["colour"]), ["colour_red"])
+
+    # Test case where categories are stripped and encoded as in training, unseen categories are not complete
+    def test_prepareFeatures_0(self):
+        encoding = ModelUtil.getFeatureEncoding(pd.DataFrame({"a": [1.0, 2.0], "colour": ["blue", "red"]}))
+        chunk = pd.DataFrame({"a": [1.0, 2.0, 3.0], "colour": [" red", "green", None]})
+        features, complete = ModelUtil.prepareFeatures(chunk, ["a", "colour_blue", "colour_red"], encoding)
+        self.assertEqual(list(features.columns), ["a", "colour_blue", "colour_red"])
+        self.assertEqual(list(features["colour_red"]), [1, 0, 0])
+        self.assertEqual(list(complete), [True, False, False])
+
+    # Test case where every row is scored over several chunks and a row with a missing value is skipped
+    def test_scoreCsv_0(self):
+        xTrain = pd.DataFrame({"a": [0.0, 1.0, 2.0, 3.0]})
+        model = DecisionTreeClassifier().fit(xTrain, pd.Series(["x", "x", "y", "y"]))
+        source = io.StringIO("a, b\n0.0, 1\n3.0, 1\n, 1\n2.5, 1\n")
+        output = ImportUtil.streamToTempFile(io.BytesIO(b""))
+        try:
+            scored = ModelUtil.scoreCsv(model, source, output, chunkSize = 2)
+            result = pd.read_csv(output)
+        finally:
+            os.remove(output)
+        self.assertEqual(scored, 3)
+        self.assertEqual(list(result.columns), ["row", "prediction", "probability_x", "probability_y"])
+        self.assertEqual(list(result["row"]), [0, 1, 2, 3])
+        self.assertEqual(list(result["prediction"].fillna("")), ["x", "y", "", "y"])
+        self.assertEqual(result["probability_y"][1], 1.0)
+
+    # Test case where the file is missing a feature
+    def test_scoreCsv_1(self):
+        model = DecisionTreeClassifier().fit(pd.DataFrame({"a": [0.0, 1.0]}), pd.Series(["x", "y"]))
+        with self.assertRaises(ValueError):
+            ModelUtil.scoreCsv(model, io.StringIO("b\n1\n"), os.devnull)
+
+    # Test case where the file has a header and no rows
+    def test_scoreCsv_2(self):
+        model = DecisionTreeClassifier().fit(pd.DataFrame({"a": [0.0, 1.0]}), pd.Series(["x", "y"]))
+        output = ImportUtil.streamToTempFile(io.BytesIO(b""))
+        try:
+            scored = ModelUtil.scoreCsv(model, io.StringIO("a\n"), output)
+            result = pd.read_csv(output)
+        finally:
+            os.remove(output)
+        self.assertEqual(scored, 0)
+        self.assertEqual(list(result.columns), ["row", "prediction", "probability_x", "probability_y"])
+        self.assertEqual(len(result), 0)
+
+    # Test case where each class keeps its share of the sample
+    def test_stratifiedSample_0(self):
+        labels = np.array(["a"] * 900 + ["b"] * 100)
+        sample = ModelUtil.stratifiedSample(labels, maxRows = 100)
+        self.assertEqual(len(sample), 100)
+        self.assertEqual((labels[sample] == "b").sum(), 10)
+        self.assertTrue((np.diff(sample) > 0).all())
+
+    # Test case where a rare class keeps one row and small data is not sampled
+    def test_stratifiedSample_1(self):
+        labels = np.array(["a"] * 999 + ["b"])
+        self.assertIn(999, ModelUtil.stratifiedSample(labels, maxRows = 10))
+        np.testing.assert_array_equal(ModelUtil.stratifiedSample(labels[:5], maxRows = 10), np.arange(5))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,70 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+
+"""
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Orders features so that each feature is placed next to the remaining
+feature it is most correlated with, which makes plots such as parallel
+coordinates easier to read.
+
+The correlation matrix is calculated once with 'np.corrcoef' and the
+greedy ordering runs on the matrix, rather than correlating each pair
+of features separately. Orderings are cached by model id, as a model's
+testing data does not change, the size of the cache can be set with the
+CORRELATION_CACHE_SIZE environment variable.
+"""
+class CorrelationUtil():
+
+    # Indexed by (model id, features), ordered from least to most recently used
+    cache = OrderedDict()
+    maxCachedOrders = int(os.environ.get("CORRELATION_CACHE_SIZE", 64))
+    lock = threading.Lock()
+
+    # getCorrelationMatrix returns the pearson correlation between every pair of features.
+    # Features that do not vary have no correlation, their entries are NaN.
+    def getCorrelationMatrix(data, features):
+        values = data[features].to_numpy(dtype = np.float64)
+        with np.errstate(divide = "ignore", invalid = "ignore"):
+            return np.atleast_2d(np.corrcoef(values, rowvar = False))
+
+    # orderByCorrelation starts from the first feature and repeatedly places the feature
+    # most correlated with the last placed feature that has not been placed yet. Features
+    # with no correlation are placed last. If a model id is given the order is cached.
+    def orderByCorrelation(features, data, modelID = None):
+        features = list(features)
+        if len(features) == 0:
+            return []
+
+        key = (modelID, tuple(features))
+        if modelID is not None:
+            with CorrelationUtil.lock:
+                if key in CorrelationUtil.cache:
+                    CorrelationUtil.cache.move_to_end(key)
+                    return list(CorrelationUtil.cache[key])
+
+        correlation = CorrelationUtil.getCorrelationMatrix(data, features)
+        # Correlation is measured between -1..1, so -2 places them after every other feature
+        correlation = np.nan_to_num(correlation, nan = -2.0)
+
+        placed = np.zeros(len(features), dtype = bool)
+        placed[0] = True
+        order = [0]
+        for i in range(1, len(features)):
+            candidates = np.where(placed, -np.inf, correlation[order[-1]])
+            nextFeature = int(np.argmax(candidates))
+            placed[nextFeature] = True
+            order.append(nextFeature)
+
+        ordered = [features[i] for i in order]
+        if modelID is not None:
+            with CorrelationUtil.lock:
+                CorrelationUtil.cache[key] = ordered
+                while len(CorrelationUtil.cache) > CorrelationUtil.maxCachedOrders:
+                    CorrelationUtil.cache.popitem(last = False)
+        return list(ordered)
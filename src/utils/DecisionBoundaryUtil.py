@@ -5,120 +5,324 @@ from dash import dcc
 from UserSession import UserSession
 from dash import html
 from flask import request
+from utils.Util import ModelUtil
+from plotly.subplots import make_subplots
+from plotly.colors import sample_colorscale, sequential
+from sklearn.tree import DecisionTreeClassifier
+import os
+import itertools
+
 
 """
 AUTHOR: Daniel Ferring
 DATE CREATED: 19/02/2023
 PREVIOUS MAINTAINER: Daniel Ferring
-DATE LAST MODIFIED: 24/02/2023
+DATE LAST MODIFIED: 18/10/2026
 
 Used to create visualisations of a given model's decision
-boundaries. Can create either 1D or 2D representations.
+boundaries. Can create either 1D or 2D representations, or a
+matrix of 2D representations for every pair of a set of features.
+
+The cells of the matrix are drawn at 'matrixDivisions' grid points
+along each axis, they are computed by 'BoundaryCache.getBoundaries'.
 """
 class DecisionBoundaryUtil():
 
+    matrixDivisions = 40
+
+    """
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    INPUTS:
+    divisions: the number of grid points along each axis of the heatmap,
+               increasing this value will increase the resolution of the
+               decision boundary at the expense of performance
+    adaptive: if True the grid is predicted with 'getAdaptivePredictions',
+              which only predicts the points near the boundaries and can
+              miss regions smaller than a coarse cell. Off by default, it
+              can be turned on by setting the BOUNDARY_ADAPTIVE environment
+              variable to 1
+    coarseStep: the spacing, in grid points, of the first adaptive pass
+    """
+    def __init__(self, divisions = 150, adaptive = None, coarseStep = 8):
+        self.divisions = divisions
+        self.adaptive = adaptive if adaptive is not None else os.environ.get("BOUNDARY_ADAPTIVE", "0") == "1"
+        self.coarseStep = coarseStep
+
+    """
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Builds the small record needed to draw the decision boundary of a model
+    retrained on a subset of its features, used by the pairwise plot.
+
+    Only the selected feature columns are taken from the stored training and
+    testing data, the classifications are shared with the stored record and
+    nothing else is copied. A fresh estimator of the same type and arguments
+    is fitted on the selected columns, which keep the order they have in
+    the training data.
+
+    INPUTS:
+    modelInfo: contains all the information relating to the model 
+               to be represented (Defined in SettingCallbacks.py)
+    features: the names of the one or two features to keep
+    """
+    def projectModel(self, modelInfo, features):
+        features = [column for column in modelInfo["trainingData"][0].columns if column in set(features)]
+        xTrain = modelInfo["trainingData"][0][features]
+        xTest = modelInfo["testingData"][0][features]
+        yTrain = modelInfo["trainingData"][1]
+
+        model = type(modelInfo["modelData"])(**modelInfo["modelArguments"]).fit(xTrain, yTrain)
+
+        return {
+            "modelData" : model,
+            "trainingData" : [xTrain, yTrain],
+            "testingData" : [xTest, modelInfo["testingData"][1]],
+            "colourKey" : modelInfo["colourKey"],
+            "shapeKey" : modelInfo["shapeKey"],
+            "classifierType" : modelInfo.get("classifierType"),
+            "modelID" : str(modelInfo.get("modelID")) + ":" + "|".join(features)
+        }
+
+    """
+    AUTHOR: Daniel Ferring
+    DATE CREATED: 24/02/2023
+    PREVIOUS MAINTAINER: Daniel Ferring
+    DATE LAST MODIFIED: 18/10/2026
+
+    Returns the minimum and maximum plotted value of every feature, the
+    range of the model's training and testing data with a buffer. The
+    range of a constant feature is widened (see 'widenRange').
+
+    INPUTS:
+    trainingData: the data used to train the model
+    testingData: the data used to test the model
+    """
+    def getDataRange(self, trainingData, testingData):
+
+        #Extracts feature values from the training data
+        features = pd.concat([trainingData[0], testingData[0]])
+
+        #Finds the minimum and maximum values for every feature at once
+        mins = features.min().to_numpy(dtype = np.float64)
+        maxs = features.max().to_numpy(dtype = np.float64)
+
+        #Applies a buffer so that the visualisation extends a bit beyond each 
+        #min and max value (looks nicer)
+        buffer = (maxs - mins) / 10
+        return self.widenRange(mins - buffer, maxs + buffer)
+
+    """
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Widens every range whose minimum equals its maximum (a constant
+    feature) by a tenth of its value, or 0.5 if that is smaller, either
+    side, so that every plotted range has a width.
+
+    INPUTS:
+    mins: the minimum plotted value of every feature
+    maxs: the maximum plotted value of every feature
+    """
+    def widenRange(self, mins, maxs):
+        mins = np.array(mins, dtype = np.float64)
+        maxs = np.array(maxs, dtype = np.float64)
+        buffer = np.where(maxs > mins, 0.0, np.maximum(np.abs(mins) / 10, 0.5))
+        return mins - buffer, maxs + buffer
+
     """
     AUTHOR: Daniel Ferring
     DATE CREATED: 24/02/2023
     PREVIOUS MAINTAINER: Daniel Ferring
-    DATE LAST MODIFIED: 21/03/2023
+    DATE LAST MODIFIED: 18/10/2026
 
     Generates the values required to create a heatmap using values from
     the model's training data.
 
+    Each axis is generated with a single call to np.linspace rather than
+    by stepping through the range in python.
+
     INPUTS:
     trainingData: the data used to train the model
+    testingData: the data used to test the model
     """
     def getHeatmapValues(self, trainingData, testingData):
+        mins, maxs = self.getDataRange(trainingData, testingData)
 
-        #Stores minimum values for each feature
-        mins = []
-        #Stores maximum values for each feature
-        maxs = []
+        #Creates an array of values for each feature (each array becomes an axis in the heatmap),
+        #the end point is excluded so the values match mins + step * j for j in 0..divisions-1
+        heatmapValues = [np.linspace(mins[i], maxs[i], self.divisions, endpoint = False)
+                         for i in range(0, len(mins))]
 
-        #Extracts feature values from the training data
-        features = pd.concat([trainingData[0], testingData[0]])
+        return heatmapValues
 
-        #Finds the minimum and maximum values for each feature
-        for i in features.columns:
-            min = features[i].min()
-            max = features[i].max()
+    """
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Combines the axis values produced by 'getHeatmapValues' into a single
+    contiguous float array with one row per grid point, ready to be passed
+    to model.predict.
 
-            #Applies a buffer so that the visualisation extends a bit beyond each 
-            #min and max value (looks nicer)
-            buffer = (max - min) / 10
-            mins.append(min - buffer)
-            maxs.append(max + buffer)
+    For two features the x axis varies fastest, matching the row-major
+    (len(y), len(x)) shape plotly expects for the heatmap z values.
+
+    INPUTS:
+    heatmapValues: a list of one or two arrays of axis values
+    """
+    def getHeatmapGrid(self, heatmapValues):
+        if len(heatmapValues) == 1:
+            return np.ascontiguousarray(heatmapValues[0], dtype = np.float64).reshape(-1, 1)
+
+        #meshgrid without copying returns broadcast (zero-stride) views of each axis,
+        #these are written straight into the preallocated grid
+        xx, yy = np.meshgrid(heatmapValues[0], heatmapValues[1], copy = False)
+        grid = np.empty((xx.size, 2), dtype = np.float64)
+        grid[:, 0] = xx.ravel()
+        grid[:, 1] = yy.ravel()
+        return grid
         
-        #Stores the values that will be used to create the heatmap
-        heatmapValues = []
+    """
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
 
-        #The divisions for each axis of the heatmap grid, increasing this value will increase
-        #the resolution of the decision boundary at the expense of performance
-        divisions = 150
+    Predicts the class of every point of the heatmap grid using quadtree
+    refinement instead of predicting every point.
 
-        #Creates a list of values for each feature (each list becomes an axis in the heatmap)
-        #and appends them to heatmapValues
-        for i in range(0, len(features.columns)):
-            featureValues = []
+    The grid is first split into cells 'coarseStep' points wide and the
+    corners of every cell are predicted. A cell whose corners all agree is
+    filled with that class, a cell whose corners disagree is split into
+    four and the new corners are predicted, until the cells are one point
+    wide. Every pass predicts all of its new points with a single call to
+    model.predict, so the number of calls grows with the depth of the tree
+    and the number of points predicted grows with the length of the
+    boundaries rather than the area of the grid.
 
-            #Uses the range in values and number of divisions to calculate the step needed between each value
-            step = (maxs[i] - mins[i]) / divisions
+    Regions smaller than a coarse cell that do not touch any of its
+    corners can be missed, 'coarseStep' controls this trade off.
+
+    Returns the predicted classes in the same order as 'getHeatmapGrid',
+    and the number of points that were predicted.
+
+    INPUTS:
+    model: The decision tree model to be represented
+    heatmapValues: The axis values returned by 'getHeatmapValues'
+    """
+    def getAdaptivePredictions(self, model, heatmapValues):
+        features = model.feature_names_in_
+        xAxis = np.asarray(heatmapValues[0], dtype = np.float64)
+        yAxis = np.asarray(heatmapValues[1], dtype = np.float64) if len(heatmapValues) > 1 else np.zeros(1)
+        nx, ny = len(xAxis), len(yAxis)
+
+        #Class index of every predicted point (-1 if not predicted) and of every filled point
+        predicted = np.full((ny, nx), -1, dtype = np.int64)
+        filled = np.full((ny, nx), -1, dtype = np.int64)
+        count = 0
+
+        #The first cells, the last cell of each axis is narrower if the step does not divide it
+        xEdges = np.unique(np.append(np.arange(0, nx, self.coarseStep), nx - 1))
+        yEdges = np.unique(np.append(np.arange(0, ny, self.coarseStep), ny - 1))
+        if len(xEdges) == 1:
+            xEdges = np.repeat(xEdges, 2)
+        if len(yEdges) == 1:
+            yEdges = np.repeat(yEdges, 2)
+        x0, y0 = np.meshgrid(xEdges[:-1], yEdges[:-1])
+        x1, y1 = np.meshgrid(xEdges[1:], yEdges[1:])
+        cells = np.stack([x0.ravel(), x1.ravel(), y0.ravel(), y1.ravel()], axis = 1)
+
+        while len(cells) > 0:
+            x0, x1, y0, y1 = cells.T
+
+            #Predicts every corner that has not been predicted yet in one call
+            cornerX = np.concatenate([x0, x1, x0, x1])
+            cornerY = np.concatenate([y0, y0, y1, y1])
+            missing = predicted[cornerY, cornerX] < 0
+            if missing.any():
+                points = np.unique(cornerY[missing] * nx + cornerX[missing])
+                pointY, pointX = np.divmod(points, nx)
+                grid = np.column_stack([xAxis[pointX], yAxis[pointY]])[:, :len(features)]
+                predictions = model.predict(pd.DataFrame(data = grid, columns = features, copy = False))
+                predicted[pointY, pointX] = np.searchsorted(model.classes_, predictions)
+                count += len(points)
+
+            corners = predicted[cornerY, cornerX].reshape(4, -1)
+            agree = (corners == corners[0]).all(axis = 0)
+
+            #Cells whose corners agree are filled with that class
+            for cx0, cx1, cy0, cy1, label in zip(x0[agree], x1[agree], y0[agree], y1[agree], corners[0][agree]):
+                filled[cy0:cy1 + 1, cx0:cx1 + 1] = label
+
+            #Cells whose corners disagree are split, a cell that is one point wide along an
+            #axis is not split along it, and a cell one point wide along both is finished
+            split = ~agree & ((x1 - x0 > 1) | (y1 - y0 > 1))
+            x0, x1, y0, y1 = x0[split], x1[split], y0[split], y1[split]
+            xm = np.where(x1 - x0 > 1, (x0 + x1) // 2, x1)
+            ym = np.where(y1 - y0 > 1, (y0 + y1) // 2, y1)
+            children = []
+            for cx0, cx1, xValid in [(x0, xm, True), (xm, x1, xm < x1)]:
+                for cy0, cy1, yValid in [(y0, ym, True), (ym, y1, ym < y1)]:
+                    valid = np.broadcast_to(np.logical_and(xValid, yValid), x0.shape)
+                    children.append(np.stack([cx0, cx1, cy0, cy1], axis = 1)[valid])
+            cells = np.concatenate(children)
+
+        #Predicted points take precedence over filled points on the edges of the cells
+        classIndex = np.where(predicted >= 0, predicted, filled)
+        return model.classes_[classIndex.ravel()], count
 
-            #Generates the values for the feature's list
-            for j in range(0, divisions):
-                value = mins[i] + (step * j)
-                featureValues.append(value)
-            
-            heatmapValues.append(featureValues)
-        
-        return heatmapValues
-        
     """
     AUTHOR: Daniel Ferring
     DATE CREATED: 24/02/2023
     PREVIOUS MAINTAINER: Daniel Ferring
-    DATE LAST MODIFIED: 21/03/2023
+    DATE LAST MODIFIED: 18/10/2026
     --Uses some logic initially implemented by Dominic Cripps--
 
-    Creates the heatmap object used to represent the decision boundaries of a given model
+    Predicts the class of every point of the heatmap grid and returns the
+    arrays the heatmap is drawn from as a dictionary with the keys
+    "x", "y", "z" (colour key values) and "text" (class names). In adaptive
+    mode the grid is predicted with 'getAdaptivePredictions', if that finds
+    a single class (no region was large enough to reach a coarse corner)
+    every point of the grid is predicted instead.
 
     INPUTS:
     model: The decision tree model to be represented
-    trainingData: The data used to train the model
+    heatmapValues: The axis values returned by 'getHeatmapValues'
     key: a dictionary mapping class strings to numerical values
     """
-    def plotHeatmap(self, model, heatmapValues, key):
+    def getHeatmapArrays(self, model, heatmapValues, key):
 
         #List of features used to train the model
         features = model.feature_names_in_
 
-        #Uses the data of a single feature if tree is one-dimensional
-        if len(features) == 1:
-            predictData = heatmapValues[0]
-        #Combines the data of both features if the tree is two-dimensional
-        else:
-            predictData = []
-            for y in heatmapValues[1]:
-                for x in heatmapValues[0]:
-                    predictData.append([x, y])
-        
-        #Creates a data frame with predictData as the rows and features as the columns
-        predictDF = pd.DataFrame(data = predictData, columns = features)
-        #Predicts the classifications for the data frame
-        predictions = model.predict(predictDF)
-
-        #List containing the numerical values for each classification
-        classifications = [None] * len(predictions)
-        #List containing string names of each classification
-        classificationsText = [''] * len(predictions)
-
-        #Gets values for the classifications and clasificationsText lists
-        for i in model.classes_:
-            for j in range(0, len(predictions)):
-                if predictions[j] == str(i):
-                    classifications[j] = key[str(i)]
-                    classificationsText[j] = str(i)
+        predictions = None
+        if self.adaptive:
+            predictions, _ = self.getAdaptivePredictions(model, heatmapValues)
+            if len(np.unique(predictions)) <= 1:
+                predictions = None
+
+        if predictions is None:
+            #Every point of the grid as a single (n, features) float array
+            predictData = self.getHeatmapGrid(heatmapValues)
+            
+            #The data frame wraps the grid without copying it, it is only used so that
+            #the column names match those the model was trained with
+            predictDF = pd.DataFrame(data = predictData, columns = features, copy = False)
+            #Predicts the classifications for the data frame
+            predictions = model.predict(predictDF)
+
+        #Maps each prediction to its colour key value and class name in a single pass
+        classifications, classificationsText = ModelUtil.encodeClasses(predictions, key)
         
         #Regardless of tree dimension the first feature in heatmapValues will be plotted on the x axis
         xData = heatmapValues[0]
@@ -132,13 +336,28 @@ class DecisionBoundaryUtil():
             classifications = np.reshape(classifications, (len(heatmapValues[1]), len(heatmapValues[0])))
             classificationsText = np.reshape(classificationsText, (len(heatmapValues[1]), len(heatmapValues[0])))
             yData = heatmapValues[1]
+
+        return {"x" : xData, "y" : yData, "z" : classifications, "text" : classificationsText}
+
+    """
+    AUTHOR: Daniel Ferring
+    DATE CREATED: 24/02/2023
+    PREVIOUS MAINTAINER: Daniel Ferring
+    DATE LAST MODIFIED: 18/10/2026
+
+    Creates the heatmap object used to represent the decision boundaries of a given model
+
+    INPUTS:
+    heatmapArrays: The arrays returned by 'getHeatmapArrays'
+    """
+    def plotHeatmap(self, heatmapArrays):
         
         #Creates the hetmap object
         heatmap = go.Heatmap(
-            z = classifications, 
-            x = xData, 
-            y = yData, 
-            text = classificationsText, 
+            z = heatmapArrays["z"], 
+            x = heatmapArrays["x"], 
+            y = heatmapArrays["y"], 
+            text = heatmapArrays["text"], 
             colorscale = 'sunset',
             hoverinfo = 'text',
             colorbar = dict(bgcolor = "#232323"),
@@ -147,11 +366,116 @@ class DecisionBoundaryUtil():
 
         return heatmap
 
+    """
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Returns the exact decision regions of a decision tree, one axis aligned
+    box per leaf, by walking the tree once from the root. Each box starts as
+    the plotted range and is narrowed by the threshold of every split on the
+    way to its leaf, branches that fall outside the range are skipped.
+    Zero width ranges are widened first (see 'widenRange'), otherwise no
+    branch would fall inside them.
+
+    Returns the lower and upper corners of the boxes as (leaves, features)
+    arrays and the class predicted in each box.
+
+    INPUTS:
+    model: The decision tree model to be represented
+    mins: the minimum plotted value of every feature (see 'getDataRange')
+    maxs: the maximum plotted value of every feature
+    """
+    def getTreeRegions(self, model, mins, maxs):
+        tree = model.tree_
+        lows, highs, classes = [], [], []
+
+        mins, maxs = self.widenRange(mins, maxs)
+        stack = [(0, mins, maxs)]
+        while len(stack) > 0:
+            node, low, high = stack.pop()
+            left, right = tree.children_left[node], tree.children_right[node]
+
+            if left == right:
+                lows.append(low)
+                highs.append(high)
+                classes.append(np.argmax(tree.value[node, 0]))
+                continue
+
+            #Samples with feature <= threshold go to the left child
+            feature, threshold = tree.feature[node], tree.threshold[node]
+            leftHigh = high.copy()
+            leftHigh[feature] = min(high[feature], threshold)
+            rightLow = low.copy()
+            rightLow[feature] = max(low[feature], threshold)
+
+            if low[feature] < leftHigh[feature]:
+                stack.append((left, low, leftHigh))
+            if rightLow[feature] < high[feature]:
+                stack.append((right, rightLow, high))
+
+        dimensions = len(mins)
+        return (np.array(lows, dtype = np.float64).reshape(-1, dimensions),
+                np.array(highs, dtype = np.float64).reshape(-1, dimensions),
+                model.classes_[np.array(classes, dtype = np.int64)])
+
+    """
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Draws the regions returned by 'getTreeRegions' as filled rectangles,
+    one trace per class so that hovering over a region shows its class.
+    The colours match those the heatmap would use for each class.
+
+    In the one-dimensional case each rectangle spans the hidden y axis.
+
+    INPUTS:
+    lows: the lower corners of the regions
+    highs: the upper corners of the regions
+    classes: the class predicted in each region
+    key: a dictionary mapping class strings to numerical values
+    """
+    def plotTreeRegions(self, lows, highs, classes, key):
+        regions = []
+        maxKey = max(1, max(key.values()))
+        names = np.array([str(c) for c in classes], dtype = object)
+
+        for name in np.unique(names):
+            selected = names == name
+            x0, x1 = lows[selected, 0], highs[selected, 0]
+            if lows.shape[1] > 1:
+                y0, y1 = lows[selected, 1], highs[selected, 1]
+            else:
+                y0, y1 = np.full(len(x0), -1.0), np.full(len(x0), 1.0)
+
+            #Each rectangle is a closed outline followed by a gap (NaN) before the next one
+            gap = np.full(len(x0), np.nan)
+            xData = np.column_stack([x0, x1, x1, x0, x0, gap]).ravel()
+            yData = np.column_stack([y0, y0, y1, y1, y0, gap]).ravel()
+
+            colour = sample_colorscale(sequential.Sunset, [key[name] / maxKey])[0]
+            regions.append(go.Scatter(x = xData,
+                                      y = yData,
+                                      mode = 'lines',
+                                      fill = 'toself',
+                                      fillcolor = colour,
+                                      line = dict(width = 0, color = colour),
+                                      hoveron = 'fills',
+                                      hoverinfo = 'text',
+                                      text = name,
+                                      name = name,
+                                      showlegend = False))
+
+        return regions
+
     """
     AUTHOR: Daniel Ferring
     DATE CREATED: 24/02/2023
     PREVIOUS MAINTAINER: Daniel Ferring
-    DATE LAST MODIFIED: 19/03/2023
+    DATE LAST MODIFIED: 18/10/2026
 
     Plots a scatter graph of the test and training data of the model,
     used to give an understanding of the accuracy of the decision boundaries
@@ -178,8 +502,8 @@ class DecisionBoundaryUtil():
 
 
         #Maps the classification strings to numberical values according to the key
-        classificationsNum = classifications.map(key)
-        classificationShapes = classifications.map(shapeKey)
+        classificationsNum, _ = ModelUtil.encodeClasses(classifications, key)
+        classificationShapes, _ = ModelUtil.encodeClasses(classifications, shapeKey)
 
         #There will alwats be at least one feature, which is used as the x axis
         xPlot = instances.iloc[:, 0]
@@ -284,18 +608,23 @@ class DecisionBoundaryUtil():
     AUTHOR: Daniel Ferring
     DATE CREATED: 24/02/2023
     PREVIOUS MAINTAINER: Daniel Ferring
-    DATE LAST MODIFIED: 2/05/2023
+    DATE LAST MODIFIED: 18/10/2026
 
     Combines the heatmap and the scatter plot into a single
     graph object to represent the decision boundaries of a
     given model
 
     INPUTS:
-    model: The decision tree model to be represented
     modelInfo: contains all the information relating to the model 
                to be represented (Defined in SettingCallbacks.py)
+    sessionID: the session the boundary is drawn for
+    heatmapArrays: previously computed heatmap arrays (see 'BoundaryCache'),
+                   if not given the heatmap is predicted from the model
+
+    Decision trees are drawn with their exact regions (see 'getTreeRegions')
+    instead of a heatmap.
     """
-    def generateDecisionBoundary(self, modelInfo, sessionID):
+    def generateDecisionBoundary(self, modelInfo, sessionID, heatmapArrays = None):
         model = modelInfo["modelData"]
         colourKey = modelInfo["colourKey"]
         shapeKey = modelInfo["shapeKey"]
@@ -303,16 +632,28 @@ class DecisionBoundaryUtil():
         #Stores the created graph object for use in the wider system
         decisionBoundary = []
 
-        #Creates heatmap,scatter plot and key objects
-        heatmapValues = self.getHeatmapValues(modelInfo["trainingData"], modelInfo['testingData'])
-        heatmap = self.plotHeatmap(model, heatmapValues, colourKey)
+        #Creates heatmap (or tree region), scatter plot and key objects
+        if isinstance(model, DecisionTreeClassifier):
+            mins, maxs = self.getDataRange(modelInfo["trainingData"], modelInfo['testingData'])
+            background = self.plotTreeRegions(*self.getTreeRegions(model, mins, maxs), colourKey)
+        else:
+            if heatmapArrays is None:
+                heatmapValues = self.getHeatmapValues(modelInfo["trainingData"], modelInfo['testingData'])
+                heatmapArrays = self.getHeatmapArrays(model, heatmapValues, colourKey)
+            background = [self.plotHeatmap(heatmapArrays)]
         scatter = self.plotScatterGraph(modelInfo["trainingData"], modelInfo["testingData"], colourKey, shapeKey)
         key = self.createKey(modelInfo)
 
         #Creates the graph object, the heatmap is overlaid with the scatter graph
-        graph = go.Figure(data = heatmap)
+        graph = go.Figure(data = background)
         graph.add_trace(scatter)
 
+        #The regions are drawn exactly to the edge of the plotted range
+        if isinstance(model, DecisionTreeClassifier):
+            graph.update_xaxes(range = [mins[0], maxs[0]], showgrid = False, zeroline = False)
+            if len(mins) > 1:
+                graph.update_yaxes(range = [mins[1], maxs[1]], showgrid = False, zeroline = False)
+
         #Labels x axis and makes the graph match the aesthetic of the rest of the app
         graph.update_layout(
             paper_bgcolor='rgba(0,0,0,0)',
@@ -331,7 +672,7 @@ class DecisionBoundaryUtil():
                 yaxis_title = str(model.feature_names_in_[1])
             )        
 
-        UserSession().instance.selectedBoundary[sessionID] = graph
+        UserSession().instance.store.setSelectedBoundary(sessionID, graph)
 
         #Creates a html div where the key and the boundary are placed side by side
         boundary = html.Div(children=[
@@ -344,3 +685,96 @@ class DecisionBoundaryUtil():
 
         decisionBoundary.append(boundary)
         return decisionBoundary
+
+    """
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Creates a matrix of small decision boundaries, one for every pair of the
+    given features. Each cell is drawn from the boundary of a model retrained
+    on that pair, as returned by 'BoundaryCache.getBoundaries'. Decision trees
+    are drawn with their exact regions, other models with a heatmap.
+
+    The feature of each column is plotted on the x axis and the feature of
+    each row on the y axis, only the cells below the diagonal are drawn.
+
+    INPUTS:
+    modelInfo: contains all the information relating to the model 
+               to be represented (Defined in SettingCallbacks.py)
+    features: the features to pair, at least two
+    boundaries: the boundary of every pair returned by 'getMatrixPairs', in
+                the same order
+    """
+    def generateBoundaryMatrix(self, modelInfo, features, boundaries):
+        features = self.getMatrixFeatures(modelInfo, features)
+        colourKey = modelInfo["colourKey"]
+        size = len(features) - 1
+
+        #Every cell shares the same colour range so a class has the same colour in all of them
+        matrix = make_subplots(rows = size, cols = size, horizontal_spacing = 0.02, vertical_spacing = 0.02)
+        for (x, y), boundary in zip(itertools.combinations(range(0, len(features)), 2), boundaries):
+            boundaryInfo = boundary["boundaryInfo"]
+            if boundary["heatmap"] is None:
+                mins, maxs = self.getDataRange(boundaryInfo["trainingData"], boundaryInfo["testingData"])
+                for region in self.plotTreeRegions(*self.getTreeRegions(boundaryInfo["modelData"], mins, maxs), colourKey):
+                    matrix.add_trace(region, row = y, col = x + 1)
+                matrix.update_xaxes(range = [mins[0], maxs[0]], zeroline = False, row = y, col = x + 1)
+                matrix.update_yaxes(range = [mins[1], maxs[1]], zeroline = False, row = y, col = x + 1)
+            else:
+                heatmap = self.plotHeatmap(boundary["heatmap"])
+                heatmap.update(zmin = 0, zmax = max(1, len(colourKey) - 1))
+                matrix.add_trace(heatmap, row = y, col = x + 1)
+
+        #Labels the outer axes with their features and hides the ticks of the inner cells
+        for i in range(0, size):
+            matrix.update_xaxes(title_text = str(features[i]), row = size, col = i + 1)
+            matrix.update_yaxes(title_text = str(features[i + 1]), row = i + 1, col = 1)
+        matrix.update_xaxes(showgrid = False, showticklabels = False)
+        matrix.update_yaxes(showgrid = False, showticklabels = False)
+
+        #Hides the empty cells above the diagonal
+        for row in range(1, size + 1):
+            for col in range(row + 1, size + 1):
+                matrix.update_xaxes(visible = False, row = row, col = col)
+                matrix.update_yaxes(visible = False, row = row, col = col)
+
+        matrix.update_layout(
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font_color = "#f5f5f5",
+            autosize=True, 
+            margin={'t': 50,'l':10,'b':5,'r':30},
+            height = max(400, 160 * size)
+        )
+
+        return [html.Div(children = [dcc.Graph(figure = matrix)], style = {"width":"100%"})]
+
+    """
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Returns the selected features in the order they have in the training data.
+    """
+    def getMatrixFeatures(self, modelInfo, features):
+        return [column for column in modelInfo["trainingData"][0].columns if column in set(features)]
+
+    """
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Returns the feature pairs of the cells of the boundary matrix, in the
+    order 'generateBoundaryMatrix' draws them.
+
+    INPUTS:
+    modelInfo: contains all the information relating to the model 
+               to be represented (Defined in SettingCallbacks.py)
+    features: the features to pair, at least two
+    """
+    def getMatrixPairs(self, modelInfo, features):
+        return [list(pair) for pair in itertools.combinations(self.getMatrixFeatures(modelInfo, features), 2)]
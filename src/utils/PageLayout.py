@@ -60,7 +60,7 @@ class PageLayout():
     AUTHOR: Alfred Greenwood
     DATE CREATED: 14/02/2023
     PREVIOUS MAINTAINER: Dominic Cripps
-    DATE LAST MODIFIED: 07/05/2023
+    DATE LAST MODIFIED: 18/10/2026
 
     Defines the HTML divs that contain both the sidebar div and main body div.
     """
@@ -119,6 +119,15 @@ class PageLayout():
                 className="upload"
             ),
 
+            # Large datasets are streamed to the server by assets/js/streamingUpload.js
+            # instead of being sent through 'upload-dataset' as a base64 string, the
+            # script opens a file picker when 'stream-upload-button' is pressed and
+            # clicks the hidden button once the upload has been parsed
+            html.H4(children="Large Datasets"),
+            html.Button("Click To Stream A Dataset (.csv)", id="stream-upload-button", n_clicks = 0, className = "trainButton"),
+            html.Div(id="stream-upload-message", children=[]),
+            html.Button(id="load-streamed-dataset", n_clicks = 0, style = {"display" : "none"}),
+
             # Title and checklist for selecting which features to train              
             html.H4(children="Training Features"),
             dbc.Checklist(
@@ -171,6 +180,16 @@ class PageLayout():
             # Button used to train the appropriate model
             html.Button("Train", id="train-button", n_clicks = 0, className = "trainButton"),
 
+            # Models are trained in the background, this button cancels the
+            # most recently submitted training job
+            html.Button("Cancel Training", id="cancel-training-button", n_clicks = 0, className = "trainButton"),
+
+            # Displays the progress of each training job, the interval polls the
+            # training queue and is only enabled while a job is running
+            html.Div(id = "training-status", children = []),
+            dcc.Interval(id = "training-interval", interval = 1000, disabled = True),
+            dcc.Store(id = "training-job"),
+
             html.Div([html.Br()]),
 
             # Div that will contain all settings that are specific to the selected
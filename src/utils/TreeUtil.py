@@ -7,7 +7,45 @@ from igraph import Vertex
 import plotly.graph_objs as go
 from UserSession import UserSession
 from flask import request
-
+import numpy as np
+import os
+import threading
+from collections import OrderedDict
+
+
+
+'''
+AUTHOR: agent
+DATE CREATED: 18/10/2026
+PREVIOUS MAINTAINER: agent
+DATE LAST MODIFIED: 18/10/2026
+
+Parses and lays out a batch of trees in a worker process for the
+'TreeGallery', this must be a module level function so that it can
+be pickled and sent to the pool.
+
+Each layout is returned compactly, with 32 bit arrays and no figure,
+as it has to be sent back from the worker and is held for every tree
+in the ensemble.
+
+INPUTS
+classifier : Any object with the ensemble's 'feature_names_in_' and 'classes_'
+list estimators : The trees to lay out
+'''
+def layoutEstimators(classifier, estimators):
+    layouts = []
+    for estimator in estimators:
+        treeUtil = TreeUtil()
+        treeUtil.parseTree(classifier, estimator, estimator.tree_)
+        lay = treeUtil.buildGraph().layout('rt')
+        layouts.append({
+            "verticies" : treeUtil.verticies,
+            "edgeArray" : treeUtil.edgeArray.astype(np.int32),
+            "annotations" : treeUtil.annotations,
+            "impurities" : treeUtil.impurities.astype(np.float32),
+            "coordinates" : np.asarray(lay.coords, dtype = np.float32).reshape(-1, 2)
+        })
+    return layouts
 
 
 """
@@ -25,10 +63,15 @@ decsion trees.
 """
 
 class TreeUtil():
+
+    # Layouts of trees that have already been drawn indexed by
+    # (model id, estimator index), ordered from least to most recently used.
+    # The size can be set with the TREE_LAYOUT_CACHE_SIZE environment variable
+    layoutCache = OrderedDict()
+    maxCachedLayouts = int(os.environ.get("TREE_LAYOUT_CACHE_SIZE", 64))
+    layoutLock = threading.Lock()
     
     def __init__(self):
-        # Used to give each node a unique ID
-        self.ID = -1
         # Stores a list of tuple, which represent the edges
         # between nodes
         self.edges = []
@@ -39,23 +82,36 @@ class TreeUtil():
         # classification then the string will contain the number
         # of samples at that node
         self.annotations = []
-        # A dictionary that stores the calculated Gini values
-        # for each node and its key is the ID of the node in the decision tree.
-        self.gini_dict = {}
+        # An array of the impurity shown on each node, indexed
+        # by the ID of the node in the decision tree
+        self.impurities = np.empty(0)
+        # An array of the edges, one [parent, child] row per edge
+        self.edgeArray = np.empty((0, 2), dtype = np.int64)
+        # The (x, y) position of each node in the 'rt' layout
+        self.coordinates = np.empty((0, 2))
 
     '''
     AUTHOR: Ethan Temple-Betts
     DATE CREATED: UNKNOWN
     PREVIOUS MAINTAINER: Kieran Patel and Dominic Cripps
-    DATE LAST MODIFIED: 6/03/2023
+    DATE LAST MODIFIED: 18/10/2026
 
     A function to generate the decision tree figure
     using the utility functions from this class.
 
+    If a cacheKey is given, the parsed tree, its layout and its
+    figure are stored in 'layoutCache' the first time the tree is
+    drawn, and later calls with the same key are served from the
+    cache without parsing or laying out the tree again.
+
     Inputs: 
     DecisionTreeClassifier model : The model to be parsed.
+    tuple cacheKey : (model id, estimator index) identifying the tree,
+    the estimator index is None for a single decision tree
+    dict compactLayout : A layout from the 'TreeGallery', used instead of
+    laying the tree out if it is not in the cache
     '''
-    def generateDecisionTree(self, classifier, model, tree, sessionID):
+    def generateDecisionTree(self, classifier, model, tree, sessionID, cacheKey = None, compactLayout = None):
         tree_ = []
         """ 
         The parseTree function changes several member variables
@@ -77,214 +133,233 @@ class TreeUtil():
         getEdges()
         getAnnotations()
         """
+        layout = self.getCachedLayout(cacheKey)
+        if layout is None:
+            if compactLayout is not None:
+                layout = self.expandLayout(compactLayout)
+            else:
+                layout = self.layoutTree(classifier, model, tree)
+            self.cacheLayout(cacheKey, layout)
+        else:
+            self.restoreLayout(layout)
+
+        # The cached figure is copied, callers add traces to the figure they are given
+        fig = go.Figure(layout["figure"])
+        UserSession().instance.store.setSelectedTree(sessionID, fig)
+        #Append this object to an array to be used as a child component
+        tree_.append(dcc.Graph(figure = fig))
+        return tree_
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Parses a tree, lays it out and draws its figure, returning
+    everything needed to draw it again without doing so.
+
+    RETURNS
+    dict : The parsed tree ("verticies", "edges", "edgeArray", "annotations",
+    "impurities"), the node coordinates from the 'rt' layout, the edge
+    segments in figure coordinates and the figure
+    '''
+    def layoutTree(self, classifier, model, tree):
         self.parseTree(classifier, model, tree)
+        graphComp = self.buildGraph()
+        lay = graphComp.layout('rt')
+        return self.drawLayout(graphComp, np.asarray(lay.coords, dtype = np.float64).reshape(-1, 2))
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Returns the same layout as 'layoutTree' from a compact layout made
+    by 'layoutEstimators', without laying the tree out again.
+    '''
+    def expandLayout(self, compactLayout):
+        self.verticies = compactLayout["verticies"]
+        self.edgeArray = compactLayout["edgeArray"].astype(np.int64)
+        self.edges = list(map(tuple, self.edgeArray.tolist()))
+        self.annotations = compactLayout["annotations"]
+        self.impurities = compactLayout["impurities"].astype(np.float64)
+        return self.drawLayout(self.buildGraph(), compactLayout["coordinates"].astype(np.float64))
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Returns an igraph Graph of the parsed tree.
+    '''
+    def buildGraph(self):
         #Create graph component
         graphComp = Graph(directed = "T")
         #Assign properties (edges, vertices, annotations) 
         graphComp.add_vertices(self.getVerticies())
         graphComp.add_edges(self.getEdges())
         graphComp.vs["info"] = self.getAnnotations()
+        return graphComp
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Draws the figure of the parsed tree from its node coordinates
+    and returns the layout stored in 'layoutCache'.
+    '''
+    def drawLayout(self, graphComp, coordinates):
         #Generate graph for the tree. 
         #if tree depth is < certain number then call the generateTreeGraph function
         if (self.getVerticies() <= 20):
-            fig = self.generateTreeGraph(graphComp, self.getVerticies())
+            fig = self.generateTreeGraph(graphComp, self.getVerticies(), coordinates)
         #else call the generateTreeGraphLarge function
-        elif (self.getVerticies() > 20):
-            fig = self.generateTreeGraphLarge(graphComp, self.getVerticies())
         else:
-            print("Error")
-        UserSession().instance.selectedTree[sessionID] = fig
-        #Append this object to an array to be used as a child component
-        tree_.append(dcc.Graph(figure = fig))
-        return tree_
-    
+            fig = self.generateTreeGraphLarge(graphComp, self.getVerticies(), coordinates)
+
+        self.coordinates = coordinates
+        # The figure draws the root at the top, flipping the layout's y axis
+        nodeX = self.coordinates[:, 0]
+        nodeY = 2 * self.coordinates[:, 1].max() - self.coordinates[:, 1]
+        edgeX, edgeY = self.getEdgeSegments(self.edgeArray)
+
+        return {
+            "verticies" : self.verticies,
+            "edges" : self.edges,
+            "edgeArray" : self.edgeArray,
+            "annotations" : self.annotations,
+            "impurities" : self.impurities,
+            "coordinates" : self.coordinates,
+            "nodeX" : nodeX,
+            "nodeY" : nodeY,
+            "edgeX" : edgeX,
+            "edgeY" : edgeY,
+            "figure" : fig
+        }
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Sets the member variables from a layout returned by 'layoutTree',
+    as if the tree had just been parsed.
     '''
-    AUTHOR: Dominic Cripps
-    DATE CREATED: 17/02/2023
-    PREVIOUS MAINTAINER: Dominic Cripps
-    DATE LAST MODIFIED: 18/02/2023
+    def restoreLayout(self, layout):
+        self.verticies = layout["verticies"]
+        self.edges = layout["edges"]
+        self.edgeArray = layout["edgeArray"]
+        self.annotations = layout["annotations"]
+        self.impurities = layout["impurities"]
+        self.coordinates = layout["coordinates"]
 
-    Getter for the current leaf nodes classification.
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
 
-    Inputs: 
-    DecisionTreeClassifier model : The model to be parsed.
-    Tree tree : The tree being evaluated.
-    Integer nodeIndex : The index of the current leaf node.
-    '''
-    def getClassificiation(self, model, tree, nodeIndex, classifier):
-        #An array of possible classifications.
-        classes = classifier.classes_
-        #Array representing how many of each classification
-        #was used in training the current leaf.
-        weights = tree.value[nodeIndex][0].tolist()
-        largestID = 0
-        currVal = 0
-        #For loop to determine which weight is the largest
-        for i in range (0, len(weights)):
-            temp = int(weights[i])
-            if (temp > currVal):
-                currVal = temp
-                largestID = i
-        #Return the classification type
-        return str(classes[largestID])
+    Returns the cached layout for a key and marks it as recently used,
+    or None if the tree has not been drawn.
+    '''
+    def getCachedLayout(self, cacheKey):
+        if cacheKey is None or cacheKey[0] is None:
+            return None
+        with TreeUtil.layoutLock:
+            layout = TreeUtil.layoutCache.get(cacheKey)
+            if layout is not None:
+                TreeUtil.layoutCache.move_to_end(cacheKey)
+            return layout
 
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Stores a layout returned by 'layoutTree', evicting the least recently
+    used layouts once more than 'maxCachedLayouts' are held.
+    '''
+    def cacheLayout(self, cacheKey, layout):
+        if cacheKey is None or cacheKey[0] is None:
+            return
+        with TreeUtil.layoutLock:
+            TreeUtil.layoutCache[cacheKey] = layout
+            TreeUtil.layoutCache.move_to_end(cacheKey)
+            while len(TreeUtil.layoutCache) > TreeUtil.maxCachedLayouts:
+                TreeUtil.layoutCache.popitem(last = False)
+    
     '''
     AUTHOR: Ethan Temple-Betts
     PREVIOUS MAINTAINER: Ethan Temple-Betts and Kieran Patel
+    DATE LAST MODIFIED: 18/10/2026
 
     Parses the decision tree classifier. The edges of the tree
     are put into the edges array. The verticies counter is
-    incremented so as to store the total amount of verticies
-    in the decision tree. annotations contains the annotation
-    to be displayed on each node of the graph.
+    set to the total amount of verticies in the decision tree.
+    annotations contains the annotation to be displayed on each
+    node of the graph.
+
+    The tree is read directly from the arrays of the sklearn
+    'tree_' object, all nodes are processed at once with numpy
+    rather than by recursing over the tree, so deep trees cannot
+    reach the recursion limit. Each vertex keeps its sklearn
+    node id, so every array produced here can be indexed in the
+    same way as 'tree_'.
+
+    The impurity shown for a decision node is the average of its
+    children's impurity weighted by their number of samples, a
+    leaf shows its own impurity.
 
     INPUTS
     DecisionTreeClassifier tree : The model to be parsed
     '''
     def parseTree(self, classifier, model, tree_):
         # An array of feature names used to train the model
-        featureName = classifier.feature_names_in_
-            
-        # Creates an array of feature names, indexed by node,
-        # that represent the feature used to split the data at
-        # each node in the tree
-        feature_Names = [
-            featureName[i] if i != _tree.TREE_UNDEFINED else "undefined!"
-            for i in tree_.feature
-        ]
-
-        
-        
-        '''
-        AUTHOR: Kieran Patel
-
-        Date Created: 26/02/2023
-
-        A recursive function that calculates and stores the Gini impurity
-        values for each node in the decision tree.
-
-        INPUTS:
-        - node (int): The ID of the next node in the sequence,
-        starting from the root node (ID = 0).
-
-        RETURNS:
-        None
-        '''
-
-        def calcAndStoreGini(node):
-            # Checks if the current node is a leaf node, 
-            # in which case the Gini impurity value is stored directly
-            # from the tree object into the gini_dict.
-            if tree_.children_left[node] == _tree.TREE_LEAF:
-                self.gini_dict[node] = tree_.impurity[node]
-            else:
-                # This part recursively calls calcAndStoreGini for the left and right child nodes
-                # and calculates the total number of samples in both child nodes.
-                # The Gini impurity value for the current node is then calculated as a
-                # weighted average of the impurity values of the left and right child nodes,
-                # based on the number of samples in each child node.
-                # Finally, the Gini impurity value is stored in the gini_dict for the current node.
-                left = calcAndStoreGini(tree_.children_left[node])
-                right = calcAndStoreGini(tree_.children_right[node])
-                total_samples = tree_.n_node_samples[tree_.children_left[node]] + tree_.n_node_samples[tree_.children_right[node]]
-                self.gini_dict[node] = (tree_.n_node_samples[tree_.children_left[node]] / total_samples) * tree_.impurity[tree_.children_left[node]] + (tree_.n_node_samples[tree_.children_right[node]] / total_samples) * tree_.impurity[tree_.children_right[node]]
-
-        # Calls calcAndStoreGini starting from the root node
-        calcAndStoreGini(0)
-
-
-        # Creates an array of feature names, indexed by node,
-        # that represent the feature used to split the data at
-        # each node in the tree
-        feature_Names = [
-            featureName[i] if i != _tree.TREE_UNDEFINED else "undefined!"
-            for i in tree_.feature
-        ]
-
-        '''
-        AUTHOR: Ethan Temple-Betts
-        PREVIOUS MAINTAINER: Dominic Cripps
-
-        A function to recurse over every node in the tree and
-        calculate all the edges that exist between them.
-
-        INPUTS
-        int node: The id the next node in the sequence
-        (0 for root node) 
-
-        list[int] route: The edge represented as a list of ints
-        (initially empty [])
-        '''
-        def recurse(node, route):
-            # Increment the shared ID variable to give each
-            # node a unique ID
-            self.ID += 1
-            # Stores the ID of the node being parsed in each
-            # function call
-            localID = self.ID
-
-            # If the node is a decsion node and not a
-            # classification then continue else, The base case
-            # is reached
-            if tree_.feature[node] != _tree.TREE_UNDEFINED:
-                # The feature name used for the current
-                # decisiion node
-                name = feature_Names[node]
-                # The decision threshhold at the current node
-                threshold = tree_.threshold[node]
-
-                # Add this nodes ID to the array containing the
-                # ID of the previous node
-                route+=[localID]
-                # Add the decision that relates to this node
-                # "[feature name] <= [threshold]" to the
-                # annotations list
-                self.annotations.append(name + "<br> <= " + str(round(threshold, 2)))
-
-                # If there are 2 items in the route array, then
-                # this is a complete edge and the tuple is
-                # added to the edges array
-                if(len(route) > 1):
-                    self.edges.append(tuple(route))
-
-                # Sanity check to ensure nodes can't have an ID
-                # which is greater than the number of nodes that
-                # exist
-                if localID > self.verticies:
-                    self.verticies = localID
-
-
-                # Recurse over the left and right children 
-                recurse(tree_.children_left[node], [localID])
-                recurse(tree_.children_right[node], [localID])
-            else:
-                # Add this nodes ID to the array containing the
-                # ID of the previous node
-                route += [localID]
-
-                # If there are 2 items in the route array, then
-                # this is a complete edge and the tuple is added
-                # to the edges array
-                if(len(route) > 1):
-                    self.edges.append(tuple(route))
-
-
-                # Sanity check to ensure nodes can't have an ID
-                # which is greater than the number of nodes
-                # that exist
-                if localID > self.verticies:
-                    self.verticies = localID
-                
-
-                # As this node is a classification, the
-                # annotation is instead an array, which contains
-                # the amount of samples from each class, which
-                # have made it to this leaf node
-                # Addition : The classification of each node will be 
-                # returned by getClassification and shown on the label.
-                self.annotations.append(self.getClassificiation(model, tree_, node, classifier))
-
-        recurse(0, [])
+        featureName = np.asarray(classifier.feature_names_in_, dtype = object)
+
+        left = tree_.children_left
+        right = tree_.children_right
+        impurity = tree_.impurity
+        samples = tree_.n_node_samples
+
+        # The ids of the decision nodes and the leaf nodes
+        internal = np.flatnonzero(left != _tree.TREE_LEAF)
+        leaves = np.flatnonzero(left == _tree.TREE_LEAF)
+        leftChildren = left[internal]
+        rightChildren = right[internal]
+
+        # Each decision node has an edge to its left child followed
+        # by an edge to its right child
+        self.edgeArray = np.empty((2 * len(internal), 2), dtype = np.int64)
+        self.edgeArray[0::2, 0] = internal
+        self.edgeArray[0::2, 1] = leftChildren
+        self.edgeArray[1::2, 0] = internal
+        self.edgeArray[1::2, 1] = rightChildren
+        self.edges = list(map(tuple, self.edgeArray.tolist()))
+
+        self.impurities = impurity.astype(np.float64)
+        self.impurities[internal] = (
+            samples[leftChildren] * impurity[leftChildren] + samples[rightChildren] * impurity[rightChildren]
+        ) / (samples[leftChildren] + samples[rightChildren])
+
+        # Decision nodes are labelled "[feature name] <= [threshold]",
+        # leaf nodes are labelled with the class most of their samples belong to
+        labels = np.empty(tree_.node_count, dtype = object)
+        labels[internal] = np.char.add(
+            np.char.add(featureName[tree_.feature[internal]].astype(str), "<br> <= "),
+            np.round(tree_.threshold[internal], 2).astype(str)
+        )
+        labels[leaves] = np.asarray(classifier.classes_)[np.argmax(tree_.value[leaves, 0, :], axis = 1)].astype(str)
+        self.annotations = labels.tolist()
+
+        self.verticies = tree_.node_count - 1
 
 
     '''
@@ -298,12 +373,14 @@ class TreeUtil():
     INPUTS
     igraph.Graph G: The Graph object to be displayed
     int nr_vertices: The number of verticies in the graph
+    Layout lay: The graph's 'rt' layout, calculated if not given
     '''
-    def generateTreeGraph(self, G, nr_vertices):
-        lay = G.layout('rt')
+    def generateTreeGraph(self, G, nr_vertices, lay = None):
+        if lay is None:
+            lay = G.layout('rt')
         hover_information = []
         for i in range(nr_vertices):
-            gini_value = round(self.gini_dict[i], 2)
+            gini_value = round(float(self.impurities[i]), 2)
             gini_str = "Gini: " + str(gini_value)
             hover_information.append(gini_str)
         position = {k: lay[k] for k in range(nr_vertices)}
@@ -407,13 +484,15 @@ class TreeUtil():
     INPUTS
     igraph.Graph G: The Graph object to be displayed
     int nr_vertices: The number of verticies in the graph
+    Layout lay: The graph's 'rt' layout, calculated if not given
     '''
-    def generateTreeGraphLarge(self, G, nr_vertices):
+    def generateTreeGraphLarge(self, G, nr_vertices, lay = None):
         
-        lay = G.layout('rt')
+        if lay is None:
+            lay = G.layout('rt')
         hover_information = []
         for i in range(nr_vertices):
-            gini_value = round(self.gini_dict[i], 2)
+            gini_value = round(float(self.impurities[i]), 2)
             gini_str = "Gini: " + str(gini_value)
             hover_information.append(gini_str)
         position = {k: lay[k] for k in range(nr_vertices)}
@@ -538,6 +617,55 @@ class TreeUtil():
             depth += G.shortest_paths_dijkstra(source=i, target=nr_vertices-1)[0][0]
         return depth / nr_vertices
 
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Traces the paths a batch of inputs take through the tree using
+    sklearn's 'decision_path', which visits only the nodes on each
+    path. An edge is on a path when its child node was visited, so
+    the edges are found from 'edgeArray' without walking the tree.
+    The tree must have been parsed (or restored from the cache) first.
+
+    INPUTS
+    DecisionTreeClassifier model : The model whose tree was parsed
+    DataFrame data : One row per input, with the model's features
+
+    RETURNS
+    array edges : The (parent, child) rows of every edge taken
+    array counts : The number of inputs that took each edge
+    '''
+    def tracePaths(self, model, data):
+        indicator = model.decision_path(data)
+        visits = np.bincount(indicator.indices, minlength = self.getVerticies())
+        taken = visits[self.edgeArray[:, 1]] > 0
+        return self.edgeArray[taken], visits[self.edgeArray[taken, 1]]
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Returns the x and y values that draw the given edges over the tree
+    figure, using the coordinates of the current layout. Each edge is a
+    segment between its nodes followed by a gap.
+
+    INPUTS
+    array edges : (parent, child) rows, such as those from 'tracePaths'
+    '''
+    def getEdgeSegments(self, edges):
+        height = 2 * self.coordinates[:, 1].max()
+        edgeX = np.full((len(edges), 3), np.nan)
+        edgeY = np.full((len(edges), 3), np.nan)
+        edgeX[:, 0] = self.coordinates[edges[:, 0], 0]
+        edgeX[:, 1] = self.coordinates[edges[:, 1], 0]
+        edgeY[:, 0] = height - self.coordinates[edges[:, 0], 1]
+        edgeY[:, 1] = height - self.coordinates[edges[:, 1], 1]
+        return edgeX.ravel(), edgeY.ravel()
+
     '''
     AUTHOR: Ethan Temple-Betts
     PREVIOUS MAINTAINER: Ethan Temple-Betts
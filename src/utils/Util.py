@@ -4,9 +4,13 @@ from io import StringIO
 import pandas as pd
 import plotly.express as px
 from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import RandomForestClassifier
 import numpy as np
 import plotly.graph_objs as go
 import pickle
+import time
+import os
+import tempfile
 
 
 """
@@ -38,20 +42,223 @@ class ImportUtil:
         stringContent = contentBytes.decode('utf-8')
         return stringContent
 
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Decodes the given file contents into a binary stream, unlike 
+    'readContent' the bytes are not converted to a python string, so
+    the file is held in memory one less time.
+
+    INPUTS
+    str file : The full filename
+
+    base64 content The contents of that file in base64
+    '''
+    def readContentBytes(file, content):
+        content_type, content_string = content.split(',')
+        return io.BytesIO(base64.b64decode(content_string))
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Copies a stream into a temporary csv file in fixed size chunks, so 
+    the whole upload is never held in memory. The caller is responsible
+    for deleting the file.
+
+    INPUTS
+    file stream : A readable binary stream, e.g. a flask request stream
+    int chunkSize : The number of bytes read at a time
+
+    RETURNS
+    str path : The location of the temporary file
+    '''
+    def streamToTempFile(stream, chunkSize = 1024 * 1024):
+        with tempfile.NamedTemporaryFile(suffix = ".csv", delete = False) as file:
+            while True:
+                chunk = stream.read(chunkSize)
+                if not chunk:
+                    break
+                file.write(chunk)
+            return file.name
+
     '''
     AUTHOR: Ethan Temple-Betts
     PREVIOUS MAINTAINER: Ethan Temple-Betts
+    DATE LAST MODIFIED: 18/10/2026
 
     Converts a string of csv data into a dataframe object
 
+    The csv is parsed by pandas' C engine, whitespace around each value
+    is removed after parsing (see 'stripWhitespace') rather than with a
+    regex separator, which would force the much slower python engine.
+
     INPUTS
     str csv : The contents of a csv file as a string
     '''
     def csvToDataFrame(csv):
-        data = StringIO(csv)
-        df = pd.read_csv(data, sep=r'\s*,\s*', engine = 'python')
+        return ImportUtil.readCsv(StringIO(csv))
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Parses csv data given as a string or a file-like object.
+
+    INPUTS
+    (str or file) source : The contents of a csv file as a string or a
+    file-like object, such as the stream returned by 'readContentBytes'
+    '''
+    def readCsv(source):
+        if isinstance(source, str):
+            source = StringIO(source)
+        df = pd.read_csv(source, skipinitialspace = True, engine = 'c')
+        return ImportUtil.stripWhitespace(df)
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Parses a csv file on disk, the file is memory mapped rather than read
+    into a python string first.
+
+    INPUTS
+    str path : The location of the csv file
+    '''
+    def readCsvFile(path):
+        df = pd.read_csv(path, skipinitialspace = True, engine = 'c', memory_map = True)
+        return ImportUtil.stripWhitespace(df)
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Removes leading and trailing whitespace from the column names and 
+    every string value of a dataframe.
+
+    INPUTS
+    DataFrame df : The dataframe to be stripped
+    '''
+    def stripWhitespace(df):
+        df.columns = [column.strip() if isinstance(column, str) else column for column in df.columns]
+        for column in df.columns[df.dtypes == object]:
+            df[column] = df[column].str.strip()
         return df
 
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Converts the columns of a dataframe to the most compact dtype that
+    holds their values, floats become float32, integers the smallest
+    integer type and string columns with repeated values (such as a 
+    class column) become categoricals.
+
+    INPUTS
+    DataFrame df : The dataframe to be converted
+    float categoryRatio : String columns with fewer unique values than
+    this fraction of their length are made categorical
+    '''
+    def optimiseDtypes(df, categoryRatio = 0.5):
+        for column in df.columns:
+            values = df[column]
+            if pd.api.types.is_float_dtype(values):
+                df[column] = values.astype(np.float32)
+            elif pd.api.types.is_integer_dtype(values):
+                df[column] = pd.to_numeric(values, downcast = 'integer')
+            elif values.dtype == object and values.nunique() < len(values) * categoryRatio:
+                df[column] = values.astype('category')
+        return df
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Reads an uploaded csv into a compact dataframe and reports how long
+    parsing took and how much memory the result uses.
+
+    INPUTS
+    (str or file) source : The contents of a csv file as a string or a
+    file-like object, such as the stream returned by 'readContentBytes'
+
+    RETURNS
+    DataFrame df : The parsed dataframe
+    dict report : {"rows", "columns", "parseSeconds", "memoryBytes"}
+    '''
+    def ingestCsv(source):
+        start = time.perf_counter()
+        return ImportUtil.compactDataFrame(ImportUtil.readCsv(source), start)
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    As 'ingestCsv', for a csv file on disk (see 'readCsvFile').
+
+    INPUTS
+    str path : The location of the csv file
+    '''
+    def ingestCsvFile(path):
+        start = time.perf_counter()
+        return ImportUtil.compactDataFrame(ImportUtil.readCsvFile(path), start)
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Converts a parsed dataframe to compact dtypes and builds the report
+    returned by 'ingestCsv' and 'ingestCsvFile'.
+
+    INPUTS
+    DataFrame df : The parsed dataframe
+    float start : The value of time.perf_counter when parsing started
+    '''
+    def compactDataFrame(df, start):
+        df = ImportUtil.optimiseDtypes(df)
+        report = {
+            "rows" : len(df),
+            "columns" : len(df.columns),
+            "parseSeconds" : time.perf_counter() - start,
+            "memoryBytes" : int(df.memory_usage(index = True, deep = True).sum())
+        }
+        return df, report
+
+    '''
+    AUTHOR: agent
+    DATE CREATED: 18/10/2026
+    PREVIOUS MAINTAINER: agent
+    DATE LAST MODIFIED: 18/10/2026
+
+    Formats the report returned by 'ingestCsv' to be shown to the user.
+
+    INPUTS
+    str filename : The name of the uploaded file
+    dict report : The report returned by 'ingestCsv'
+    '''
+    def describeIngest(filename, report):
+        return (str(filename) + " (" + str(report["rows"]) + " rows, " + str(report["columns"]) + " columns, " 
+                + str(round(report["memoryBytes"] / 1024 ** 2, 2)) + " MB, parsed in " 
+                + str(round(report["parseSeconds"], 3)) + "s)")
+
     '''
     AUTHOR: Ethan Temple-Betts
     PREVIOUS MAINTAINER: Ethan Temple-Betts
@@ -246,6 +453,159 @@ class ModelUtil():
         targetMap = dict(zip(uniqueValues,numArray))
 
         return targetMap
+    # encodeClasses maps an array of class labels to the integers given by key (e.g. a
+    # model's colourKey) in one vectorised pass. Labels are compared as strings, as the
+    # keys are. It returns the codes along with the label text, labels missing from key
+    # get a code of NaN and empty text. The codes are integers when every label is found.
+    def encodeClasses(values, key):
+        values = np.asarray(values).astype(str)
+        # Each distinct label is looked up once, inverse then spreads the result to every value
+        uniqueValues, inverse = np.unique(values, return_inverse = True)
+        uniqueCodes = np.array([key.get(value, np.nan) for value in uniqueValues], dtype = np.float64)
+        found = ~np.isnan(uniqueCodes)
+
+        codes = uniqueCodes[inverse]
+        if found.all():
+            codes = codes.astype(np.int64)
+        text = np.where(found, uniqueValues, '')[inverse]
+        return codes, text
+
+    # predictTestData makes the model's predictions for the test set, along with the class
+    # probabilities when the model supports them. Trees and forests predict the class with
+    # the highest probability, so for them the predictions are taken from the probabilities
+    # rather than making a second pass over the test set. The returned record is stored in
+    # modelInfo["testPredictions"] and tagged with the modelID it was computed for.
+    def predictTestData(model, xTest, modelID):
+        probabilities = None
+        if hasattr(model, "predict_proba"):
+            probabilities = model.predict_proba(xTest)
+
+        if probabilities is not None and isinstance(model, (DecisionTreeClassifier, RandomForestClassifier)):
+            predictions = model.classes_.take(np.argmax(probabilities, axis = 1), axis = 0)
+        else:
+            predictions = model.predict(xTest)
+
+        return {"modelID" : modelID, "predictions" : predictions, "probabilities" : probabilities}
+
+    # getTestPredictions returns the cached test set predictions of a model, they are
+    # computed once when the model is trained. If the cache is missing or was made for
+    # a different model (e.g. the model has been retrained) it is recomputed and stored.
+    def getTestPredictions(modelInfo):
+        cache = modelInfo.get("testPredictions")
+        if cache is None or cache["modelID"] != modelInfo.get("modelID"):
+            cache = ModelUtil.predictTestData(modelInfo["modelData"], modelInfo["testingData"][0], modelInfo.get("modelID"))
+            modelInfo["testPredictions"] = cache
+        return cache
+
+    # getFeatureEncoding records how the raw training columns were encoded, the raw column
+    # names and, for every string or categorical column, the categories 'pd.get_dummies'
+    # made a one hot column for ("[column]_[category]"). It is stored in the modelInfo so
+    # that new data can be encoded in exactly the same way.
+    def getFeatureEncoding(frame):
+        categories = {}
+        for column in frame.columns:
+            values = frame[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                categories[str(column)] = list(values.cat.categories)
+            elif values.dtype == object:
+                categories[str(column)] = list(pd.Categorical(values.dropna()).categories)
+        return {"columns" : [str(column) for column in frame.columns], "categories" : categories}
+
+    # getMissingFeatures returns the columns a file needs to be scored that are not in the given
+    # columns. With the model's feature encoding these are the raw training columns, without
+    # one the file must contain every model feature as it is.
+    def getMissingFeatures(featureNames, columns, encoding = None):
+        columns = set(str(column) for column in columns)
+        required = encoding["columns"] if encoding is not None else featureNames
+        return [feature for feature in required if feature not in columns]
+
+    # prepareFeatures builds the model's input from a chunk of raw rows, string columns are
+    # stripped and one hot encoded with the categories recorded in training. Returns the
+    # features and whether each row is complete, a row with a missing value or a category
+    # the model has not seen is not complete and should not be scored.
+    def prepareFeatures(chunk, featureNames, encoding = None):
+        if encoding is None:
+            features = chunk[list(featureNames)]
+            return features, features.notna().all(axis = 1).to_numpy()
+
+        frame = chunk[encoding["columns"]].copy()
+        for column, categories in encoding["categories"].items():
+            values = frame[column]
+            frame[column] = pd.Categorical(values.astype(str).str.strip().where(values.notna()), categories = categories)
+        complete = frame.notna().all(axis = 1).to_numpy()
+        return pd.get_dummies(frame).reindex(columns = featureNames, fill_value = 0), complete
+
+    # scoreCsv scores every row of a csv file with a trained model and writes the predictions
+    # and class probabilities to 'output'. The file is read and scored 'chunkSize' rows at a
+    # time, so memory use does not grow with the size of the file. Rows with missing feature
+    # values or unseen categories are written without a prediction. 'encoding' is the model's
+    # feature encoding (see 'getFeatureEncoding'). Returns the number of rows scored.
+    def scoreCsv(model, source, output, chunkSize = 50000, encoding = None):
+        featureNames = list(model.feature_names_in_)
+        header = pd.read_csv(source, nrows = 0, skipinitialspace = True).columns.str.strip()
+        missing = ModelUtil.getMissingFeatures(featureNames, header, encoding)
+        if len(missing) > 0:
+            raise ValueError("Missing Features : " + ", ".join(missing))
+        if hasattr(source, "seek"):
+            source.seek(0)
+
+        # The header is written before any chunk, so a file with no rows still has every column
+        hasProbabilities = hasattr(model, "predict_proba")
+        columns = ["prediction"]
+        if hasProbabilities:
+            columns += ["probability_" + str(label) for label in model.classes_]
+        rows = 0
+        scored = 0
+        with open(output, "w", newline = "") as file:
+            pd.DataFrame(columns = columns, index = pd.RangeIndex(0, name = "row")).to_csv(file)
+            for chunk in pd.read_csv(source, chunksize = chunkSize, engine = "c", skipinitialspace = True):
+                chunk.columns = chunk.columns.str.strip()
+                features, complete = ModelUtil.prepareFeatures(chunk, featureNames, encoding)
+
+                result = pd.DataFrame(index = pd.RangeIndex(rows, rows + len(chunk), name = "row"), columns = columns, dtype = object)
+                if hasProbabilities:
+                    result[columns[1:]] = np.nan
+
+                if complete.any():
+                    prediction = ModelUtil.predictTestData(model, features[complete], None)
+                    result.loc[complete, "prediction"] = prediction["predictions"]
+                    if hasProbabilities:
+                        result.loc[complete, result.columns[1:]] = prediction["probabilities"]
+
+                result.to_csv(file, header = False)
+                rows += len(chunk)
+                scored += int(complete.sum())
+        return scored
+
+    # The number of rows plots draw before they are sampled, set with PLOT_SAMPLE_ROWS
+    plotSampleRows = int(os.environ.get("PLOT_SAMPLE_ROWS", 10000))
+
+    # stratifiedSample returns the sorted positions of a random sample of at most maxRows
+    # rows, taking the same fraction of every class so the class balance is kept (each class
+    # keeps at least one row). All rows are returned when there are no more than maxRows.
+    # The sample is seeded so a plot shows the same rows each time it is drawn.
+    def stratifiedSample(labels, maxRows = None, seed = 0):
+        maxRows = ModelUtil.plotSampleRows if maxRows is None else maxRows
+        labels = np.asarray(labels).astype(str)
+        rows = len(labels)
+        if rows <= maxRows:
+            return np.arange(rows)
+
+        classes, inverse, counts = np.unique(labels, return_inverse = True, return_counts = True)
+        quota = np.maximum(1, np.floor(counts * (maxRows / rows))).astype(np.int64)
+
+        # Rows are shuffled within their class, the first 'quota' of each class are kept
+        order = np.lexsort((np.random.default_rng(seed).random(rows), inverse))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        rank = np.arange(rows) - starts[inverse[order]]
+        return np.sort(order[rank < quota[inverse[order]]])
+
+    # describeSample returns the text added to a plot's title to say how much of the data it shows
+    def describeSample(sampled, total):
+        if sampled >= total:
+            return ""
+        return " (Showing " + str(round(sampled / total * 100, 1)) + "% Of " + str(total) + " Rows)"
+
     # getTrainingSet returns a new dataframe containing only the specified columns
     def getTrainingSet(df,x,y):
         return df[[x,y]].copy()